@@ -0,0 +1,145 @@
+import asyncio
+import contextlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict
+from unittest.mock import patch
+
+from src.skills.base import BaseSkill
+from src.skills.hedged import HedgedSearchSkill
+from src.skills.ratelimit import RateLimitedSkill
+from src.utils.sources import SearchResult
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+WEB_PROVIDERS = ("tavily", "serper", "duckduckgo")
+SUPPLEMENTARY_PROVIDERS = ("wikipedia", "arxiv")
+
+def load_fixture(name: str = "default") -> dict:
+    """Loads a fixture by name from benchmarks/fixtures, or from an explicit path."""
+    path = name if os.path.exists(name) else os.path.join(FIXTURE_DIR, f"{name}.json")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+class LatencyModel:
+    """
+    Draws response times from a lognormal distribution around `median_ms`.
+    A fixed seed makes a benchmark run reproducible.
+    """
+
+    def __init__(self, median_ms: float, sigma: float = 0.0, seed: int = 0, scale: float = 1.0):
+        self.median = median_ms / 1000 * scale
+        self.sigma = sigma
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        with self._lock:
+            return self.median * math.exp(self._random.gauss(0, self.sigma)) if self.sigma else self.median
+
+    def chance(self, probability: float) -> bool:
+        with self._lock:
+            return self._random.random() < probability
+
+class ReplaySkill(BaseSkill):
+    """
+    Offline stand-in for a search provider: sleeps for a modeled latency, occasionally
+    fails, and returns results in the same shape as the real skills in src/skills/search.py.
+    """
+
+    def __init__(self, provider: str, spec: dict, body: str, seed: int = 0, scale: float = 1.0):
+        self.provider = provider
+        self.name = spec["name"]
+        self.description = f"Replayed {spec['name']}"
+        self.source_type = spec["source_type"]
+        self.results = spec.get("results", 5)
+        self.error_rate = spec.get("error_rate", 0.0)
+        self.body = body
+        self.latency = LatencyModel(seed=seed, scale=scale, **spec["latency"])
+
+    def _response(self, query: str) -> Dict[str, Any]:
+        if self.latency.chance(self.error_rate):
+            return {"error": f"{self.source_type} replay: simulated provider failure"}
+
+        slug = re.sub(r"[^a-z0-9]+", "-", query.lower()).strip("-")
+        # Web providers share URLs for the same query so cross-provider dedup is exercised
+        host = "example.org" if self.provider in WEB_PROVIDERS else f"{self.provider}.example.org"
+        results = [
+            SearchResult(f"{query} ({i + 1})", f"https://{host}/{slug}/{i}", self.body, self.source_type)
+            for i in range(self.results)
+        ]
+        return {"results": results}
+
+    def execute(self, query: str, **kwargs) -> Dict[str, Any]:
+        time.sleep(self.latency.sample())
+        return self._response(query)
+
+    async def aexecute(self, query: str, **kwargs) -> Dict[str, Any]:
+        await asyncio.sleep(self.latency.sample())
+        return self._response(query)
+
+def replay_llm(spec: dict, seed: int = 0, scale: float = 1.0):
+    """
+    Builds a LangChain runnable that answers every prompt with the recorded response
+    after a modeled latency, so it can be piped after a prompt exactly like the real model.
+    """
+    from langchain_core.messages import AIMessage
+    from langchain_core.runnables import RunnableLambda
+
+    latency = LatencyModel(seed=seed, scale=scale, **spec["latency"])
+
+    def respond(prompt_value):
+        time.sleep(latency.sample())
+        return AIMessage(content=spec["response"])
+
+    async def arespond(prompt_value):
+        await asyncio.sleep(latency.sample())
+        return AIMessage(content=spec["response"])
+
+    return RunnableLambda(respond, afunc=arespond)
+
+def replay_skills(fixture: dict, seed: int = 0, scale: float = 1.0, max_concurrency: int = None) -> list:
+    """
+    The orchestrator's skill stack (hedged web search plus supplementary skills), backed by replays.
+    The hedged pool is sized for `max_concurrency` like the orchestrator's (default RESEARCH_CONCURRENCY).
+    """
+    max_concurrency = max_concurrency or int(os.getenv("RESEARCH_CONCURRENCY", "5"))
+    providers = fixture["providers"]
+    body = fixture.get("result_body", "")
+
+    def skill(provider, offset):
+        return RateLimitedSkill(ReplaySkill(provider, providers[provider], body, seed=seed + offset, scale=scale))
+
+    web = [skill(provider, i) for i, provider in enumerate(WEB_PROVIDERS) if provider in providers]
+    skills = [HedgedSearchSkill.for_concurrency(web, max_concurrency)] if web else []
+    skills += [skill(provider, 10 + i) for i, provider in enumerate(SUPPLEMENTARY_PROVIDERS) if provider in providers]
+    return skills
+
+@contextlib.contextmanager
+def replay_models(fixture: dict, seed: int = 0, scale: float = 1.0):
+    """Patches the Gemini client in every agent module so agents built inside the block use replays."""
+    roles = {"planner": "plan", "researcher": "research", "summarizer": "summarize"}
+    with contextlib.ExitStack() as stack:
+        for offset, (module, role) in enumerate(roles.items()):
+            spec = fixture["llm"][role]
+            stack.enter_context(patch(
+                f"src.agents.{module}.ChatGoogleGenerativeAI",
+                side_effect=lambda *args, _spec=spec, _seed=seed + offset, **kwargs: replay_llm(_spec, _seed, scale)
+            ))
+        yield
+
+def build_orchestrator(fixture: dict, seed: int = 0, scale: float = 1.0, orchestrator_cls=None, **kwargs):
+    """Creates an orchestrator whose model and search providers are all replayed offline."""
+    from src.orchestrator import Orchestrator
+
+    with replay_models(fixture, seed=seed, scale=scale):
+        orchestrator = (orchestrator_cls or Orchestrator)(**kwargs)
+    for skill in orchestrator.researcher.skills:
+        skill.close()
+    orchestrator.researcher.skills = replay_skills(fixture, seed=seed, scale=scale, max_concurrency=orchestrator.max_concurrency)
+    return orchestrator
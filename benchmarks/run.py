@@ -0,0 +1,267 @@
+"""
+Offline benchmark suite for the research pipeline.
+
+Replays the model and every search provider from a fixture (see benchmarks/fixtures),
+so runs are reproducible and need no API keys or network:
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --latency-scale 0.1 --jobs 8 --compare results.json
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+TOPICS = [
+    "Large language models in healthcare",
+    "Solid-state batteries",
+    "Quantum error correction",
+    "Urban heat islands",
+    "Supply chain resilience",
+    "CRISPR gene therapy",
+    "Small modular nuclear reactors",
+    "Carbon capture and storage",
+]
+
+PROVIDERS = ("gemini", "tavily", "serper", "duckduckgo", "wikipedia", "arxiv")
+
+def _configure_env(unthrottled: bool):
+    # Measure the pipeline itself, not whatever the caches already hold
+    os.environ["LLM_CACHE_DISABLED"] = "1"
+    os.environ["SEARCH_CACHE_DISABLED"] = "1"
+    # Page fetching needs the network; the replayed providers only return snippets
+    os.environ["PAGE_FETCH_COUNT"] = "0"
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+    if unthrottled:
+        for provider in PROVIDERS:
+            os.environ[f"RATE_LIMIT_{provider.upper()}"] = "1000"
+            os.environ[f"CONCURRENCY_LIMIT_{provider.upper()}"] = "1000"
+
+def _stats(samples: list) -> dict:
+    """Summary statistics in milliseconds."""
+    ms = sorted(sample * 1000 for sample in samples)
+    if not ms:
+        return {"n": 0}
+    return {
+        "n": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 2),
+        "p50_ms": round(ms[len(ms) // 2], 2),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 2),
+        "min_ms": round(ms[0], 2),
+        "max_ms": round(ms[-1], 2),
+    }
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+def bench_phases(factory, iterations: int) -> dict:
+    """Latency of each phase of the interactive flow, run back to back."""
+    timings = {"plan": [], "research": [], "summarize": [], "total": []}
+    report = None
+    for i in range(iterations):
+        orchestrator = factory(seed=i)
+        topic = TOPICS[i % len(TOPICS)]
+        sub_topics, plan_time = _timed(orchestrator.plan_research, topic)
+        (findings, sources), research_time = _timed(orchestrator.execute_research, sub_topics)
+        report, summary_time = _timed(orchestrator.generate_summary, topic, findings, sources)
+        orchestrator.close()
+
+        timings["plan"].append(plan_time)
+        timings["research"].append(research_time)
+        timings["summarize"].append(summary_time)
+        timings["total"].append(plan_time + research_time + summary_time)
+    return {name: _stats(samples) for name, samples in timings.items()}, report
+
+def bench_end_to_end(factory, iterations: int) -> dict:
+    """One-shot runs: sequential phases (`run`) against overlapping phases (`run_pipelined`)."""
+    results = {}
+    for mode in ("run", "run_pipelined"):
+        samples = []
+        for i in range(iterations):
+            orchestrator = factory(seed=i)
+            _, elapsed = _timed(getattr(orchestrator, mode), TOPICS[i % len(TOPICS)])
+            orchestrator.close()
+            samples.append(elapsed)
+        results[mode] = _stats(samples)
+    return results
+
+def bench_throughput(factory, jobs: int) -> dict:
+    """Completes `jobs` one-shot runs at once, like concurrent /api/jobs submissions."""
+    orchestrators = [factory(seed=i) for i in range(jobs)]
+    latencies = []
+
+    def job(i):
+        _, elapsed = _timed(orchestrators[i].run, TOPICS[i % len(TOPICS)])
+        latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+        list(executor.map(job, range(jobs)))
+    wall = time.perf_counter() - start
+    for orchestrator in orchestrators:
+        orchestrator.close()
+
+    return {
+        "jobs": jobs,
+        "wall_s": round(wall, 3),
+        "jobs_per_min": round(jobs / wall * 60, 2),
+        "latency": _stats(latencies),
+    }
+
+def bench_memory(factory) -> dict:
+    """Peak Python heap allocated during one full run."""
+    orchestrator = factory(seed=0)
+    tracemalloc.start()
+    try:
+        orchestrator.run(TOPICS[0])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        orchestrator.close()
+
+    result = {"run_peak_traced_mb": round(peak / 2 ** 20, 2)}
+    try:
+        import resource
+        # ru_maxrss is KiB on Linux and bytes on macOS
+        divisor = 2 ** 20 if sys.platform == "darwin" else 2 ** 10
+        result["process_max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor, 2)
+    except ImportError:
+        pass
+    return result
+
+def bench_export(report: str, iterations: int) -> dict:
+    """Report export: raw PDF/DOCX rendering, and the server's export service (worker pool plus cache)."""
+    from src.utils.report_formatter import ReportFormatter
+    from src.web.exports import DOCX, PDF, ExportService
+
+    results = {}
+    for kind, render in ((PDF, lambda: ReportFormatter().generate_pdf(report)), (DOCX, lambda: ReportFormatter().generate_docx(report))):
+        samples = []
+        size = 0
+        for _ in range(iterations):
+            buffer, elapsed = _timed(render)
+            size = len(buffer.getvalue())
+            samples.append(elapsed)
+        results[kind] = dict(_stats(samples), bytes=size)
+
+    async def service_exports():
+        service = ExportService(max_workers=2)
+        timings = {}
+        try:
+            for kind in (PDF, DOCX):
+                # First call includes worker start-up; the repeat is served from the output cache
+                for phase in ("cold", "cached"):
+                    start = time.perf_counter()
+                    await service.export(kind, report)
+                    timings[f"{kind}_{phase}_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        finally:
+            service.close()
+        return timings
+
+    results["service"] = asyncio.run(service_exports())
+    return results
+
+def _flatten(results: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+def compare(baseline: dict, current: dict):
+    """Prints the relative change of every metric shared with a previous results file."""
+    before = _flatten(baseline.get("results", {}))
+    after = _flatten(current["results"])
+    print(f"\n📊 Compared with {baseline.get('meta', {}).get('commit') or 'baseline'}:")
+    for key in sorted(before.keys() & after.keys()):
+        if before[key]:
+            change = (after[key] - before[key]) / before[key] * 100
+            print(f"  {key:<45} {before[key]:>12} -> {after[key]:<12} ({change:+.1f}%)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the research pipeline")
+    parser.add_argument("--fixture", default="default", help="Fixture name in benchmarks/fixtures or a path to one")
+    parser.add_argument("--iterations", type=int, default=3, help="Repetitions of each latency benchmark")
+    parser.add_argument("--jobs", type=int, default=4, help="Concurrent jobs for the throughput benchmark")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier on every recorded latency")
+    parser.add_argument("--unthrottled", action="store_true", help="Lift provider rate limits to measure pipeline overhead alone")
+    parser.add_argument("--only", nargs="+", choices=["phases", "end_to_end", "throughput", "memory", "export"],
+                        help="Run a subset of the benchmarks")
+    parser.add_argument("--output", help="Write machine-readable results to this JSON file")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    _configure_env(args.unthrottled)
+    from benchmarks.replay import build_orchestrator, load_fixture
+
+    fixture = load_fixture(args.fixture)
+
+    def factory(seed=0):
+        return build_orchestrator(fixture, seed=seed, scale=args.latency_scale)
+
+    selected = set(args.only or ["phases", "end_to_end", "throughput", "memory", "export"])
+    results = {}
+    report = None
+    if "phases" in selected:
+        print("⏱️ Phase latency...")
+        results["phases"], report = bench_phases(factory, args.iterations)
+    if "end_to_end" in selected:
+        print("⏱️ End-to-end runs...")
+        results["end_to_end"] = bench_end_to_end(factory, args.iterations)
+    if "throughput" in selected:
+        print(f"⏱️ Throughput with {args.jobs} concurrent jobs...")
+        results["throughput"] = bench_throughput(factory, args.jobs)
+    if "memory" in selected:
+        print("⏱️ Memory...")
+        results["memory"] = bench_memory(factory)
+    if "export" in selected:
+        print("⏱️ Export...")
+        results["export"] = bench_export(report or fixture["llm"]["summarize"]["response"], args.iterations)
+
+    output = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fixture": args.fixture,
+            "iterations": args.iterations,
+            "latency_scale": args.latency_scale,
+            "unthrottled": args.unthrottled,
+        },
+        "results": results,
+    }
+
+    print(json.dumps(output, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), output)
+    return output
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,8 @@ export function ResearchFlowDialog({ open, onOpenChange }: ResearchFlowDialogPro
     const [findings, setFindings] = useState<Record<string, string>>({})
     const [sources, setSources] = useState<string[]>([])
     const [report, setReport] = useState("")
+    // Returned by the research phase; lets re-runs reuse unchanged sub-topics
+    const [sessionId, setSessionId] = useState<string | undefined>(undefined)
 
     const resetState = () => {
         setStage("INPUT")
@@ -40,6 +42,7 @@ export function ResearchFlowDialog({ open, onOpenChange }: ResearchFlowDialogPro
         setFindings({})
         setSources([])
         setReport("")
+        setSessionId(undefined)
     }
 
     const handleStartPlanning = async () => {
@@ -69,9 +72,10 @@ export function ResearchFlowDialog({ open, onOpenChange }: ResearchFlowDialogPro
         }))
 
         try {
-            const data = await api.executeResearch({ sub_topics: requestData })
+            const data = await api.executeResearch({ sub_topics: requestData, session_id: sessionId })
             setFindings(data.findings)
             setSources(data.sources)
+            setSessionId(data.session_id)
             setStage("FINDINGS_REVIEW")
         } catch (err) {
             setError(err instanceof Error ? err.message : "An error occurred during research")
@@ -89,7 +93,8 @@ export function ResearchFlowDialog({ open, onOpenChange }: ResearchFlowDialogPro
                 topic,
                 research_findings: findings,
                 sources,
-                custom_prompt: customPrompt
+                custom_prompt: customPrompt,
+                session_id: sessionId
             })
             setReport(data.report)
             setStage("REPORT")
@@ -20,6 +20,7 @@ def main():
     parser.add_argument("topic", type=str, nargs="?", help="The research topic")
     parser.add_argument("--cli", action="store_true", help="Launch in CLI mode (default if topic provided)")
     parser.add_argument("--web", action="store_true", help="Launch the Web Interface (Default behavior now)")
+    parser.add_argument("--pipelined", action="store_true", help="Overlap planning, research and summarization (CLI mode)")
     
     args = parser.parse_args()
 
@@ -52,7 +53,10 @@ def main():
         return
 
     orchestrator = Orchestrator()
-    report = orchestrator.run(topic)
+    if args.pipelined:
+        report = orchestrator.run_pipelined(topic)
+    else:
+        report = orchestrator.run(topic)
     
     if report:
         print("\n\n" + "="*50)
@@ -1,19 +1,53 @@
 import json
 import os
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+import re
+from ..utils.lazy import LazyImport
+from ..utils.llm_cache import get_llm_cache
+from ..utils.ratelimit import LimitedChain, get_limiter
+from ..utils.telemetry import start_span
+
+# Loaded when the first agent is built, so importing the package stays cheap
+ChatGoogleGenerativeAI = LazyImport("langchain_google_genai", "ChatGoogleGenerativeAI")
+ChatPromptTemplate = LazyImport("langchain_core.prompts", "ChatPromptTemplate")
+JsonOutputParser = LazyImport("langchain_core.output_parsers", "JsonOutputParser")
+
+SUB_TOPICS_ARRAY = re.compile(r'"sub_topics"\s*:\s*\[')
+JSON_STRING = re.compile(r'\s*,?\s*"((?:[^"\\]|\\.)*)"')
+ARRAY_END = re.compile(r'\s*,?\s*\]')
+
+def iter_sub_topics(chunks):
+    """
+    Incrementally parses a streamed `{"sub_topics": [...]}` JSON plan, yielding each
+    sub-topic string as soon as its closing quote arrives. Stops at the end of the list.
+    """
+    buffer = ""
+    position = None
+    for chunk in chunks:
+        buffer += chunk
+        if position is None:
+            match = SUB_TOPICS_ARRAY.search(buffer)
+            if not match:
+                continue
+            position = match.end()
+        while True:
+            match = JSON_STRING.match(buffer, position)
+            if not match:
+                break
+            position = match.end()
+            yield json.loads(f'"{match.group(1)}"', strict=False)
+        if ARRAY_END.match(buffer, position):
+            return
 
 class PlannerAgent:
     def __init__(self):
         # Using gemini-pro as it is widely available
-        self.llm = ChatGoogleGenerativeAI(model="gemini-pro-latest", temperature=0)
+        self.model = "gemini-pro-latest"
+        self.llm = ChatGoogleGenerativeAI(model=self.model, temperature=0)
         self.parser = JsonOutputParser()
+        self.cache = get_llm_cache()
+        self.limiter = get_limiter("gemini")
 
-    def plan(self, topic: str, custom_prompt: str = None):
-        """
-        Decomposes the research topic into sub-topics.
-        """
+    def _build_prompt(self, custom_prompt: str = None):
         system_instructions = "You are a research planner. Your task is to break down a user-provided research topic into 3-5 distinct sub-topics for detailed analysis. Return the result as a JSON object with a key 'sub_topics' containing a list of strings."
         
         if custom_prompt:
@@ -24,15 +58,80 @@ class PlannerAgent:
             ("user", "Research Topic: {topic}")
         ])
         
-        chain = prompt | self.llm | self.parser
+        return prompt
+
+    def plan(self, topic: str, custom_prompt: str = None, use_cache: bool = True):
+        """
+        Decomposes the research topic into sub-topics.
+        Set use_cache=False to bypass the LLM response cache.
+        """
+        prompt = self._build_prompt(custom_prompt)
+        chain = LimitedChain(prompt | self.llm | self.parser, self.limiter)
         
         try:
-            result = chain.invoke({"topic": topic})
+            result = self.cache.invoke(chain, prompt, self.model, {"topic": topic}, use_cache=use_cache)
             return result.get("sub_topics", [])
         except Exception as e:
             print(f"Error in planning: {e}")
             return []
 
+    async def aplan(self, topic: str, custom_prompt: str = None, use_cache: bool = True):
+        """
+        Async variant of `plan`.
+        """
+        prompt = self._build_prompt(custom_prompt)
+        chain = LimitedChain(prompt | self.llm | self.parser, self.limiter)
+
+        try:
+            result = await self.cache.ainvoke(chain, prompt, self.model, {"topic": topic}, use_cache=use_cache)
+            return result.get("sub_topics", [])
+        except Exception as e:
+            print(f"Error in planning: {e}")
+            return []
+
+    def stream_plan(self, topic: str, custom_prompt: str = None, use_cache: bool = True):
+        """
+        Yields sub-topics one at a time while the plan is still being generated,
+        so research on the first ones can start before the LLM has finished.
+        Shares its cache entries with `plan`.
+        """
+        prompt = self._build_prompt(custom_prompt)
+        inputs = {"topic": topic}
+        cached = self.cache.lookup(self.model, prompt, inputs) if use_cache else None
+        if cached is not None:
+            yield from cached.get("sub_topics", [])
+            return
+
+        chain = LimitedChain(prompt | self.llm, self.limiter)
+        text = []
+
+        def chunks():
+            for chunk in chain.stream(inputs):
+                text.append(chunk.content)
+                yield chunk.content
+
+        sub_topics = []
+        current = start_span("llm.stream", model=self.model)
+        try:
+            for sub_topic in iter_sub_topics(chunks()):
+                sub_topics.append(sub_topic)
+                yield sub_topic
+            if not sub_topics:
+                # The model didn't produce the expected shape incrementally; parse the whole answer
+                for sub_topic in self.parser.parse("".join(text)).get("sub_topics", []):
+                    sub_topics.append(sub_topic)
+                    yield sub_topic
+            self.cache.record_usage(current, self.model, prompt, inputs, "".join(text))
+        except Exception as e:
+            print(f"Error in planning: {e}")
+            current.fail(e)
+            return
+        finally:
+            current.finish()
+
+        if use_cache and sub_topics:
+            self.cache.store(self.model, prompt, inputs, {"sub_topics": sub_topics})
+
 if __name__ == "__main__":
     # Test
     planner = PlannerAgent()
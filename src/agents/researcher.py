@@ -1,46 +1,219 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from ddgs import DDGS
+import asyncio
+import concurrent.futures
+import contextvars
+import os
+import time
 from ..skills.base import BaseSkill
+from ..utils.context import ContextPacker
+from ..utils.lazy import LazyImport
+from ..utils.llm_cache import get_llm_cache
+from ..utils.ratelimit import LimitedChain, get_limiter
+from ..utils.sources import SearchResult, SourceIndex
+from ..utils.telemetry import ERRORS, span
+
+ChatGoogleGenerativeAI = LazyImport("langchain_google_genai", "ChatGoogleGenerativeAI")
+ChatPromptTemplate = LazyImport("langchain_core.prompts", "ChatPromptTemplate")
 
 class ResearcherAgent:
-    def __init__(self, skills: list[BaseSkill] = None):
-        self.llm = ChatGoogleGenerativeAI(model="gemini-pro-latest", temperature=0)
+    def __init__(self, skills: list[BaseSkill] = None, skill_timeout: float = 20.0, total_timeout: float = 30.0, fetcher: BaseSkill = None):
+        self.model = "gemini-pro-latest"
+        self.llm = ChatGoogleGenerativeAI(model=self.model, temperature=0)
+        self.cache = get_llm_cache()
+        self.limiter = get_limiter("gemini")
         self.skills = skills or []
+        self.packer = ContextPacker(max_tokens=int(os.getenv("RESEARCH_CONTEXT_TOKENS", "6000")))
+        # Per-skill deadline (a skill's own `timeout` attribute wins) and an
+        # overall deadline after which any provider still running is dropped.
+        self.skill_timeout = skill_timeout
+        self.total_timeout = total_timeout
+        # Optional second stage that reads the top hits' pages (see PageFetchSkill)
+        self.fetcher = fetcher
+
+    def _skill_timeout(self, skill: BaseSkill) -> float:
+        return min(getattr(skill, "timeout", None) or self.skill_timeout, self.total_timeout)
+
+    @staticmethod
+    def _execute_skill(skill: BaseSkill, sub_topic: str, **kwargs):
+        with span("skill.execute", skill=skill.name) as current:
+            result = skill.execute(sub_topic, **kwargs)
+            if "error" in result:
+                current.fail(result["error"])
+            return result
 
-    def research(self, sub_topic: str, instructions: str = None):
+    def _run_skills(self, sub_topic: str):
         """
-        Conducts research on a sub-topic using search tools.
-        Returns a dict: {"content": str, "sources": list}
+        Fans out all skills concurrently and collects their results in skill order.
+        Returns a list of (skill, result_dict) tuples; slow or failing skills yield an error dict.
         """
-        sources = []
-        search_results_text = ""
-        
-        # 1. Search for information using provided skills
         if not self.skills:
-             search_results_text += "No search skills configured.\n"
+            return []
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(self.skills))
+        start = time.monotonic()
+        # Each worker runs in a copy of this context so its skill span nests under the sub-topic's
+        futures = [executor.submit(contextvars.copy_context().run, self._execute_skill, skill, sub_topic) for skill in self.skills]
+
+        results = []
+        try:
+            for skill, future in zip(self.skills, futures):
+                timeout = self._skill_timeout(skill)
+                try:
+                    result = future.result(timeout=max(0.0, start + timeout - time.monotonic()))
+                except concurrent.futures.TimeoutError:
+                    future.cancel()
+                    ERRORS.inc(span="skill.deadline", skill=skill.name)
+                    result = {"error": f"timed out after {timeout:.0f}s"}
+                except Exception as e:
+                    result = {"error": f"{e}"}
+                results.append((skill, result))
+        finally:
+            # Don't block on providers that blew their deadline; let them finish in the background.
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
 
-        for skill in self.skills:
+    async def _arun_skills(self, sub_topic: str, on_event=None):
+        """
+        Async variant of `_run_skills` built on `BaseSkill.aexecute`.
+        If given, `on_event` is called with skill_started/skill_finished progress events.
+        """
+        return list(await asyncio.gather(*(self._arun_skill(skill, sub_topic, on_event) for skill in self.skills)))
+
+    async def _arun_skill(self, skill: BaseSkill, sub_topic: str, on_event=None, **kwargs):
+        """Runs one skill under its deadline. Returns (skill, result_dict)."""
+        emit = on_event or (lambda event: None)
+        timeout = self._skill_timeout(skill)
+        emit({"type": "skill_started", "sub_topic": sub_topic, "skill": skill.name})
+        start = time.monotonic()
+        with span("skill.execute", skill=skill.name) as current:
             try:
-                # print(f"Executing skill: {skill.name}") 
-                result = skill.execute(sub_topic)
-                
-                if "error" in result:
-                    search_results_text += f"\nError in {skill.name}: {result['error']}\n"
-                    continue
-                
-                content = result.get("content", "")
-                skill_sources = result.get("sources", [])
-                
-                if content:
-                    search_results_text += content
-                if skill_sources:
-                    sources.extend(skill_sources)
-                    
+                result = await asyncio.wait_for(skill.aexecute(sub_topic, **kwargs), timeout=timeout)
+            except asyncio.TimeoutError:
+                ERRORS.inc(span="skill.deadline", skill=skill.name)
+                result = {"error": f"timed out after {timeout:.0f}s"}
             except Exception as e:
-                search_results_text += f"\nError executing skill {skill.name}: {e}\n"
+                result = {"error": f"{e}"}
+            if "error" in result:
+                current.fail(result["error"])
+        emit({
+            "type": "skill_finished",
+            "sub_topic": sub_topic,
+            "skill": skill.name,
+            "elapsed_ms": round((time.monotonic() - start) * 1000),
+            "error": result.get("error")
+        })
+        return skill, result
+
+    @staticmethod
+    def _hits(result: dict):
+        """
+        Returns (hits, blocks) for a successful skill result. Blocks are pre-rendered text from
+        skills that still return {"content", "sources"}; for SearchResult lists they are None
+        and each hit is rendered only if it makes it into the prompt.
+        """
+        if "results" in result:
+            return result["results"], None
+        blocks = [block for block in result.get("content", "").split("\n\n") if block.strip()]
+        return [SearchResult.coerce(source) for source in result.get("sources", [])], blocks
+
+    @classmethod
+    def _hit_sources(cls, skill_results) -> list:
+        """Hits of every successful skill, in skill order (the fetch stage reads the top ones)."""
+        return [hit for _, result in skill_results if "error" not in result for hit in cls._hits(result)[0]]
+
+    def _fetch_pages(self, sub_topic: str, skill_results) -> list:
+        """Second stage: with a `fetcher`, adds the top hits' page text as one more (skill, result) pair."""
+        if self.fetcher is None:
+            return skill_results
+        try:
+            result = self._execute_skill(self.fetcher, sub_topic, sources=self._hit_sources(skill_results))
+        except Exception as e:
+            result = {"error": f"{e}"}
+        return skill_results + [(self.fetcher, result)]
+
+    async def _afetch_pages(self, sub_topic: str, skill_results, on_event=None) -> list:
+        """Async variant of `_fetch_pages`."""
+        if self.fetcher is None:
+            return skill_results
+        return skill_results + [await self._arun_skill(self.fetcher, sub_topic, on_event, sources=self._hit_sources(skill_results))]
+
+    def _collect(self, skill_results, sub_topic: str = None, source_index: SourceIndex = None):
+        """
+        Splits (skill, result) pairs into evidence chunks (one per search hit, in skill order)
+        and a flat list of snippet-free SearchResult sources.
+
+        With a shared `source_index`, each hit is registered under a run-wide ID. A document
+        another sub-topic owns is cut down to a short excerpt citing it, and the source list
+        holds the shared entries rather than copies.
+        """
+        return self._render(self._claim(skill_results, sub_topic, source_index), sub_topic, source_index)
+
+    def _claim(self, skill_results, sub_topic: str = None, source_index: SourceIndex = None) -> list:
+        """
+        First half of `_collect`: registers every hit with the `source_index` and returns the
+        evidence as (text, None, None) or (text, hit, entry) items for `_render`.
+        """
+        evidence = []
+
+        if not self.skills:
+             evidence.append(("No search skills configured.", None, None))
+
+        rank = 0
+        for skill, result in skill_results:
+            if "error" in result:
+                evidence.append((f"Error in {skill.name}: {result['error']}", None, None))
+                continue
+
+            hits, blocks = self._hits(result)
+            # Pre-rendered content can only be matched to documents with one block per source
+            if blocks is not None and len(blocks) != len(hits):
+                evidence.extend((block, None, None) for block in blocks)
+                evidence.extend((None, hit, hit.reference()) for hit in hits)
+                continue
+
+            for hit, block in zip(hits, blocks or [None] * len(hits)):
+                entry = None
+                if source_index is not None:
+                    entry, _ = source_index.register(hit, block or hit.snippet, owner=sub_topic, rank=rank)
+                    rank += 1
+                evidence.append((block or hit.render(), hit, entry))
+
+        return evidence
+
+    def _render(self, evidence: list, sub_topic: str = None, source_index: SourceIndex = None):
+        """Second half of `_collect`: the chunks and sources, once document owners are settled."""
+        chunks = []
+        sources = []
+        for text, hit, entry in evidence:
+            if hit is None:
+                chunks.append(text)
+                continue
+            if source_index is None or entry.id is None:
+                if text is not None:
+                    chunks.append(text)
+                sources.append(entry if entry is not None else hit.reference())
+                continue
+            # A fetched page shares its entry with the search hit that linked to it
+            if entry not in sources:
+                sources.append(entry)
+            if source_index.owner(entry) == sub_topic:
+                chunks.append(f"[{entry.id}] {text}")
+            else:
+                chunks.append(f"[{entry.id}] {entry.title} (covered under another sub-topic): {self._excerpt(hit.snippet or text)}")
+        return chunks, sources
+
+    @staticmethod
+    def _excerpt(text: str, limit: int = 200) -> str:
+        """The first `limit` characters of `text`, cut at a word boundary."""
+        text = " ".join((text or "").split())
+        if len(text) <= limit:
+            return text
+        return text[:limit].rsplit(" ", 1)[0] + "…"
 
-        # 2. Summarize findings for this sub-topic
+    def _pack(self, chunks: list, sub_topic: str, instructions: str = None) -> str:
+        """Fits the evidence into the prompt's token budget, most relevant chunks first."""
+        return self.packer.pack(chunks, f"{sub_topic} {instructions or ''}")
+
+    def _build_prompt(self, instructions: str = None):
         system_instructions = "You are a researcher. Analyze the following search results and provide a concise summary relevant to the research sub-topic. If the search results are empty or irrelevant, state that."
         
         if instructions:
@@ -51,19 +224,128 @@ class ResearcherAgent:
             ("user", "Sub-topic: {sub_topic}\n\nSearch Results: {search_results}")
         ])
         
-        chain = prompt | self.llm
-        
-        try:
-            response = chain.invoke({"sub_topic": sub_topic, "search_results": search_results_text})
-            return {
-                "content": response.content,
-                "sources": sources
-            }
-        except Exception as e:
+        return prompt
+
+    def prepare(self, sub_topic: str, instructions: str = None, source_index: SourceIndex = None) -> dict:
+        """
+        Search step of `research`: runs the skills (and the fetch stage) and packs the evidence.
+        Returns {"sub_topic", "instructions", "inputs", "sources"} for `analyze_batch`.
+
+        With a shared `source_index`, waits for the sub-topics planned before this one to
+        finish searching, so ownership of shared documents does not depend on timing.
+        """
+        with span("research.search", sub_topic=sub_topic):
+            try:
+                evidence = self._claim(self._fetch_pages(sub_topic, self._run_skills(sub_topic)), sub_topic, source_index)
+            finally:
+                if source_index is not None:
+                    source_index.searched(sub_topic)
+            if source_index is not None:
+                source_index.wait_for_earlier(sub_topic, self._owner_timeout())
+            chunks, sources = self._render(evidence, sub_topic, source_index)
+            return self._prepared(sub_topic, instructions, chunks, sources)
+
+    async def aprepare(self, sub_topic: str, instructions: str = None, on_event=None, source_index: SourceIndex = None) -> dict:
+        """Async variant of `prepare`."""
+        with span("research.search", sub_topic=sub_topic):
+            try:
+                skill_results = await self._afetch_pages(sub_topic, await self._arun_skills(sub_topic, on_event), on_event)
+                evidence = self._claim(skill_results, sub_topic, source_index)
+            finally:
+                if source_index is not None:
+                    source_index.searched(sub_topic)
+            if source_index is not None:
+                await source_index.await_earlier(sub_topic, self._owner_timeout())
+            chunks, sources = self._render(evidence, sub_topic, source_index)
+            return self._prepared(sub_topic, instructions, chunks, sources)
+
+    def _owner_timeout(self) -> float:
+        """Upper bound on waiting for earlier sub-topics: their search and fetch stages."""
+        fetch_timeout = self._skill_timeout(self.fetcher) if self.fetcher is not None else 0
+        return self.total_timeout + fetch_timeout
+
+    def _prepared(self, sub_topic: str, instructions: str, chunks: list, sources: list) -> dict:
+        return {
+            "sub_topic": sub_topic,
+            "instructions": instructions,
+            "inputs": {"sub_topic": sub_topic, "search_results": self._pack(chunks, sub_topic, instructions)},
+            "sources": sources
+        }
+
+    def _analysis_chain(self, instructions: str = None):
+        prompt = self._build_prompt(instructions)
+        return prompt, LimitedChain(prompt | self.llm, self.limiter)
+
+    @staticmethod
+    def _finding(prepared: dict, content) -> dict:
+        if isinstance(content, Exception):
             return {
-                "content": f"Error in research analysis: {e}",
+                "content": f"Error in research analysis: {content}",
                 "sources": []
             }
+        return {
+            "content": content,
+            "sources": prepared["sources"]
+        }
+
+    def _batch_chain(self):
+        """Each item is rendered with its own `_build_prompt`, so the chain is the bare model."""
+        return LimitedChain(self.llm, self.limiter)
+
+    def analyze_batch(self, prepared: list, use_cache: bool = True, max_concurrency: int = None) -> list:
+        """
+        Analysis step of `research` for many prepared sub-topics at once: all their prompts go to
+        the model through one `chain.batch` call with at most `max_concurrency` calls in flight.
+        Prompts and cache keys are the same as in `research`, so both paths share cached analyses.
+        Returns one finding per item; an item whose call failed gets an error finding like `research` does.
+        """
+        prompts = [self._build_prompt(item["instructions"]) for item in prepared]
+        contents = self.cache.batch(self._batch_chain(), prompts, self.model, [item["inputs"] for item in prepared],
+                                    extract=lambda response: response.content, use_cache=use_cache, max_concurrency=max_concurrency)
+        return [self._finding(item, content) for item, content in zip(prepared, contents)]
+
+    async def aanalyze_batch(self, prepared: list, use_cache: bool = True, max_concurrency: int = None) -> list:
+        """Async variant of `analyze_batch`, built on `chain.abatch`."""
+        prompts = [self._build_prompt(item["instructions"]) for item in prepared]
+        contents = await self.cache.abatch(self._batch_chain(), prompts, self.model, [item["inputs"] for item in prepared],
+                                           extract=lambda response: response.content, use_cache=use_cache, max_concurrency=max_concurrency)
+        return [self._finding(item, content) for item, content in zip(prepared, contents)]
+
+    def research(self, sub_topic: str, instructions: str = None, use_cache: bool = True, source_index: SourceIndex = None):
+        """
+        Conducts research on a sub-topic using search tools.
+        Returns a dict: {"content": str, "sources": list}
+        Set use_cache=False to bypass the LLM response cache. Pass the run's `source_index`
+        to share evidence with the other sub-topics (see `_collect`).
+        """
+        with span("research.sub_topic", sub_topic=sub_topic) as current:
+            # 1. Search for information using provided skills (all skills run concurrently)
+            prepared = self.prepare(sub_topic, instructions, source_index)
+
+            # 2. Summarize findings for this sub-topic
+            prompt, chain = self._analysis_chain(instructions)
+            try:
+                content = self.cache.invoke(chain, prompt, self.model, prepared["inputs"], extract=lambda response: response.content, use_cache=use_cache)
+            except Exception as e:
+                current.fail(e)
+                content = e
+            return self._finding(prepared, content)
+
+    async def aresearch(self, sub_topic: str, instructions: str = None, use_cache: bool = True, on_event=None, source_index: SourceIndex = None):
+        """
+        Async variant of `research`.
+        `on_event` receives per-skill progress events (see `_arun_skills`).
+        """
+        with span("research.sub_topic", sub_topic=sub_topic) as current:
+            prepared = await self.aprepare(sub_topic, instructions, on_event, source_index)
+
+            prompt, chain = self._analysis_chain(instructions)
+            try:
+                content = await self.cache.ainvoke(chain, prompt, self.model, prepared["inputs"], extract=lambda response: response.content, use_cache=use_cache)
+            except Exception as e:
+                current.fail(e)
+                content = e
+            return self._finding(prepared, content)
 
 if __name__ == "__main__":
     # Test
@@ -1,22 +1,31 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
+import asyncio
+import concurrent.futures
+import contextvars
+import os
+from ..utils.context import ContextPacker, count_tokens, truncate_tokens
+from ..utils.lazy import LazyImport
+from ..utils.llm_cache import get_llm_cache
+from ..utils.ratelimit import LimitedChain, get_limiter
+from ..utils.sources import SearchResult
+
+ChatGoogleGenerativeAI = LazyImport("langchain_google_genai", "ChatGoogleGenerativeAI")
+ChatPromptTemplate = LazyImport("langchain_core.prompts", "ChatPromptTemplate")
+
+# Reports that failed to generate are returned as text starting with this prefix
+ERROR_PREFIX = "Error in summarization: "
 
 class SummarizerAgent:
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(model="gemini-pro-latest", temperature=0)
-
-    def summarize(self, topic: str, research_findings: dict, sources: list = [], custom_prompt: str = None):
-        """
-        Aggregates research findings into a final report.
-        research_findings: dict where key is sub-topic and value is the finding.
-        sources: list of dicts with title and href.
-        """
-        
-        # Format findings for the prompt
-        findings_text = ""
-        for sub, finding in research_findings.items():
-            findings_text += f"### {sub}\n{finding}\n\n"
+        self.model = "gemini-pro-latest"
+        self.llm = ChatGoogleGenerativeAI(model=self.model, temperature=0)
+        self.cache = get_llm_cache()
+        self.limiter = get_limiter("gemini")
+        self.packer = ContextPacker(max_tokens=int(os.getenv("SUMMARY_CONTEXT_TOKENS", "24000")))
+        # Findings larger than this (in tokens) are condensed per section first (map), then merged (reduce)
+        self.map_reduce_threshold = int(os.getenv("SUMMARY_MAP_REDUCE_TOKENS", "12000"))
+        self.map_concurrency = int(os.getenv("SUMMARY_MAP_CONCURRENCY", "5"))
 
+    def _build_prompt(self, custom_prompt: str = None):
         system_instructions = "You are a lead research analyst. Your task is to correct multiple research findings into a single, cohesive, professional markdown report."
         
         if custom_prompt:
@@ -27,27 +36,160 @@ class SummarizerAgent:
             ("user", "Research Topic: {topic}\n\nFindings:\n{findings_text}")
         ])
         
-        chain = prompt | self.llm
+        return prompt
+
+    def _build_map_prompt(self, custom_prompt: str = None):
+        system_instructions = "You are a research analyst writing one section of a larger report. Condense the finding below into a well-structured markdown section body for the given sub-topic. Keep every concrete fact, figure and source reference; drop repetition and filler. Do not add a title or an introduction to the overall topic."
+
+        if custom_prompt:
+            system_instructions += f"\n\nThe final report must follow these user instructions, so keep what they need: {custom_prompt}"
+
+        return ChatPromptTemplate.from_messages([
+            ("system", system_instructions),
+            ("user", "Research Topic: {topic}\n\nSub-topic: {sub_topic}\n\nFinding:\n{finding}")
+        ])
+
+    def _use_map_reduce(self, research_findings: dict, map_reduce: bool = None) -> bool:
+        if map_reduce is not None:
+            return map_reduce
+        return len(research_findings) > 1 and sum(count_tokens(str(finding)) for finding in research_findings.values()) > self.map_reduce_threshold
+
+    def _map_inputs(self, topic: str, sub_topic: str, finding) -> dict:
+        # Each map call sees at most the full context budget of its own section
+        return {"topic": topic, "sub_topic": sub_topic, "finding": truncate_tokens(str(finding), self.packer.max_tokens)}
+
+    def condense_section(self, topic: str, sub_topic: str, finding: str, custom_prompt: str = None, use_cache: bool = True) -> str:
+        """
+        Map step: condenses a single section. Raises on LLM errors so callers can fall back
+        to the original text.
+        """
+        prompt = self._build_map_prompt(custom_prompt)
+        chain = LimitedChain(prompt | self.llm, self.limiter)
+        inputs = self._map_inputs(topic, sub_topic, finding)
+        return self.cache.invoke(chain, prompt, self.model, inputs, extract=lambda response: response.content, use_cache=use_cache)
+
+    def _map_sections(self, topic: str, research_findings: dict, custom_prompt: str = None, use_cache: bool = True) -> dict:
+        """Condenses every section in parallel. A section whose call fails keeps its original text."""
+        condensed = dict(research_findings)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.map_concurrency) as executor:
+            futures = {
+                sub: executor.submit(contextvars.copy_context().run, self.condense_section, topic, sub, finding, custom_prompt, use_cache)
+                for sub, finding in research_findings.items()
+            }
+            for sub, future in futures.items():
+                try:
+                    condensed[sub] = future.result()
+                except Exception as e:
+                    print(f"⚠️ Could not condense section '{sub}': {e}")
+        return condensed
+
+    async def _amap_sections(self, topic: str, research_findings: dict, custom_prompt: str = None, use_cache: bool = True) -> dict:
+        """Async variant of `_map_sections`."""
+        prompt = self._build_map_prompt(custom_prompt)
+        chain = LimitedChain(prompt | self.llm, self.limiter)
+        semaphore = asyncio.Semaphore(self.map_concurrency)
+
+        async def condense(inputs):
+            async with semaphore:
+                return await self.cache.ainvoke(chain, prompt, self.model, inputs, extract=lambda response: response.content, use_cache=use_cache)
+
+        results = await asyncio.gather(
+            *(condense(self._map_inputs(topic, sub, finding)) for sub, finding in research_findings.items()),
+            return_exceptions=True
+        )
+
+        condensed = dict(research_findings)
+        for sub, result in zip(research_findings, results):
+            if isinstance(result, Exception):
+                print(f"⚠️ Could not condense section '{sub}': {result}")
+            else:
+                condensed[sub] = result
+        return condensed
+
+    def _format_findings(self, topic: str, research_findings: dict) -> str:
+        # Every section survives; oversized ones are trimmed to their share of the token budget
+        findings_text = ""
+        for sub, finding in self.packer.pack_sections(research_findings, topic).items():
+            findings_text += f"### {sub}\n{finding}\n\n"
+        return findings_text
+
+    def _append_references(self, report_content: str, sources: list) -> str:
+        if sources:
+            report_content += "\n\n## References\n"
+            unique_links = set()
+            for source in map(SearchResult.coerce, sources):
+                title = source.title or 'Unknown Title'
+                href = source.url
+                # Deduplicate by URL
+                if href not in unique_links:
+                    report_content += f"- [{title}]({href})\n"
+                    unique_links.add(href)
+        return report_content
+
+    def summarize(self, topic: str, research_findings: dict, sources: list = [], custom_prompt: str = None, use_cache: bool = True, map_reduce: bool = None):
+        """
+        Aggregates research findings into a final report.
+        research_findings: dict where key is sub-topic and value is the finding.
+        sources: SearchResult list (or their dict form, with title and href).
+        Set use_cache=False to bypass the LLM response cache.
+        map_reduce: condense sections in parallel before merging them; by default this is
+        chosen automatically when the findings exceed SUMMARY_MAP_REDUCE_TOKENS.
+        """
+        if self._use_map_reduce(research_findings, map_reduce):
+            print("🗂️ Condensing sections before merging...")
+            research_findings = self._map_sections(topic, research_findings, custom_prompt, use_cache)
+
+        prompt = self._build_prompt(custom_prompt)
+        chain = LimitedChain(prompt | self.llm, self.limiter)
+        inputs = {"topic": topic, "findings_text": self._format_findings(topic, research_findings)}
         
         try:
-            response = chain.invoke({"topic": topic, "findings_text": findings_text})
-            report_content = response.content
-            
-            # Append References
-            if sources:
-                report_content += "\n\n## References\n"
-                unique_links = set()
-                for source in sources:
-                    title = source.get('title', 'Unknown Title')
-                    href = source.get('href', '#')
-                    # Deduplicate by URL
-                    if href not in unique_links:
-                        report_content += f"- [{title}]({href})\n"
-                        unique_links.add(href)
-            
-            return report_content
+            content = self.cache.invoke(chain, prompt, self.model, inputs, extract=lambda response: response.content, use_cache=use_cache)
+            return self._append_references(content, sources)
         except Exception as e:
-            return f"Error in summarization: {e}"
+            return f"{ERROR_PREFIX}{e}"
+
+    async def asummarize(self, topic: str, research_findings: dict, sources: list = [], custom_prompt: str = None, use_cache: bool = True, map_reduce: bool = None):
+        """
+        Async variant of `summarize`.
+        """
+        if self._use_map_reduce(research_findings, map_reduce):
+            print("🗂️ Condensing sections before merging...")
+            research_findings = await self._amap_sections(topic, research_findings, custom_prompt, use_cache)
+
+        prompt = self._build_prompt(custom_prompt)
+        chain = LimitedChain(prompt | self.llm, self.limiter)
+        inputs = {"topic": topic, "findings_text": self._format_findings(topic, research_findings)}
+
+        try:
+            content = await self.cache.ainvoke(chain, prompt, self.model, inputs, extract=lambda response: response.content, use_cache=use_cache)
+            return self._append_references(content, sources)
+        except Exception as e:
+            return f"{ERROR_PREFIX}{e}"
+
+    async def astream_summarize(self, topic: str, research_findings: dict, sources: list = [], custom_prompt: str = None, use_cache: bool = True, map_reduce: bool = None):
+        """
+        Streams the final report as text chunks while the LLM generates it.
+        The references section is yielded as the last chunk. With map-reduce, only the
+        final merge is streamed.
+        """
+        if self._use_map_reduce(research_findings, map_reduce):
+            research_findings = await self._amap_sections(topic, research_findings, custom_prompt, use_cache)
+
+        prompt = self._build_prompt(custom_prompt)
+        chain = LimitedChain(prompt | self.llm, self.limiter)
+        inputs = {"topic": topic, "findings_text": self._format_findings(topic, research_findings)}
+
+        try:
+            async for text in self.cache.astream(chain, prompt, self.model, inputs, extract=lambda chunk: chunk.content, use_cache=use_cache):
+                yield text
+        except Exception as e:
+            yield f"{ERROR_PREFIX}{e}"
+            return
+
+        references = self._append_references("", sources)
+        if references:
+            yield references
 
 if __name__ == "__main__":
     # Test
@@ -1,3 +1,8 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import os
+import time
 from src.agents.planner import PlannerAgent
 from src.agents.researcher import ResearcherAgent
 from src.agents.summarizer import SummarizerAgent
@@ -8,30 +13,242 @@ from src.skills.search import (
     WikipediaSearchSkill, 
     ArxivSearchSkill
 )
+from src.skills.cache import CachedSkill
+from src.skills.fetch import create_page_fetcher
+from src.skills.hedged import HedgedSearchSkill
+from src.skills.ratelimit import RateLimitedSkill
+from src.utils.findings_index import get_findings_index
+from src.utils.sessions import ResearchSessionStore, get_session_store
+from src.utils.singleflight import SingleFlight
+from src.utils.sources import SearchResult, SourceIndex
+from src.utils.telemetry import traced
 
 class Orchestrator:
-    def __init__(self):
+    def __init__(self, max_concurrency: int = None):
         self.planner = PlannerAgent()
+        # Sub-topics researched at once; provider quotas are enforced separately by the rate limiters
+        self.max_concurrency = max_concurrency or int(os.getenv("RESEARCH_CONCURRENCY", "5"))
         
         # Configure skills
-        # This logic mimics the previous priority logic: Tavily > Serper > DDG
-        # We also include Wikipedia and Arxiv as supplementary skills
-        search_skills = []
-        import os
-        
+        # Every configured web search provider goes into one hedged composite skill, in
+        # priority order Tavily > Serper > DDG, so a slow or failing provider no longer
+        # stalls the sub-topic. Wikipedia and Arxiv are supplementary skills.
+        # Every provider call counts against that provider's process-wide rate limiter.
+        web_providers = []
         if os.getenv("TAVILY_API_KEY"):
-             search_skills.append(TavilySearchSkill())
-        elif os.getenv("SERPER_API_KEY"):
-             search_skills.append(SerperSearchSkill())
-        else:
-             search_skills.append(DuckDuckGoSearchSkill())
-             
-        search_skills.append(WikipediaSearchSkill())
-        search_skills.append(ArxivSearchSkill())
+             web_providers.append(TavilySearchSkill())
+        if os.getenv("SERPER_API_KEY"):
+             web_providers.append(SerperSearchSkill())
+        web_providers.append(DuckDuckGoSearchSkill())
+
+        search_skills = [
+            HedgedSearchSkill.for_concurrency([RateLimitedSkill(skill) for skill in web_providers], self.max_concurrency),
+            RateLimitedSkill(WikipediaSearchSkill()),
+            RateLimitedSkill(ArxivSearchSkill()),
+        ]
+
+        # Serve repeated queries (e.g. re-running one edited sub-topic) from the shared search cache
+        if os.getenv("SEARCH_CACHE_DISABLED", "").lower() not in ("1", "true"):
+            search_skills = [CachedSkill(skill) for skill in search_skills]
 
-        self.researcher = ResearcherAgent(skills=search_skills)
+        # Opt-in second stage that reads the top hits' pages (PAGE_FETCH_COUNT > 0)
+        self.fetcher = create_page_fetcher()
+        self.researcher = ResearcherAgent(skills=search_skills, fetcher=self.fetcher)
         self.summarizer = SummarizerAgent()
+        self.sessions = get_session_store()
+        # Opt-in: reuse findings of near-identical sub-topics researched in earlier runs
+        self.findings_index = get_findings_index() if os.getenv("SEMANTIC_REUSE", "").lower() in ("1", "true") else None
+        # Opt-in: search every sub-topic first, then send all analysis prompts as one batch
+        self.batch_analysis = os.getenv("RESEARCH_BATCH_ANALYSIS", "").lower() in ("1", "true")
+        self.analysis_concurrency = int(os.getenv("RESEARCH_ANALYSIS_CONCURRENCY", "0")) or self.max_concurrency
+        # Identical concurrent calls (e.g. clients retrying a slow request) share one computation
+        self.plan_flights = SingleFlight("plan")
+        self.research_flights = SingleFlight("research")
+        self.summary_flights = SingleFlight("summarize")
+
+    @staticmethod
+    def _task_items(sub_topics: list):
+        """Normalizes sub-topic inputs (plain strings or objects with .topic/.instructions)."""
+        task_items = []
+        for item in sub_topics:
+            if isinstance(item, str):
+                task_items.append({"topic": item, "instructions": None})
+            else:
+                # Assume object with .topic and .instructions attributes (Pydantic model)
+                task_items.append({"topic": item.topic, "instructions": getattr(item, "instructions", None)})
+        return task_items
+
+    @staticmethod
+    def _record_result(sub: str, result, research_findings: dict, source_index: SourceIndex):
+        # Result is now a dict {"content": ..., "sources": ...}
+        if isinstance(result, dict):
+            research_findings[sub] = result.get("content", "")
+            # Registering is idempotent, so sources shared between sub-topics are kept once
+            for source in result.get("sources", []):
+                source_index.register(source, owner=sub)
+        else:
+            # Fallback for legacy or error string
+            research_findings[sub] = str(result)
+
+    def _reuse_session_items(self, session_id: str, task_items: list, research_findings: dict, source_index: SourceIndex):
+        """
+        Fills in findings for items whose topic and instructions are unchanged since the
+        session's previous run. Returns (reused {topic: result}, items that still need research).
+        """
+        if not session_id:
+            return {}, task_items
+
+        previous_items = self.sessions.get(session_id)["items"]
+        reused, pending = {}, []
+        for item in task_items:
+            previous = previous_items.get(ResearchSessionStore.item_key(item["topic"], item["instructions"]))
+            if previous is None:
+                pending.append(item)
+                continue
+            self._record_result(item["topic"], previous, research_findings, source_index)
+            reused[item["topic"]] = previous
+            print(f"♻️ Reusing research on: {item['topic']}")
+        return reused, pending
+
+    def _reuse_similar_items(self, task_items: list, research_findings: dict, source_index: SourceIndex):
+        """
+        Fills in findings for items whose topic is close enough to one in the findings index.
+        Returns (reused {topic: result}, items that still need research).
+        """
+        if self.findings_index is None:
+            return {}, task_items
+
+        reused, pending = {}, []
+        for item in task_items:
+            match = self.findings_index.lookup(item["topic"], item["instructions"])
+            if match is None:
+                pending.append(item)
+                continue
+            result = {"content": match["content"], "sources": match["sources"]}
+            self._record_result(item["topic"], result, research_findings, source_index)
+            reused[item["topic"]] = result
+            print(f"♻️ Reusing research on '{match['topic']}' for: {item['topic']} (similarity {match['similarity']})")
+        return reused, pending
+
+    def _index_findings(self, task_items: list, results: list):
+        if self.findings_index is None:
+            return
+        for item, result in zip(task_items, results):
+            if isinstance(result, dict) and not result.get("content", "").startswith("Error"):
+                self.findings_index.add(item["topic"], item["instructions"], result.get("content", ""), result.get("sources", []))
+
+    @staticmethod
+    def _plan_key(topic: str, custom_prompt: str = None) -> str:
+        return SingleFlight.key(" ".join(topic.lower().split()), (custom_prompt or "").strip())
+
+    @staticmethod
+    def _research_key(task_items: list, reused: dict, session_id: str = None) -> str:
+        # Findings reused from a session seed the run's source deduplication, so once a session
+        # contributes any, only calls for that same session are merged.
+        item_keys = [ResearchSessionStore.item_key(item["topic"], item["instructions"]) for item in task_items]
+        return SingleFlight.key(item_keys, session_id if reused else None)
+
+    @staticmethod
+    def _seeded_source_index(reused: dict, task_items: list) -> SourceIndex:
+        """Reused findings own their sources; the remaining documents go to the earliest item in plan order."""
+        source_index = SourceIndex()
+        for sub, previous in reused.items():
+            for source in previous.get("sources", []):
+                source_index.register(source, owner=sub)
+        for item in task_items:
+            source_index.expect(item["topic"])
+        return source_index
+
+    def _research_items(self, task_items: list, reused: dict) -> list:
+        """
+        Researches `task_items` concurrently. Returns each item's result, or the exception it raised, in order.
+        With batch analysis, every item is searched first and the analyses then go to the model as one batch.
+        """
+        # One evidence index per run, shared by every sub-topic's researcher
+        source_index = self._seeded_source_index(reused, task_items)
+        research = self.researcher.prepare if self.batch_analysis else self.researcher.research
+        results = [None] * len(task_items)
+
+        # Using ThreadPoolExecutor for concurrent research since it's IO-bound (network calls)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            # Map future to the item's position for reporting
+            future_to_index = {
+                executor.submit(contextvars.copy_context().run, research, item["topic"], item["instructions"], source_index=source_index): i
+                for i, item in enumerate(task_items)
+            }
+
+            for future in concurrent.futures.as_completed(future_to_index):
+                i = future_to_index[future]
+                sub = task_items[i]["topic"]
+                try:
+                    results[i] = future.result()
+                    if not self.batch_analysis:
+                        print(f"✅ Finished research on: {sub}")
+                except Exception as exc:
+                    print(f"❌ Error researching {sub}: {exc}")
+                    results[i] = exc
+
+        if self.batch_analysis:
+            ready = [i for i, result in enumerate(results) if not isinstance(result, Exception)]
+            print(f"🧠 Analyzing {len(ready)} sub-topics in one batch...")
+            findings = self.researcher.analyze_batch([results[i] for i in ready], max_concurrency=self.analysis_concurrency) if ready else []
+            for i, finding in zip(ready, findings):
+                results[i] = finding
+                print(f"✅ Finished research on: {task_items[i]['topic']}")
 
+        self._index_findings(task_items, results)
+        return results
+
+    def _record_results(self, task_items: list, results: list, research_findings: dict, source_index: SourceIndex) -> dict:
+        """Adds fresh results to the caller's findings. Returns {topic: result} for the session."""
+        fresh_results = {}
+        for item, result in zip(task_items, results):
+            sub = item["topic"]
+            if isinstance(result, Exception):
+                research_findings[sub] = f"Error: {result}"
+                continue
+            fresh_results[sub] = result
+            self._record_result(sub, result, research_findings, source_index)
+        return fresh_results
+
+    def _save_session_items(self, session_id: str, task_items: list, fresh_results: dict):
+        """Stores the session's current items: fresh successful results plus the reused ones."""
+        if not session_id:
+            return
+        session = self.sessions.get(session_id)
+        items = {}
+        for item in task_items:
+            key = ResearchSessionStore.item_key(item["topic"], item["instructions"])
+            result = fresh_results.get(item["topic"])
+            if isinstance(result, dict) and not result.get("content", "").startswith("Error"):
+                items[key] = {
+                    "topic": item["topic"],
+                    "instructions": item["instructions"],
+                    "content": result.get("content", ""),
+                    "sources": [source.to_dict() if isinstance(source, SearchResult) else source for source in result.get("sources", [])]
+                }
+            elif key in session["items"]:
+                items[key] = session["items"][key]
+        session["items"] = items
+        self.sessions.save(session_id, session)
+
+    def _cached_summary(self, session_id: str, summary_key: str):
+        if not session_id:
+            return None
+        summary = self.sessions.get(session_id)["summary"]
+        if summary and summary["key"] == summary_key:
+            print("♻️ Findings unchanged, reusing the previous report.")
+            return summary["report"]
+        return None
+
+    def _save_summary(self, session_id: str, summary_key: str, report: str):
+        if not session_id or not report or report.startswith("Error"):
+            return
+        session = self.sessions.get(session_id)
+        session["summary"] = {"key": summary_key, "report": report}
+        self.sessions.save(session_id, session)
+
+    @traced("phase.plan")
     def plan_research(self, topic: str, custom_prompt: str = None):
         """Phase 1: Generate a research plan."""
         print(f"🚀 Starting research planning on: {topic}")
@@ -39,68 +256,61 @@ class Orchestrator:
             print(f"ℹ️ Custom Instructions: {custom_prompt}")
             
         print("💡 Planning...")
-        sub_topics = self.planner.plan(topic, custom_prompt)
+        sub_topics = self.plan_flights.do(self._plan_key(topic, custom_prompt), self.planner.plan, topic, custom_prompt)
         if not sub_topics:
             print("❌ Failed to generate a plan.")
             return []
         print(f"📝 Sub-topics: {sub_topics}")
         return sub_topics
 
-    def execute_research(self, sub_topics: list):
-        """Phase 2: Conduct research on confirmed sub-topics."""
-        print("🔍 Researching sub-topics...")
-        research_findings = {}
-        all_sources = []
-        
-    def execute_research(self, sub_topics: list):
-        """Phase 2: Conduct research on confirmed sub-topics."""
+    @traced("phase.research")
+    def execute_research(self, sub_topics: list, session_id: str = None):
+        """
+        Phase 2: Conduct research on confirmed sub-topics.
+        With a `session_id`, only sub-topics whose topic or instructions changed since the
+        session's last run are researched again. With semantic reuse enabled, sub-topics close
+        to one researched in an earlier run reuse that finding. Concurrent calls for the same
+        sub-topics share one research run; each still gets its own findings and session update.
+        """
         print("🔍 Researching sub-topics...")
         research_findings = {}
-        all_sources = []
-        
-        # Helper to process input items (which could be strings or objects)
-        task_items = []
-        for item in sub_topics:
-            if isinstance(item, str):
-                task_items.append({"topic": item, "instructions": None})
-            else:
-                # Assume object with .topic and .instructions attributes (Pydantic model)
-                task_items.append({"topic": item.topic, "instructions": getattr(item, "instructions", None)})
+        source_index = SourceIndex()
 
-        # Using ThreadPoolExecutor for concurrent research since it's IO-bound (network calls)
-        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-            # Map future to the topic string for reporting
-            future_to_topic = {
-                executor.submit(self.researcher.research, item["topic"], item["instructions"]): item["topic"] 
-                for item in task_items
-            }
-            
-            for future in concurrent.futures.as_completed(future_to_topic):
-                sub = future_to_topic[future]
-                try:
-                    result = future.result()
-                    # Result is now a dict {"content": ..., "sources": ...}
-                    if isinstance(result, dict):
-                        content = result.get("content", "")
-                        sources = result.get("sources", [])
-                        research_findings[sub] = content
-                        all_sources.extend(sources)
-                    else:
-                        # Fallback for legacy or error string
-                        research_findings[sub] = str(result)
-                        
-                    print(f"✅ Finished research on: {sub}")
-                except Exception as exc:
-                    print(f"❌ Error researching {sub}: {exc}")
-                    research_findings[sub] = f"Error: {exc}"
-        return research_findings, all_sources
+        all_items = self._task_items(sub_topics)
+        reused, task_items = self._reuse_session_items(session_id, all_items, research_findings, source_index)
+        similar, task_items = self._reuse_similar_items(task_items, research_findings, source_index)
+
+        # Reused findings of either kind own their sources, so fresh sub-topics cite rather than repeat them
+        results = self.research_flights.do(self._research_key(task_items, reused, session_id), self._research_items, task_items, {**reused, **similar})
+        fresh_results = self._record_results(task_items, results, research_findings, source_index)
+
+        self._save_session_items(session_id, all_items, {**similar, **fresh_results})
+        return research_findings, source_index.sources()
+
+    @traced("phase.summarize")
+    def generate_summary(self, topic: str, research_findings: dict, sources: list, custom_prompt: str = None, session_id: str = None):
+        """
+        Phase 3: Generate final report.
+        With a `session_id`, the session's previous report is returned if nothing changed.
+        """
+        summary_key = ResearchSessionStore.summary_key(topic, research_findings, sources, custom_prompt)
+        cached = self._cached_summary(session_id, summary_key)
+        if cached is not None:
+            return cached
 
-    def generate_summary(self, topic: str, research_findings: dict, sources: list, custom_prompt: str = None):
-        """Phase 3: Generate final report."""
         print("✍️ Summarizing findings...")
-        final_report = self.summarizer.summarize(topic, research_findings, sources, custom_prompt)
+        final_report = self.summary_flights.do(summary_key, self.summarizer.summarize, topic, research_findings, sources, custom_prompt)
+        self._save_summary(session_id, summary_key, final_report)
         return final_report
 
+    def close(self):
+        """Closes the skills' pooled HTTP sessions."""
+        for skill in self.researcher.skills:
+            skill.close()
+        if self.fetcher is not None:
+            self.fetcher.close()
+
+    @traced("run")
     def run(self, topic: str, custom_prompt: str = None):
         """Legacy run method for CLI compatibility."""
         # 1. Plan
@@ -113,3 +323,230 @@ class Orchestrator:
 
         # 3. Summarize
         return self.generate_summary(topic, research_findings, all_sources, custom_prompt)
+
+    @traced("run.pipelined")
+    def run_pipelined(self, topic: str, custom_prompt: str = None):
+        """
+        One-shot run with overlapping phases: each sub-topic is dispatched to research as soon
+        as the streaming planner emits it, and each finished section is condensed (the map step
+        of summarization) while the remaining research is still running. Only the final merge
+        waits for everything, so latency approaches the critical path instead of the sum of phases.
+        """
+        print(f"🚀 Starting pipelined research on: {topic}")
+        if custom_prompt:
+            print(f"ℹ️ Custom Instructions: {custom_prompt}")
+
+        source_index = SourceIndex()
+        research_findings = {}
+        condensed = {}
+        sub_topics = []
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            research_futures = {}
+            print("💡 Planning...")
+            for sub_topic in self.planner.stream_plan(topic, custom_prompt):
+                print(f"📝 Sub-topic: {sub_topic}")
+                sub_topics.append(sub_topic)
+                source_index.expect(sub_topic)
+                future = executor.submit(contextvars.copy_context().run, self.researcher.research, sub_topic, None, source_index=source_index)
+                research_futures[future] = sub_topic
+
+            if not sub_topics:
+                print("❌ Failed to generate a plan.")
+                return None
+
+            map_futures = {}
+            for future in concurrent.futures.as_completed(research_futures):
+                sub = research_futures[future]
+                try:
+                    self._record_result(sub, future.result(), research_findings, source_index)
+                    print(f"✅ Finished research on: {sub}")
+                except Exception as exc:
+                    print(f"❌ Error researching {sub}: {exc}")
+                    research_findings[sub] = f"Error: {exc}"
+                    continue
+                map_futures[sub] = executor.submit(contextvars.copy_context().run, self.summarizer.condense_section, topic, sub, research_findings[sub], custom_prompt)
+
+            for sub in sub_topics:
+                condensed[sub] = research_findings[sub]
+                if sub in map_futures:
+                    try:
+                        condensed[sub] = map_futures[sub].result()
+                    except Exception as exc:
+                        print(f"⚠️ Could not condense section '{sub}': {exc}")
+
+        print("✍️ Merging sections...")
+        return self.summarizer.summarize(topic, condensed, source_index.sources(), custom_prompt, map_reduce=False)
+
+class AsyncOrchestrator(Orchestrator):
+    """
+    Orchestrator whose phases are coroutines, for use inside an event loop (e.g. FastAPI handlers).
+    Sub-topics are researched as concurrent tasks bounded by `max_concurrency` instead of a thread pool.
+    """
+
+    @traced("phase.plan")
+    async def aplan_research(self, topic: str, custom_prompt: str = None):
+        """Phase 1: Generate a research plan."""
+        print(f"🚀 Starting research planning on: {topic}")
+        if custom_prompt:
+            print(f"ℹ️ Custom Instructions: {custom_prompt}")
+
+        print("💡 Planning...")
+        sub_topics = await self.plan_flights.ado(self._plan_key(topic, custom_prompt), self.planner.aplan, topic, custom_prompt)
+        if not sub_topics:
+            print("❌ Failed to generate a plan.")
+            return []
+        print(f"📝 Sub-topics: {sub_topics}")
+        return sub_topics
+
+    @traced("phase.research")
+    async def aexecute_research(self, sub_topics: list, on_event=None, session_id: str = None):
+        """
+        Phase 2: Conduct research on confirmed sub-topics.
+        If given, `on_event` is called with skill progress and a `finding` event per finished sub-topic.
+        With a `session_id`, unchanged sub-topics are reused; similar past sub-topics and
+        concurrent identical calls are handled as in `execute_research`.
+        """
+        print("🔍 Researching sub-topics...")
+        research_findings = {}
+        source_index = SourceIndex()
+        emit = on_event or (lambda event: None)
+
+        all_items = self._task_items(sub_topics)
+        # The session store and findings index are SQLite-backed, so their reads and writes stay off the event loop
+        reused, task_items = await asyncio.to_thread(self._reuse_session_items, session_id, all_items, research_findings, source_index)
+        similar, task_items = await asyncio.to_thread(self._reuse_similar_items, task_items, research_findings, source_index)
+        for sub, previous in {**reused, **similar}.items():
+            emit({"type": "finding", "sub_topic": sub, "content": previous["content"], "sources": previous["sources"], "reused": True})
+
+        if on_event is None:
+            results = await self.research_flights.ado(self._research_key(task_items, reused, session_id), self._aresearch_items, task_items, {**reused, **similar})
+        else:
+            # Progress events go to a single caller, so streamed research is never shared
+            results = await self._aresearch_items(task_items, {**reused, **similar}, on_event)
+        fresh_results = self._record_results(task_items, results, research_findings, source_index)
+
+        await asyncio.to_thread(self._save_session_items, session_id, all_items, {**similar, **fresh_results})
+        return research_findings, source_index.sources()
+
+    async def _aresearch_items(self, task_items: list, reused: dict, on_event=None) -> list:
+        """Researches `task_items` as concurrent tasks. Returns each item's result, or the exception it raised, in order."""
+        source_index = self._seeded_source_index(reused, task_items)
+        emit = on_event or (lambda event: None)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        def finished(item, result, start):
+            content = result.get("content", "") if isinstance(result, dict) else str(result)
+            sources = result.get("sources", []) if isinstance(result, dict) else []
+            emit({
+                "type": "finding",
+                "sub_topic": item["topic"],
+                "content": content,
+                "sources": sources,
+                "elapsed_ms": round((time.monotonic() - start) * 1000)
+            })
+
+        async def research(item):
+            async with semaphore:
+                start = time.monotonic()
+                try:
+                    if self.batch_analysis:
+                        return await self.researcher.aprepare(item["topic"], item["instructions"], on_event, source_index=source_index)
+                    result = await self.researcher.aresearch(item["topic"], item["instructions"], on_event=on_event, source_index=source_index)
+                except Exception as exc:
+                    emit({"type": "finding", "sub_topic": item["topic"], "error": str(exc)})
+                    raise
+                finished(item, result, start)
+                return result
+
+        start = time.monotonic()
+        results = await asyncio.gather(*(research(item) for item in task_items), return_exceptions=True)
+        if self.batch_analysis:
+            ready = [i for i, result in enumerate(results) if not isinstance(result, Exception)]
+            print(f"🧠 Analyzing {len(ready)} sub-topics in one batch...")
+            findings = await self.researcher.aanalyze_batch([results[i] for i in ready], max_concurrency=self.analysis_concurrency) if ready else []
+            for i, finding in zip(ready, findings):
+                results[i] = finding
+                finished(task_items[i], finding, start)
+
+        for item, result in zip(task_items, results):
+            if isinstance(result, Exception):
+                print(f"❌ Error researching {item['topic']}: {result}")
+            else:
+                print(f"✅ Finished research on: {item['topic']}")
+
+        # The findings index is SQLite-backed and embeds each topic, so it stays off the event loop
+        await asyncio.to_thread(self._index_findings, task_items, results)
+        return results
+
+    async def astream_research(self, sub_topics: list, session_id: str = None):
+        """
+        Async generator of progress events for phase 2, ending with a `research_done` event
+        carrying the findings, sources and `session_id`. Closing the generator cancels the research.
+        """
+        queue = asyncio.Queue()
+
+        async def research_phase():
+            try:
+                return await self.aexecute_research(sub_topics, on_event=queue.put_nowait, session_id=session_id)
+            finally:
+                queue.put_nowait(None)
+
+        task = asyncio.create_task(research_phase())
+        try:
+            while (event := await queue.get()) is not None:
+                yield event
+            findings, sources = await task
+            yield {"type": "research_done", "findings": findings, "sources": sources, "session_id": session_id}
+        finally:
+            task.cancel()
+
+    @traced("phase.summarize")
+    async def agenerate_summary(self, topic: str, research_findings: dict, sources: list, custom_prompt: str = None, session_id: str = None):
+        """Phase 3: Generate final report."""
+        summary_key = ResearchSessionStore.summary_key(topic, research_findings, sources, custom_prompt)
+        cached = await asyncio.to_thread(self._cached_summary, session_id, summary_key)
+        if cached is not None:
+            return cached
+
+        print("✍️ Summarizing findings...")
+        final_report = await self.summary_flights.ado(summary_key, self.summarizer.asummarize, topic, research_findings, sources, custom_prompt)
+        await asyncio.to_thread(self._save_summary, session_id, summary_key, final_report)
+        return final_report
+
+    @traced("run")
+    async def arun(self, topic: str, custom_prompt: str = None):
+        """Runs plan, research and summarize end to end."""
+        sub_topics = await self.aplan_research(topic, custom_prompt)
+        if not sub_topics:
+            return None
+
+        research_findings, all_sources = await self.aexecute_research(sub_topics)
+
+        return await self.agenerate_summary(topic, research_findings, all_sources, custom_prompt)
+
+    async def astream_run(self, topic: str, custom_prompt: str = None):
+        """
+        Runs the whole pipeline as an async generator of structured events:
+        plan_ready, skill_started/skill_finished, finding, research_done, summary_token and done.
+        """
+        start = time.monotonic()
+        sub_topics = await self.aplan_research(topic, custom_prompt)
+        yield {"type": "plan_ready", "sub_topics": sub_topics, "elapsed_ms": round((time.monotonic() - start) * 1000)}
+        if not sub_topics:
+            yield {"type": "error", "message": "Failed to generate a plan."}
+            return
+
+        research_findings, all_sources = {}, []
+        async for event in self.astream_research(sub_topics):
+            if event["type"] == "research_done":
+                research_findings, all_sources = event["findings"], event["sources"]
+            yield event
+
+        print("✍️ Summarizing findings...")
+        parts = []
+        async for text in self.summarizer.astream_summarize(topic, research_findings, all_sources, custom_prompt):
+            parts.append(text)
+            yield {"type": "summary_token", "text": text}
+
+        yield {"type": "done", "report": "".join(parts), "elapsed_ms": round((time.monotonic() - start) * 1000)}
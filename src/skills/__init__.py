@@ -1,2 +1,4 @@
 from .base import BaseSkill
 from .search import TavilySearchSkill, SerperSearchSkill, DuckDuckGoSearchSkill, WikipediaSearchSkill, ArxivSearchSkill
+from .cache import CachedSkill, get_search_cache
+from .fetch import PageFetchSkill
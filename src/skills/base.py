@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any, Dict
 
@@ -7,6 +8,12 @@ class BaseSkill(ABC):
     """
     name: str = "base_skill"
     description: str = "Base skill description"
+    # Optional per-skill deadline in seconds; None falls back to the agent's default.
+    timeout: float = None
+    # How long results stay in the shared search cache, in seconds.
+    cache_ttl: float = 3600
+    # Key of the shared rate limiter this skill's requests count against.
+    provider: str = "default"
 
     @abstractmethod
     def execute(self, query: str, **kwargs) -> Dict[str, Any]:
@@ -18,6 +25,43 @@ class BaseSkill(ABC):
             **kwargs: Additional arguments.
             
         Returns:
-            A dictionary containing the results. e.g. {"content": "...", "source": "..."}
+            A dictionary containing the results, e.g. {"results": [SearchResult, ...]}, or {"error": "..."}.
+            The older pre-rendered {"content": "...", "sources": [...]} form is still accepted.
         """
         pass
+
+    async def aexecute(self, query: str, **kwargs) -> Dict[str, Any]:
+        """
+        Async variant of `execute`.
+
+        The default runs the blocking `execute` in a worker thread so the event loop
+        stays free; skills backed by a native async client should override this.
+        """
+        return await asyncio.to_thread(self.execute, query, **kwargs)
+
+    def close(self):
+        """Releases long-lived resources such as HTTP sessions. Safe to call more than once."""
+        pass
+
+class SkillWrapper(BaseSkill):
+    """
+    Base class for skills that decorate another skill (caching, rate limiting, ...).
+    Delegates everything to the wrapped skill and mirrors its identifying attributes.
+    """
+
+    def __init__(self, skill: BaseSkill):
+        self.skill = skill
+        self.name = skill.name
+        self.description = skill.description
+        self.timeout = skill.timeout
+        self.cache_ttl = skill.cache_ttl
+        self.provider = skill.provider
+
+    def execute(self, query: str, **kwargs) -> Dict[str, Any]:
+        return self.skill.execute(query, **kwargs)
+
+    async def aexecute(self, query: str, **kwargs) -> Dict[str, Any]:
+        return await self.skill.aexecute(query, **kwargs)
+
+    def close(self):
+        self.skill.close()
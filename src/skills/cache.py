@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict
+from .base import BaseSkill, SkillWrapper
+from ..utils.cache import TTLCache
+from ..utils.sources import SearchResult
+from ..utils.telemetry import CACHE_LOOKUPS
+
+_search_cache = None
+
+def get_search_cache() -> TTLCache:
+    """
+    Returns the process-wide search result cache shared by every skill and request.
+    Configured through SEARCH_CACHE_PATH and SEARCH_CACHE_MAX_MB.
+    """
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = TTLCache(
+            path=os.getenv("SEARCH_CACHE_PATH", os.path.join(".cache", "search_cache.sqlite")),
+            max_disk_bytes=int(os.getenv("SEARCH_CACHE_MAX_MB", "64")) * 1024 * 1024
+        )
+    return _search_cache
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+def _dump(result: Dict[str, Any]) -> Dict[str, Any]:
+    # The cache's disk tier stores JSON
+    if "results" not in result:
+        return result
+    return dict(result, results=[hit.to_dict() for hit in result["results"]])
+
+def _load(cached: Dict[str, Any]) -> Dict[str, Any]:
+    if "results" not in cached:
+        return cached
+    return dict(cached, results=[SearchResult.from_dict(hit) for hit in cached["results"]])
+
+class CachedSkill(SkillWrapper):
+    """
+    Wraps a skill so results are served from the shared search cache.
+    Entries are keyed on (skill name, normalized query, kwargs) and expire after the
+    wrapped skill's `cache_ttl`. Error results are never cached; search results are stored
+    in their dict form and rebuilt on every hit, so callers never share cached objects.
+    """
+
+    def __init__(self, skill: BaseSkill, cache: TTLCache = None):
+        super().__init__(skill)
+        self.cache = cache or get_search_cache()
+
+    def cache_key(self, query: str, **kwargs) -> str:
+        raw = json.dumps([self.skill.name, normalize_query(query), kwargs], sort_keys=True, default=str)
+        return "search:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def execute(self, query: str, **kwargs) -> Dict[str, Any]:
+        key = self.cache_key(query, **kwargs)
+        cached = self.cache.get(key)
+        CACHE_LOOKUPS.inc(cache="search", result="miss" if cached is None else "hit")
+        if cached is not None:
+            return _load(cached)
+
+        result = self.skill.execute(query, **kwargs)
+        if "error" not in result:
+            self.cache.set(key, _dump(result), ttl=self.cache_ttl)
+        return result
+
+    async def aexecute(self, query: str, **kwargs) -> Dict[str, Any]:
+        key = self.cache_key(query, **kwargs)
+        cached = await self.cache.aget(key)
+        CACHE_LOOKUPS.inc(cache="search", result="miss" if cached is None else "hit")
+        if cached is not None:
+            return _load(cached)
+
+        result = await self.skill.aexecute(query, **kwargs)
+        if "error" not in result:
+            await self.cache.aset(key, _dump(result), ttl=self.cache_ttl)
+        return result
@@ -0,0 +1,269 @@
+import codecs
+import concurrent.futures
+import hashlib
+import ipaddress
+import os
+import re
+import socket
+import time
+from html.parser import HTMLParser
+from typing import Any, Dict, List
+from urllib.parse import urljoin, urlsplit
+from .cache import get_search_cache
+from .http import HTTPSkill
+from ..utils.cache import TTLCache
+from ..utils.sources import SearchResult, canonicalize_url
+from ..utils.telemetry import CACHE_LOOKUPS
+
+# Elements whose text is never part of the readable content
+SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form", "button", "select"}
+# Elements that end a paragraph of text
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "li", "ul", "ol", "br", "tr", "td", "th", "table",
+    "h1", "h2", "h3", "h4", "h5", "h6", "pre", "blockquote", "dd", "dt", "figcaption",
+}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+HEADINGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+MAX_REDIRECTS = 5
+WHITESPACE = re.compile(r"\s+")
+
+class TextExtractor(HTMLParser):
+    """
+    Incremental main-text extractor: feed it HTML piece by piece as it arrives.
+
+    Keeps paragraphs of running text and headings, drops scripts, navigation and other page
+    chrome, and prefers the content of <main>/<article> when the page has enough of it.
+    """
+
+    def __init__(self, min_paragraph_chars: int = 40):
+        super().__init__(convert_charrefs=True)
+        self.min_paragraph_chars = min_paragraph_chars
+        self.title = ""
+        self.chars = 0
+        self._paragraphs = []   # (text, in_main)
+        self._buffer = []
+        self._heading = False
+        self._skip_tag = None
+        self._skip_depth = 0
+        self._main_depth = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == "br" and self._skip_tag is None:
+                self._flush()
+            return
+        if self._skip_tag is not None:
+            # Only the skipped element's own tag is counted: other tags inside it may be left unclosed
+            self._skip_depth += tag == self._skip_tag
+            return
+        if tag in SKIPPED_TAGS:
+            self._skip_tag, self._skip_depth = tag, 1
+            return
+        if tag == "title":
+            self._in_title = True
+        elif tag in ("main", "article"):
+            self._main_depth += 1
+        if tag in BLOCK_TAGS:
+            self._flush()
+            self._heading = tag in HEADINGS
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if not self._skip_depth:
+                    self._skip_tag = None
+            return
+        if tag == "title":
+            self._in_title = False
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag in ("main", "article") and self._main_depth:
+            self._main_depth -= 1
+
+    def handle_data(self, data):
+        if self._skip_tag is not None:
+            return
+        if self._in_title:
+            self.title += data
+        else:
+            self._buffer.append(data)
+
+    def feed_text(self, data: str):
+        """Plain-text counterpart of `feed`: blank lines separate paragraphs."""
+        for i, part in enumerate(data.split("\n\n")):
+            if i:
+                self._flush()
+            self._buffer.append(part)
+
+    def _flush(self):
+        text = WHITESPACE.sub(" ", "".join(self._buffer)).strip()
+        self._buffer = []
+        if text and (self._heading or len(text) >= self.min_paragraph_chars):
+            self._paragraphs.append((text, self._main_depth > 0))
+            self.chars += len(text)
+        self._heading = False
+
+    def text(self) -> str:
+        self._flush()
+        main = [text for text, in_main in self._paragraphs if in_main]
+        paragraphs = main if sum(len(text) for text in main) >= 500 else [text for text, _ in self._paragraphs]
+        return "\n".join(paragraphs)
+
+class PageFetchSkill(HTTPSkill):
+    """
+    Second research stage: fetches the top search hits' pages concurrently over one pooled
+    session and extracts their main text, giving the LLM more than search snippets.
+
+    Each page is streamed through `TextExtractor` and abandoned once it exceeds `max_bytes`,
+    `page_timeout` seconds or `max_chars` of extracted text. Non-HTML responses are skipped.
+    Extracted text is cached by canonical URL in the shared search cache.
+
+    URLs come from search results, i.e. from third parties, so every request (and every
+    redirect hop) must resolve to public addresses only: loopback, private, link-local and
+    cloud metadata addresses are refused.
+    """
+    name = "Page Fetch"
+    description = "Fetches and extracts the main text of top search results."
+    provider = "fetch"
+    cache_ttl = 24 * 3600
+
+    def __init__(self, max_pages: int = 3, max_bytes: int = 512 * 1024, page_timeout: float = 8.0,
+                 max_chars: int = 4000, cache: TTLCache = None, pool_size: int = None):
+        super().__init__(pool_size=pool_size, request_timeout=page_timeout)
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.page_timeout = page_timeout
+        # The whole stage finishes within one page deadline since pages are fetched in parallel
+        self.timeout = page_timeout + 1
+        self.max_chars = max_chars
+        self.cache = cache or get_search_cache()
+
+    def select(self, sources: List[SearchResult]) -> List[SearchResult]:
+        """The first `max_pages` distinct web pages among `sources`, in rank order."""
+        selected, seen = [], set()
+        for source in map(SearchResult.coerce, sources):
+            url = canonicalize_url(source.url)
+            if not source.url.startswith(("http://", "https://")) or url in seen:
+                continue
+            seen.add(url)
+            selected.append(source)
+            if len(selected) == self.max_pages:
+                break
+        return selected
+
+    @staticmethod
+    def cache_key(url: str) -> str:
+        return "page:" + hashlib.sha256(canonicalize_url(url).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def check_url(url: str):
+        """Raises ValueError unless `url` is http(s) and every address its host resolves to is public."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"unsupported URL {url}")
+        try:
+            addresses = socket.getaddrinfo(parts.hostname, parts.port or (443 if parts.scheme == "https" else 80), type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise ValueError(f"cannot resolve {parts.hostname}") from e
+        for *_, sockaddr in addresses:
+            # Scoped IPv6 addresses carry a "%interface" suffix
+            if not ipaddress.ip_address(sockaddr[0].split("%")[0]).is_global:
+                raise ValueError(f"{parts.hostname} resolves to non-public address {sockaddr[0]}")
+
+    def _open(self, url: str, deadline: float):
+        """GETs `url`, following redirects by hand so each hop is checked before it is requested."""
+        for _ in range(MAX_REDIRECTS + 1):
+            self.check_url(url)
+            response = self.session.get(url, stream=True, timeout=max(0.1, deadline - time.monotonic()), allow_redirects=False)
+            if not response.is_redirect:
+                return response
+            response.close()
+            url = urljoin(url, response.headers["Location"])
+        raise ValueError(f"more than {MAX_REDIRECTS} redirects")
+
+    def extract(self, url: str) -> Dict[str, str]:
+        """
+        Streams one page and returns {"title", "text"}. Raises on HTTP errors, non-text
+        content and URLs (or redirects) that point at non-public addresses.
+        """
+        deadline = time.monotonic() + self.page_timeout
+        with self._open(url, deadline) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "text/html").split(";")[0].strip().lower()
+            if content_type not in TEXT_CONTENT_TYPES:
+                raise ValueError(f"unsupported content type {content_type}")
+
+            # Without a declared charset requests assumes ISO-8859-1; most of the web is UTF-8
+            encoding = response.encoding if "charset" in response.headers.get("Content-Type", "") else "utf-8"
+            try:
+                decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            except LookupError:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            extractor = TextExtractor()
+            received = 0
+            for chunk in response.iter_content(chunk_size=16 * 1024):
+                received += len(chunk)
+                if content_type == "text/plain":
+                    extractor.feed_text(decoder.decode(chunk))
+                else:
+                    extractor.feed(decoder.decode(chunk))
+                if received >= self.max_bytes or extractor.chars >= self.max_chars or time.monotonic() >= deadline:
+                    break
+
+        text = extractor.text()
+        if len(text) > self.max_chars:
+            text = text[:self.max_chars].rsplit(" ", 1)[0] + " …"
+        return {"title": WHITESPACE.sub(" ", extractor.title).strip(), "text": text}
+
+    def _page(self, url: str):
+        key = self.cache_key(url)
+        cached = self.cache.get(key)
+        CACHE_LOOKUPS.inc(cache="page", result="miss" if cached is None else "hit")
+        if cached is not None:
+            return cached
+        page = self.extract(url)
+        self.cache.set(key, page, ttl=self.cache_ttl)
+        return page
+
+    def execute(self, query: str, **kwargs) -> Dict[str, Any]:
+        """Fetches the pages of `sources` (a keyword argument: the search stage's source list)."""
+        selected = self.select(kwargs.get("sources") or [])
+        if not selected:
+            return {"results": []}
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(selected))
+        futures = [executor.submit(self._page, source.url) for source in selected]
+        deadline = time.monotonic() + self.page_timeout
+
+        results = []
+        try:
+            for source, future in zip(selected, futures):
+                try:
+                    page = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                except Exception:
+                    # Slow or unreadable pages just keep their search snippet
+                    continue
+                if not page["text"]:
+                    continue
+                results.append(SearchResult(source.title or page["title"] or "No Title", source.url, page["text"], 'Page'))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return {"results": results}
+
+def create_page_fetcher():
+    """Builds the page fetch stage from PAGE_FETCH_* settings, or returns None when PAGE_FETCH_COUNT is 0."""
+    max_pages = int(os.getenv("PAGE_FETCH_COUNT", "0"))
+    if max_pages <= 0:
+        return None
+    return PageFetchSkill(
+        max_pages=max_pages,
+        max_bytes=int(os.getenv("PAGE_FETCH_MAX_KB", "512")) * 1024,
+        page_timeout=float(os.getenv("PAGE_FETCH_TIMEOUT", "8")),
+        max_chars=int(os.getenv("PAGE_FETCH_MAX_CHARS", "4000"))
+    )
@@ -0,0 +1,204 @@
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+from .base import BaseSkill
+from .ratelimit import GRANTED_AT
+from ..utils.telemetry import RETRIES
+
+class ProviderStats:
+    """Rolling latency and error history for one provider."""
+
+    def __init__(self, window: int = 50):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)  # True for success
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool):
+        with self._lock:
+            if ok:
+                self.latencies.append(latency)
+            self.outcomes.append(ok)
+
+    def p95(self):
+        with self._lock:
+            if not self.latencies:
+                return None
+            ordered = sorted(self.latencies)
+            return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self.outcomes:
+                return 0.0
+            return self.outcomes.count(False) / len(self.outcomes)
+
+class HedgedSearchSkill(BaseSkill):
+    """
+    Composite web search over several providers.
+
+    Providers are tried healthiest first (lowest recent error rate, then lowest p95 latency).
+    If the current provider has not answered by its own p95 latency, the next one is started
+    as a hedge; if a provider fails, the next one is started immediately. The first result
+    without an error wins; slower requests are left to finish in the background.
+
+    Latencies are measured from the moment a rate-limited provider is granted its slot, so
+    the p95 reflects the provider rather than queueing in front of it. Blocking calls run on
+    a pool of `max_workers` threads (default: four per provider), sized to the research
+    concurrency by `for_concurrency`.
+    """
+    name = "Web Search"
+    description = "Searches the web across several providers with hedging and failover."
+
+    def __init__(self, skills: list[BaseSkill], default_hedge_delay: float = 2.0, min_samples: int = 5, max_workers: int = None):
+        self.skills = skills
+        self.default_hedge_delay = default_hedge_delay
+        self.min_samples = min_samples
+        self.stats = {skill.name: ProviderStats() for skill in skills}
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers or 4 * max(1, len(skills)), thread_name_prefix="hedged-search")
+
+    @classmethod
+    def for_concurrency(cls, skills: list[BaseSkill], max_concurrency: int, **kwargs) -> "HedgedSearchSkill":
+        """
+        Sizes the pool for `max_concurrency` sub-topics researched at once, each of which may have
+        every provider in flight. HEDGED_SEARCH_WORKERS overrides the size.
+        """
+        max_workers = int(os.getenv("HEDGED_SEARCH_WORKERS", "0")) or max_concurrency * max(1, len(skills))
+        return cls(skills, max_workers=max_workers, **kwargs)
+
+    def _ordered(self):
+        # sorted() is stable, so ties keep the configured priority order
+        def health(skill):
+            stats = self.stats[skill.name]
+            return (round(stats.error_rate(), 1), stats.p95() or 0.0)
+        return sorted(self.skills, key=health)
+
+    def _hedge_delay(self, skill: BaseSkill) -> float:
+        stats = self.stats[skill.name]
+        if len(stats.latencies) < self.min_samples:
+            return self.default_hedge_delay
+        return stats.p95()
+
+    def _record(self, skill: BaseSkill, start: float, ok: bool):
+        # Pool threads keep their context between calls, so GRANTED_AT is reset before each one
+        granted_at = GRANTED_AT.get()
+        self.stats[skill.name].record(time.monotonic() - (granted_at or start), ok)
+
+    def _call(self, skill: BaseSkill, query: str, **kwargs) -> Dict[str, Any]:
+        GRANTED_AT.set(None)
+        start = time.monotonic()
+        ok = False
+        try:
+            result = skill.execute(query, **kwargs)
+            ok = "error" not in result
+            return result
+        finally:
+            self._record(skill, start, ok)
+
+    def execute(self, query: str, **kwargs) -> Dict[str, Any]:
+        candidates = self._ordered()
+        pending = {}
+        errors = []
+        next_hedge_at = None
+
+        def launch(reason=None):
+            nonlocal next_hedge_at
+            skill = candidates.pop(0)
+            if reason:
+                RETRIES.inc(provider=skill.provider, reason=reason)
+            pending[self._executor.submit(self._call, skill, query, **kwargs)] = skill
+            next_hedge_at = time.monotonic() + self._hedge_delay(skill)
+
+        launch()
+        while pending:
+            timeout = max(0.0, next_hedge_at - time.monotonic()) if candidates else None
+            done, _ = concurrent.futures.wait(pending, timeout=timeout, return_when=concurrent.futures.FIRST_COMPLETED)
+            if not done:
+                # The in-flight provider is slower than its usual p95: hedge with the next one
+                launch("hedge")
+                continue
+
+            for future in done:
+                skill = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"error": f"{e}"}
+                if "error" not in result:
+                    return result
+                errors.append(f"{skill.name}: {result['error']}")
+                if candidates:
+                    # Fail over right away instead of waiting for the hedge deadline
+                    launch("failover")
+
+        return {"error": "All web search providers failed. " + "; ".join(errors)}
+
+    async def _acall(self, skill: BaseSkill, query: str, **kwargs) -> Dict[str, Any]:
+        # Each call runs as its own task, in a copy of the caller's context
+        GRANTED_AT.set(None)
+        start = time.monotonic()
+        try:
+            result = await skill.aexecute(query, **kwargs)
+        except asyncio.CancelledError:
+            # Lost the hedge: neither a failure nor a complete latency sample
+            raise
+        except Exception:
+            self._record(skill, start, False)
+            raise
+        self._record(skill, start, "error" not in result)
+        return result
+
+    async def aexecute(self, query: str, **kwargs) -> Dict[str, Any]:
+        """Async variant of `execute`. Losing requests are cancelled rather than left running."""
+        candidates = self._ordered()
+        pending = {}
+        errors = []
+        next_hedge_at = None
+
+        def launch(reason=None):
+            nonlocal next_hedge_at
+            skill = candidates.pop(0)
+            if reason:
+                RETRIES.inc(provider=skill.provider, reason=reason)
+            pending[asyncio.ensure_future(self._acall(skill, query, **kwargs))] = skill
+            next_hedge_at = time.monotonic() + self._hedge_delay(skill)
+
+        launch()
+        try:
+            while pending:
+                timeout = max(0.0, next_hedge_at - time.monotonic()) if candidates else None
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    launch("hedge")
+                    continue
+
+                for task in done:
+                    skill = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = {"error": f"{e}"}
+                    if "error" not in result:
+                        return result
+                    errors.append(f"{skill.name}: {result['error']}")
+                    if candidates:
+                        launch("failover")
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return {"error": "All web search providers failed. " + "; ".join(errors)}
+
+    def provider_stats(self) -> dict:
+        return {
+            name: {"p95": stats.p95(), "error_rate": stats.error_rate(), "samples": len(stats.outcomes)}
+            for name, stats in self.stats.items()
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        for skill in self.skills:
+            skill.close()
@@ -0,0 +1,53 @@
+import os
+import threading
+from .base import BaseSkill
+
+def create_session(pool_size: int = 10, retries: int = 2):
+    """
+    Builds a keep-alive requests.Session whose connection pool holds up to `pool_size`
+    connections per host, with a small retry budget for transient connection errors.
+    Only idempotent requests are retried on 5xx responses: POST searches spend provider
+    quota, and their failures must reach the rate limiter (see RateLimitedSkill).
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=retries, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = "AntiG-Researcher/1.0 (+https://github.com/Stellven/AntiG-Researcher)"
+    return session
+
+class HTTPSkill(BaseSkill):
+    """
+    Base class for skills that call a provider over HTTP.
+    Each instance owns one long-lived, pooled session shared by every thread that uses the skill.
+    Pool size and request timeout default to SEARCH_HTTP_POOL_SIZE and SEARCH_HTTP_TIMEOUT.
+    """
+
+    def __init__(self, pool_size: int = None, request_timeout: float = None):
+        self.pool_size = pool_size or int(os.getenv("SEARCH_HTTP_POOL_SIZE", "10"))
+        self.request_timeout = request_timeout or float(os.getenv("SEARCH_HTTP_TIMEOUT", "10"))
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        # Created on first use so building the skill stays cheap
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = create_session(self.pool_size)
+        return self._session
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
@@ -0,0 +1,57 @@
+import contextvars
+import time
+from typing import Any, Dict
+from .base import BaseSkill, SkillWrapper
+from ..utils.ratelimit import ProviderLimiter, get_limiter
+from ..utils.telemetry import span
+
+# Monotonic time at which the current call was granted its limiter slot, so callers
+# timing a provider (e.g. HedgedSearchSkill) can leave out the wait for the slot.
+GRANTED_AT = contextvars.ContextVar("granted_at", default=None)
+
+class RateLimitedSkill(SkillWrapper):
+    """
+    Wraps a skill so every call holds a slot on its provider's shared limiter.
+    Error results count as failures, and throttling errors shrink the provider's concurrency.
+    Each call is traced as a `provider.request` span, excluding the wait for a slot.
+    """
+
+    def __init__(self, skill: BaseSkill, limiter: ProviderLimiter = None):
+        super().__init__(skill)
+        self.limiter = limiter or get_limiter(skill.provider)
+
+    def execute(self, query: str, **kwargs) -> Dict[str, Any]:
+        self.limiter.acquire()
+        start = time.monotonic()
+        GRANTED_AT.set(start)
+        error = None
+        try:
+            with span("provider.request", provider=self.provider) as current:
+                result = self.skill.execute(query, **kwargs)
+                error = result.get("error")
+                if error:
+                    current.fail(error)
+                return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.limiter.release(time.monotonic() - start, error=error)
+
+    async def aexecute(self, query: str, **kwargs) -> Dict[str, Any]:
+        await self.limiter.aacquire()
+        start = time.monotonic()
+        GRANTED_AT.set(start)
+        error = None
+        try:
+            with span("provider.request", provider=self.provider) as current:
+                result = await self.skill.aexecute(query, **kwargs)
+                error = result.get("error")
+                if error:
+                    current.fail(error)
+                return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.limiter.release(time.monotonic() - start, error=error)
@@ -1,12 +1,20 @@
 import os
+import threading
 import time
 from typing import Any, Dict, List
 from .base import BaseSkill
-from ddgs import DDGS
+from .http import HTTPSkill
+from ..utils.lazy import LazyImport
+from ..utils.sources import SearchResult
 
-class TavilySearchSkill(BaseSkill):
+# Imported on the first DuckDuckGo search rather than with the skills package
+DDGS = LazyImport("ddgs", "DDGS")
+
+class TavilySearchSkill(HTTPSkill):
     name = "Tavily Search"
     description = "Searches the web using Tavily API."
+    provider = "tavily"
+    endpoint = "https://api.tavily.com/search"
 
     def execute(self, query: str, **kwargs) -> Dict[str, Any]:
         api_key = os.getenv("TAVILY_API_KEY")
@@ -14,31 +22,27 @@ class TavilySearchSkill(BaseSkill):
             return {"error": "Tavily API key not found."}
         
         try:
-            from tavily import TavilyClient
-            tavily = TavilyClient(api_key=api_key)
-            response = tavily.search(query=query, search_depth="advanced", max_results=5)
-            
-            formatted_results = []
-            sources = []
-            results_text = ""
-            
-            for r in response.get('results', []):
-                title = r.get('title', 'No Title')
-                href = r.get('url', '#')
-                body = r.get('content', '')
-                sources.append({'title': title, 'href': href, 'source_type': 'Tavily'})
-                results_text += f"[Tavily] Source: {title}\nURL: {href}\nContent: {body}\n\n"
+            response = self.session.post(
+                self.endpoint,
+                json={"query": query, "search_depth": "advanced", "max_results": 5},
+                headers={"Authorization": f"Bearer {api_key}"},
+                timeout=self.request_timeout
+            )
+            response.raise_for_status()
             
-            return {
-                "content": results_text,
-                "sources": sources
-            }
+            results = [
+                SearchResult(r.get('title', 'No Title'), r.get('url', '#'), r.get('content', ''), 'Tavily', r.get('score'))
+                for r in response.json().get('results', [])
+            ]
+            return {"results": results}
         except Exception as e:
              return {"error": f"Error during Tavily search: {e}"}
 
-class SerperSearchSkill(BaseSkill):
+class SerperSearchSkill(HTTPSkill):
     name = "Serper Search"
     description = "Searches the web using Serper API."
+    provider = "serper"
+    endpoint = "https://google.serper.dev/search"
 
     def execute(self, query: str, **kwargs) -> Dict[str, Any]:
         api_key = os.getenv("SERPER_API_KEY")
@@ -46,109 +50,128 @@ class SerperSearchSkill(BaseSkill):
              return {"error": "Serper API key not found."}
         
         try:
-            from langchain_community.utilities import GoogleSerperAPIWrapper
-            search = GoogleSerperAPIWrapper()
-            results = search.results(query)
-            
-            sources = []
-            results_text = ""
-            
-            for r in results.get('organic', [])[:5]:
-                title = r.get('title', 'No Title')
-                href = r.get('link', '#')
-                body = r.get('snippet', '')
-                sources.append({'title': title, 'href': href, 'source_type': 'Serper'})
-                results_text += f"[Serper] Source: {title}\nURL: {href}\nContent: {body}\n\n"
+            response = self.session.post(
+                self.endpoint,
+                json={"q": query, "gl": "us", "hl": "en", "num": 10},
+                headers={"X-API-KEY": api_key},
+                timeout=self.request_timeout
+            )
+            response.raise_for_status()
             
-            return {
-                "content": results_text,
-                "sources": sources
-            }
+            results = [
+                SearchResult(r.get('title', 'No Title'), r.get('link', '#'), r.get('snippet', ''), 'Serper')
+                for r in response.json().get('organic', [])[:5]
+            ]
+            return {"results": results}
         except Exception as e:
             return {"error": f"Error during Serper search: {e}"}
 
 class DuckDuckGoSearchSkill(BaseSkill):
     name = "DuckDuckGo Search"
     description = "Searches the web using DuckDuckGo."
+    provider = "duckduckgo"
+
+    def __init__(self, request_timeout: float = None):
+        self.request_timeout = request_timeout or float(os.getenv("SEARCH_HTTP_TIMEOUT", "10"))
+        # DDGS keeps its own HTTP client; one per thread keeps connections warm without sharing state
+        self._local = threading.local()
+
+    def _client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = DDGS(timeout=int(self.request_timeout))
+            self._local.client = client
+        return client
 
     def execute(self, query: str, **kwargs) -> Dict[str, Any]:
         try:
-            sources = []
-            results_text = ""
-            with DDGS() as ddgs:
-                results = [r for r in ddgs.text(query, max_results=10)]
-                
-            for result in results:
-                title = result.get('title', 'No Title')
-                href = result.get('href', '#')
-                body = result.get('body', '')
-                sources.append({'title': title, 'href': href, 'source_type': 'DuckDuckGo'})
-                results_text += f"[DuckDuckGo] Source: {title}\nURL: {href}\nContent: {body}\n\n"
-            
-            return {
-                "content": results_text,
-                "sources": sources
-            }
+            results = [
+                SearchResult(r.get('title', 'No Title'), r.get('href', '#'), r.get('body', ''), 'DuckDuckGo')
+                for r in self._client().text(query, max_results=10)
+            ]
+            return {"results": results}
         except Exception as e:
+            # Drop this thread's client so the next call starts from a fresh connection
+            self._local.client = None
             return {"error": f"Error during DDG search: {e}"}
 
-class WikipediaSearchSkill(BaseSkill):
+    def close(self):
+        self._local = threading.local()
+
+class WikipediaSearchSkill(HTTPSkill):
     name = "Wikipedia Search"
     description = "Searches Wikipedia."
+    provider = "wikipedia"
+    cache_ttl = 24 * 3600
+    endpoint = "https://en.wikipedia.org/w/api.php"
 
     def execute(self, query: str, **kwargs) -> Dict[str, Any]:
         try:
-            import wikipedia
-            wiki_results = wikipedia.search(query, results=2)
-            
-            sources = []
-            results_text = ""
-            
-            for page_title in wiki_results:
-                try:
-                    page = wikipedia.page(page_title, auto_suggest=False)
-                    title = page.title
-                    href = page.url
-                    summary = page.summary[:1000]
-                    sources.append({'title': title, 'href': href, 'source_type': 'Wikipedia'})
-                    results_text += f"[Wikipedia] Source: {title}\nURL: {href}\nContent: {summary}\n\n"
-                except Exception:
-                    continue
+            # One round trip: search and fetch the intro extract and URL of the top pages
+            response = self.session.get(
+                self.endpoint,
+                params={
+                    "action": "query",
+                    "format": "json",
+                    "generator": "search",
+                    "gsrsearch": query,
+                    "gsrlimit": 2,
+                    "prop": "extracts|info",
+                    "exintro": 1,
+                    "explaintext": 1,
+                    "inprop": "url",
+                    "redirects": 1,
+                },
+                timeout=self.request_timeout
+            )
+            response.raise_for_status()
+            pages = sorted(response.json().get("query", {}).get("pages", {}).values(), key=lambda page: page.get("index", 0))
             
-            return {
-                "content": results_text,
-                "sources": sources
-            }
+            results = [
+                SearchResult(page.get("title", "No Title"), page.get("fullurl", "#"), page.get("extract", "")[:1000], 'Wikipedia')
+                for page in pages
+            ]
+            return {"results": results}
         except Exception as e:
              return {"error": f"Error during Wikipedia search: {e}"}
 
 class ArxivSearchSkill(BaseSkill):
     name = "Arxiv Search"
     description = "Searches Arxiv for papers."
+    provider = "arxiv"
+    cache_ttl = 24 * 3600
+
+    def __init__(self):
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        # A single arxiv.Client keeps one requests session and paces requests across all callers
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import arxiv
+                    self._client = arxiv.Client()
+        return self._client
 
     def execute(self, query: str, **kwargs) -> Dict[str, Any]:
         try:
             import arxiv
-            client = arxiv.Client()
             search = arxiv.Search(
                 query = query,
                 max_results = 3,
                 sort_by = arxiv.SortCriterion.Relevance
             )
             
-            sources = []
-            results_text = ""
-            
-            for r in client.results(search):
-                title = r.title
-                href = r.entry_id
-                summary = r.summary[:1000]
-                sources.append({'title': title, 'href': href, 'source_type': 'Arxiv'})
-                results_text += f"[Arxiv] Title: {title}\nURL: {href}\nAbstract: {summary}\n\n"
-            
-            return {
-                "content": results_text,
-                "sources": sources
-            }
+            results = [SearchResult(r.title, r.entry_id, r.summary[:1000], 'Arxiv') for r in self.client.results(search)]
+            return {"results": results}
         except Exception as e:
              return {"error": f"Error during Arxiv search: {e}"}
+
+    def close(self):
+        with self._client_lock:
+            session = getattr(self._client, "_session", None)
+            if session is not None:
+                session.close()
+            self._client = None
@@ -0,0 +1,204 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+class TTLCache:
+    """
+    Two-tier key/value cache: an in-memory LRU in front of an on-disk SQLite table.
+
+    Every entry carries its own TTL. The memory tier is bounded by entry count and the
+    disk tier by total payload size; both evict least-recently-used entries first.
+    Values must be JSON-serializable. Safe to share between threads.
+
+    Disk maintenance is amortized: expired rows are swept every `evict_every` writes (or as
+    soon as the size cap is exceeded), and access times of disk hits are written in batches
+    of `touch_batch`. Async code should use `aget`/`aset`, which keep SQLite off the event loop.
+    """
+
+    def __init__(self, path: str = None, max_memory_entries: int = 512, max_disk_bytes: int = 64 * 1024 * 1024,
+                 evict_every: int = 64, touch_batch: int = 32):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.evict_every = evict_every
+        self.touch_batch = touch_batch
+        self._memory = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.RLock()
+        self._conn = None
+        self._disk_bytes = 0
+        self._writes = 0
+        self._touched = {}  # key -> accessed_at not yet written
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _db(self):
+        # Opened lazily so merely constructing a cache never touches the filesystem.
+        if self._conn is None and self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires_at)")
+            self._conn.commit()
+            self._disk_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        return self._conn
+
+    def _remember(self, key: str, expires_at: float, value: Any):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    _MISSING = object()
+
+    def _get_memory(self, key: str, now: float) -> Any:
+        entry = self._memory.get(key)
+        if entry is None:
+            return self._MISSING
+        expires_at, value = entry
+        if expires_at > now:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return value
+        del self._memory[key]
+        return self._MISSING
+
+    def get(self, key: str, default: Any = None) -> Any:
+        now = time.time()
+        with self._lock:
+            value = self._get_memory(key, now)
+            if value is not self._MISSING:
+                return value
+
+            db = self._db()
+            if db is not None:
+                row = db.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+                # Expired rows are left for the next sweep
+                if row is not None and row[1] > now:
+                    self._touch(db, key, now)
+                    value = json.loads(row[0])
+                    self._remember(key, row[1], value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return default
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        """`get` for async code: memory hits return inline, disk lookups run in a worker thread."""
+        with self._lock:
+            value = self._get_memory(key, time.time())
+        if value is not self._MISSING:
+            return value
+        if not self.path:
+            with self._lock:
+                self.misses += 1
+            return default
+        return await asyncio.to_thread(self.get, key, default)
+
+    def _touch(self, db, key: str, now: float):
+        self._touched[key] = now
+        if len(self._touched) >= self.touch_batch:
+            self._flush_touched(db)
+            db.commit()
+
+    def _flush_touched(self, db):
+        if self._touched:
+            db.executemany("UPDATE cache SET accessed_at = ? WHERE key = ?", [(at, key) for key, at in self._touched.items()])
+            self._touched = {}
+
+    def set(self, key: str, value: Any, ttl: float):
+        now = time.time()
+        expires_at = now + ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+
+            db = self._db()
+            if db is None:
+                return
+            payload = json.dumps(value)
+            previous = db.execute("SELECT size FROM cache WHERE key = ?", (key,)).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), expires_at, now)
+            )
+            self._touched.pop(key, None)
+            self._disk_bytes += len(payload) - (previous[0] if previous else 0)
+            self._writes += 1
+            if self._writes >= self.evict_every or self._disk_bytes > self.max_disk_bytes:
+                self._evict(db, now)
+            db.commit()
+
+    async def aset(self, key: str, value: Any, ttl: float):
+        """`set` for async code: the disk write runs in a worker thread."""
+        if not self.path:
+            self.set(key, value, ttl)
+            return
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    def _evict(self, db, now: float):
+        self._writes = 0
+        self._flush_touched(db)
+        db.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        # Resynchronize the running total with the table
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total > self.max_disk_bytes:
+            for key, size in db.execute("SELECT key, size FROM cache ORDER BY accessed_at").fetchall():
+                db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._memory.pop(key, None)
+                total -= size
+                if total <= self.max_disk_bytes:
+                    break
+        self._disk_bytes = total
+
+    def delete(self, key: str):
+        with self._lock:
+            self._memory.pop(key, None)
+            db = self._db()
+            if db is not None:
+                self._touched.pop(key, None)
+                row = db.execute("SELECT size FROM cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self._disk_bytes -= row[0]
+                    db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            db = self._db()
+            if db is not None:
+                self._touched = {}
+                db.execute("DELETE FROM cache")
+                self._disk_bytes = 0
+                db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+            }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._flush_touched(self._conn)
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
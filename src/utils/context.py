@@ -0,0 +1,129 @@
+import math
+import re
+from collections import Counter
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+WORD_PATTERN = re.compile(r"\w+")
+
+def count_tokens(text: str) -> int:
+    """
+    Approximates the LLM token count as words plus punctuation marks.
+    Close enough to budget prompts without shipping a model-specific tokenizer.
+    """
+    return len(TOKEN_PATTERN.findall(text))
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cuts `text` right after its `max_tokens`-th token."""
+    if max_tokens <= 0:
+        return ""
+    for index, match in enumerate(TOKEN_PATTERN.finditer(text)):
+        if index + 1 == max_tokens:
+            return text[:match.end()] + " …"
+    return text
+
+def _words(text: str) -> list:
+    return [word.lower() for word in WORD_PATTERN.findall(text)]
+
+def _shingles(words: list, size: int = 3) -> set:
+    if len(words) < size:
+        return {tuple(words)}
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+class ContextPacker:
+    """
+    Fits text chunks into a token budget for one LLM call.
+
+    Chunks are deduplicated by word-shingle Jaccard similarity, ranked by BM25-style term
+    overlap with the query, and selected greedily until the budget is full (the last chunk
+    may be truncated). Selected chunks keep their original order.
+    """
+
+    def __init__(self, max_tokens: int = 6000, dedupe_threshold: float = 0.8, min_fragment_tokens: int = 40):
+        self.max_tokens = max_tokens
+        self.dedupe_threshold = dedupe_threshold
+        self.min_fragment_tokens = min_fragment_tokens
+
+    def _dedupe(self, chunks: list, seen: list) -> list:
+        kept = []
+        for index, chunk in enumerate(chunks):
+            shingles = _shingles(_words(chunk))
+            duplicate = any(
+                len(shingles & other) / (len(shingles | other) or 1) >= self.dedupe_threshold
+                for other in seen
+            )
+            if not duplicate:
+                seen.append(shingles)
+                kept.append((index, chunk))
+        return kept
+
+    @staticmethod
+    def _scores(chunks: list, query: str) -> list:
+        terms = set(_words(query))
+        documents = [Counter(_words(chunk)) for chunk in chunks]
+        if not terms or not documents:
+            return [0.0] * len(chunks)
+
+        average_length = sum(sum(doc.values()) for doc in documents) / len(documents) or 1
+        scores = []
+        for doc in documents:
+            length = sum(doc.values())
+            score = 0.0
+            for term in terms:
+                frequency = doc.get(term, 0)
+                if not frequency:
+                    continue
+                containing = sum(1 for other in documents if term in other)
+                idf = math.log(1 + (len(documents) - containing + 0.5) / (containing + 0.5))
+                score += idf * frequency * 2.2 / (frequency + 1.2 * (0.25 + 0.75 * length / average_length))
+            scores.append(score)
+        return scores
+
+    def select(self, chunks: list, query: str, max_tokens: int = None, seen: list = None) -> list:
+        """Returns the chunks (possibly with the last one truncated) that fit the budget, in original order."""
+        budget = self.max_tokens if max_tokens is None else max_tokens
+        candidates = self._dedupe([chunk for chunk in chunks if chunk.strip()], seen if seen is not None else [])
+        scores = self._scores([chunk for _, chunk in candidates], query)
+
+        # Highest score first; earlier chunks win ties so output is deterministic
+        ranked = sorted(zip(candidates, scores), key=lambda pair: (-pair[1], pair[0][0]))
+        selected = []
+        for (index, chunk), _ in ranked:
+            tokens = count_tokens(chunk)
+            if tokens <= budget:
+                selected.append((index, chunk))
+                budget -= tokens
+            elif budget >= self.min_fragment_tokens:
+                selected.append((index, truncate_tokens(chunk, budget)))
+                budget = 0
+            if budget <= 0:
+                break
+        return [chunk for _, chunk in sorted(selected)]
+
+    def pack(self, chunks: list, query: str, separator: str = "\n\n") -> str:
+        return separator.join(self.select(chunks, query))
+
+    def pack_sections(self, sections: dict, query: str) -> dict:
+        """
+        Packs several sections (e.g. per-sub-topic findings) into the budget without dropping any.
+        Sections smaller than their fair share keep everything; the remaining budget is split
+        evenly among the larger ones. Paragraphs repeated across sections are dropped.
+        """
+        sizes = {name: count_tokens(text) for name, text in sections.items()}
+        budgets = {}
+        remaining, open_sections = self.max_tokens, sorted(sections, key=lambda name: sizes[name])
+        while open_sections:
+            share = remaining // len(open_sections)
+            name = open_sections[0]
+            if sizes[name] > share:
+                for name in open_sections:
+                    budgets[name] = share
+                break
+            budgets[name] = sizes[name]
+            remaining -= sizes[name]
+            open_sections.pop(0)
+
+        seen = []
+        return {
+            name: "\n\n".join(self.select(text.split("\n\n"), f"{query} {name}", max_tokens=budgets[name], seen=seen))
+            for name, text in sections.items()
+        }
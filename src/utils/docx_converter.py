@@ -0,0 +1,271 @@
+import html
+import re
+from .lazy import LazyImport
+
+markdown = LazyImport("markdown")
+markdown_util = LazyImport("markdown.util")
+Document = LazyImport("docx", "Document")
+OxmlElement = LazyImport("docx.oxml", "OxmlElement")
+qn = LazyImport("docx.oxml.ns", "qn")
+RT = LazyImport("docx.opc.constants", "RELATIONSHIP_TYPE")
+Pt = LazyImport("docx.shared", "Pt")
+RGBColor = LazyImport("docx.shared", "RGBColor")
+WD_ALIGN_PARAGRAPH = LazyImport("docx.enum.text", "WD_ALIGN_PARAGRAPH")
+
+CODE_FONT = "Courier New"
+LINK_COLOR = (0x05, 0x63, 0xC1)
+# Word's default template only defines three levels of list styles
+MAX_LIST_DEPTH = 3
+
+ESCAPED_CHAR = re.compile("\x02([0-9]+)\x03")
+CODE_CONTENT = re.compile(r"<code[^>]*>(.*?)</code>", re.S)
+TAGS = re.compile(r"<[^>]+>")
+LIST_BLOCK_TAGS = ("ul", "ol", "p", "pre", "blockquote", "table", "hr")
+ALIGNMENT = re.compile(r"text-align:\s*(left|center|right)")
+
+class MarkdownDocxConverter:
+    """
+    Converts Markdown to a Word document in a single walk over the element tree that
+    Python-Markdown builds for `ReportFormatter.generate_html`, so both exports agree.
+
+    Supports headings, paragraphs with bold/italic/code/links, nested ordered and unordered
+    lists, block quotes, fenced and indented code, tables and horizontal rules. Blocks go
+    through python-docx's public `add_*` API; only hyperlinks and rules need raw XML.
+    """
+
+    def __init__(self, extensions: list = None):
+        self.extensions = extensions or []
+
+    def _parse(self, text: str):
+        # Markdown.convert() minus serialization: preprocess, parse blocks, run inline processors
+        md = markdown.Markdown(extensions=self.extensions)
+        lines = text.split("\n")
+        for preprocessor in md.preprocessors:
+            lines = preprocessor.run(lines)
+        root = md.parser.parseDocument(lines).getroot()
+        for treeprocessor in md.treeprocessors:
+            new_root = treeprocessor.run(root)
+            if new_root is not None:
+                root = new_root
+        return md, root
+
+    def convert(self, text: str):
+        """Returns a python-docx Document for the Markdown `text`."""
+        md, root = self._parse(text)
+        builder = _DocxBuilder(Document(), md.htmlStash)
+        builder.blocks(root)
+        return builder.document
+
+    def write(self, text: str, stream):
+        """Converts `text` and saves the document to a binary file-like `stream`."""
+        self.convert(text).save(stream)
+
+class _DocxBuilder:
+    def __init__(self, document, stash):
+        self.document = document
+        self.stash = stash
+        self.styles = {}
+        self.links = {}
+
+    # --- Text ---
+
+    def _stashed(self, index: int) -> str:
+        raw = self.stash.rawHtmlBlocks[index]
+        return raw if isinstance(raw, str) else str(raw)
+
+    def clean(self, text: str) -> str:
+        """Resolves Python-Markdown's placeholders (raw HTML, escapes, entities) to plain text."""
+        if not text:
+            return ""
+        text = markdown_util.HTML_PLACEHOLDER_RE.sub(lambda m: html.unescape(TAGS.sub("", self._stashed(int(m.group(1))))), text)
+        text = ESCAPED_CHAR.sub(lambda m: chr(int(m.group(1))), text)
+        return html.unescape(text.replace(markdown_util.AMP_SUBSTITUTE, "&"))
+
+    def stashed_code(self, element):
+        """Returns the code of a fenced block, which Python-Markdown leaves as a stash placeholder paragraph."""
+        if len(element) or not element.text:
+            return None
+        match = markdown_util.HTML_PLACEHOLDER_RE.fullmatch(element.text.strip())
+        if not match:
+            return None
+        code = CODE_CONTENT.search(self._stashed(int(match.group(1))))
+        return html.unescape(code.group(1)) if code else None
+
+    # --- Blocks ---
+
+    def style(self, name: str):
+        # Looked up once per style: python-docx resolves names by scanning every style
+        if name not in self.styles:
+            self.styles[name] = self.document.styles[name]
+        return self.styles[name]
+
+    @staticmethod
+    def is_empty(paragraph) -> bool:
+        return all(child.tag == qn("w:pPr") for child in paragraph._p)
+
+    def paragraph(self, style: str = None):
+        return self.document.add_paragraph(style=self.style(style) if style else None)
+
+    def blocks(self, element, style: str = None):
+        for child in element:
+            self.block(child, style)
+
+    def block(self, element, style: str = None):
+        tag = element.tag
+        if tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            self.inline(self.paragraph(f"Heading {tag[1]}"), element)
+        elif tag == "p":
+            code = self.stashed_code(element)
+            if code is not None:
+                self.code_block(code)
+            else:
+                self.inline(self.paragraph(style), element)
+        elif tag in ("ul", "ol"):
+            self.list(element, tag == "ol", 1)
+        elif tag == "pre":
+            self.code_block("".join(element.itertext()))
+        elif tag == "blockquote":
+            self.blocks(element, "Quote")
+        elif tag == "table":
+            self.table(element)
+        elif tag == "hr":
+            self.rule()
+        else:
+            self.blocks(element, style)
+
+    def code_block(self, code: str):
+        paragraph = self.paragraph()
+        lines = code.rstrip("\n").split("\n")
+        for i, line in enumerate(lines):
+            run = paragraph.add_run(line)
+            run.font.name = CODE_FONT
+            run.font.size = Pt(9)
+            if i < len(lines) - 1:
+                run.add_break()
+
+    def list(self, element, ordered: bool, depth: int):
+        level = min(depth, MAX_LIST_DEPTH)
+        suffix = f" {level}" if level > 1 else ""
+        item_style = ("List Number" if ordered else "List Bullet") + suffix
+        continue_style = "List Continue" + suffix
+
+        for item in element:
+            if item.tag != "li":
+                continue
+            paragraph = self.paragraph(item_style)
+            text = item.text
+            if text and len(item) and item[0].tag in LIST_BLOCK_TAGS:
+                text = text.rstrip()
+            self.text(paragraph, text)
+            for child in item:
+                if child.tag in ("ul", "ol"):
+                    self.list(child, child.tag == "ol", depth + 1)
+                    # Text after a nested list continues the item below it
+                    paragraph = self.paragraph(continue_style)
+                elif child.tag == "p":
+                    # Loose lists wrap item text in paragraphs; later ones continue the item
+                    if not self.is_empty(paragraph):
+                        paragraph = self.paragraph(continue_style)
+                    code = self.stashed_code(child)
+                    if code is not None:
+                        self.code_block(code)
+                    else:
+                        self.inline(paragraph, child)
+                elif child.tag in LIST_BLOCK_TAGS:
+                    self.block(child)
+                else:
+                    self.element(paragraph, child, False, False)
+                if child.tag not in LIST_BLOCK_TAGS or (child.tail and child.tail.strip()):
+                    self.text(paragraph, child.tail)
+            if self.is_empty(paragraph) and paragraph.style.name == continue_style:
+                paragraph._p.getparent().remove(paragraph._p)
+
+    def table(self, element):
+        rows = list(element.iter("tr"))
+        if not rows:
+            return
+        columns = max(len(row) for row in rows)
+        # Sized to the section's text width (page width minus margins)
+        table = self.document.add_table(len(rows), columns)
+        table.style = self.style("Table Grid")
+
+        for row_element, row in zip(rows, table.rows):
+            for cell_element, cell in zip(row_element, row.cells):
+                paragraph = cell.paragraphs[0]
+                align = ALIGNMENT.search(cell_element.get("style", ""))
+                if align:
+                    paragraph.alignment = getattr(WD_ALIGN_PARAGRAPH, align.group(1).upper())
+                self.inline(paragraph, cell_element, bold=cell_element.tag == "th")
+
+    def rule(self):
+        paragraph = self.paragraph()
+        borders = OxmlElement("w:pBdr")
+        bottom = OxmlElement("w:bottom")
+        for name, value in (("val", "single"), ("sz", "6"), ("space", "1"), ("color", "auto")):
+            bottom.set(qn(f"w:{name}"), value)
+        borders.append(bottom)
+        paragraph._p.get_or_add_pPr().append(borders)
+
+    # --- Inline ---
+
+    def text(self, paragraph, text: str, bold: bool = False, italic: bool = False, code: bool = False):
+        text = self.clean(text)
+        if not code:
+            # Source line breaks are just whitespace (python-docx would turn them into hard breaks)
+            text = text.replace("\n", " ")
+        if text[:1].isspace() and self.is_empty(paragraph):
+            text = text.lstrip()
+        if not text:
+            return None
+        run = paragraph.add_run(text)
+        run.bold = bold or None
+        run.italic = italic or None
+        if code:
+            run.font.name = CODE_FONT
+        return run
+
+    def inline(self, paragraph, element, bold: bool = False, italic: bool = False):
+        self.text(paragraph, element.text, bold, italic)
+        for child in element:
+            self.element(paragraph, child, bold, italic)
+            tail = child.tail.lstrip() if child.tag == "br" and child.tail else child.tail
+            self.text(paragraph, tail, bold, italic)
+
+    def element(self, paragraph, element, bold: bool, italic: bool):
+        tag = element.tag
+        if tag in ("strong", "b"):
+            self.inline(paragraph, element, True, italic)
+        elif tag in ("em", "i"):
+            self.inline(paragraph, element, bold, True)
+        elif tag == "code":
+            self.text(paragraph, "".join(element.itertext()), bold, italic, code=True)
+        elif tag == "a":
+            self.link(paragraph, element, bold, italic)
+        elif tag == "br":
+            paragraph.add_run().add_break()
+        elif tag == "img":
+            self.text(paragraph, element.get("alt") or element.get("src", ""), bold, True)
+        else:
+            self.inline(paragraph, element, bold, italic)
+
+    def link(self, paragraph, element, bold: bool, italic: bool):
+        url = element.get("href")
+        text = self.clean("".join(element.itertext())) or url
+        if not url:
+            self.text(paragraph, text, bold, italic)
+            return
+
+        r_id = self.links.get(url)
+        if r_id is None:
+            r_id = self.links[url] = self.document.part.relate_to(url, RT.HYPERLINK, is_external=True)
+        hyperlink = OxmlElement("w:hyperlink")
+        hyperlink.set(qn("r:id"), r_id)
+
+        run = paragraph.add_run(text)
+        run.bold = bold or None
+        run.italic = italic or None
+        run.font.underline = True
+        run.font.color.rgb = RGBColor(*LINK_COLOR)
+        # Move the formatted run inside the hyperlink element
+        hyperlink.append(run._r)
+        paragraph._p.append(hyperlink)
@@ -0,0 +1,255 @@
+import json
+import math
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from .lazy import LazyImport
+from .sessions import ResearchSessionStore
+from .sources import SearchResult
+from .telemetry import CACHE_LOOKUPS
+
+SentenceTransformer = LazyImport("sentence_transformers", "SentenceTransformer")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from how in into is its of on or the to vs versus what why with".split()
+)
+
+def cosine(a: dict, b: dict) -> float:
+    """Dot product of two L2-normalized sparse vectors ({dimension: weight})."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(i, 0.0) for i, weight in a.items())
+
+class HashingEmbedder:
+    """
+    Offline embedding backend with no model or network: words and their character trigrams
+    are hashed into `dim` signed buckets and L2-normalized. Matches reordered, inflected and
+    partially overlapping phrasings; synonyms need a model (see `SentenceTransformerEmbedder`).
+    """
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    @staticmethod
+    def features(text: str) -> dict:
+        features = {}
+        for word in re.findall(r"\w+", text.lower()):
+            if word in STOPWORDS:
+                continue
+            features["w:" + word] = features.get("w:" + word, 0.0) + 1.0
+            padded = f"#{word}#"
+            for i in range(len(padded) - 2):
+                trigram = "c:" + padded[i:i + 3]
+                features[trigram] = features.get(trigram, 0.0) + 0.25
+        return features
+
+    def embed(self, text: str) -> dict:
+        vector = {}
+        for feature, weight in self.features(text).items():
+            digest = zlib.crc32(feature.encode("utf-8"))
+            index = digest % self.dim
+            vector[index] = vector.get(index, 0.0) + (weight if digest & 0x10000 else -weight)
+        norm = math.sqrt(sum(value * value for value in vector.values())) or 1.0
+        return {index: value / norm for index, value in vector.items() if value}
+
+class SentenceTransformerEmbedder:
+    """Local sentence-transformers model (fetched once, then used offline) for paraphrase-level matches."""
+
+    def __init__(self, model_name: str):
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"st-{model_name}"
+
+    def embed(self, text: str) -> dict:
+        vector = self.model.encode(text, normalize_embeddings=True)
+        return {i: float(value) for i, value in enumerate(vector)}
+
+class FindingsIndex:
+    """
+    Local vector index of past sub-topic findings, so a near-identical sub-topic planned in a
+    later run can reuse an earlier finding instead of searching and analysing again.
+
+    Lookups are approximate: every entry is bucketed by random-hyperplane LSH in `tables`
+    hash tables of `bits` sign bits each, and only entries sharing a bucket with the query
+    are scored by cosine similarity. A match needs the same instructions, a similarity of
+    at least `threshold`, and to be younger than `ttl` seconds. With `path`, entries
+    persist in SQLite (loaded on first use).
+    """
+
+    def __init__(self, embedder=None, path: str = None, threshold: float = 0.85, ttl: float = 7 * 24 * 3600,
+                 max_entries: int = 10000, tables: int = 8, bits: int = 6, seed: int = 0):
+        self.embedder = embedder or HashingEmbedder()
+        self.path = path
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.tables = tables
+        self.bits = bits
+        rng = random.Random(seed)
+        self._planes = [
+            [[rng.choice((-1.0, 1.0)) for _ in range(self.embedder.dim)] for _ in range(bits)]
+            for _ in range(tables)
+        ]
+        self._entries = {}   # item key -> entry
+        self._buckets = [{} for _ in range(tables)]  # signature -> set of item keys
+        self._lock = threading.Lock()
+        self._conn = None
+        self._loaded = False
+
+    def _signatures(self, vector: dict) -> list:
+        signatures = []
+        for planes in self._planes:
+            signature = 0
+            for plane in planes:
+                signature = (signature << 1) | (sum(weight * plane[i] for i, weight in vector.items()) >= 0)
+            signatures.append(signature)
+        return signatures
+
+    def _db(self):
+        if self._conn is None and self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS findings ("
+                "key TEXT PRIMARY KEY, embedder TEXT NOT NULL, topic TEXT NOT NULL, instructions TEXT NOT NULL, "
+                "vector TEXT NOT NULL, content TEXT NOT NULL, sources TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        db = self._db()
+        if db is None:
+            return
+        db.execute("DELETE FROM findings WHERE created_at <= ?", (time.time() - self.ttl,))
+        db.commit()
+        # Vectors from another embedding backend aren't comparable with this one's
+        rows = db.execute(
+            "SELECT key, topic, instructions, vector, content, sources, created_at FROM findings "
+            "WHERE embedder = ? ORDER BY created_at", (self.embedder.name,)
+        ).fetchall()
+        for key, topic, instructions, vector, content, sources, created_at in rows:
+            self._insert(key, {
+                "topic": topic,
+                "instructions": instructions,
+                "vector": {int(i): weight for i, weight in json.loads(vector).items()},
+                "content": content,
+                "sources": json.loads(sources),
+                "created_at": created_at,
+            })
+
+    def _insert(self, key: str, entry: dict):
+        self._remove(key)
+        entry["signatures"] = self._signatures(entry["vector"])
+        self._entries[key] = entry
+        for bucket, signature in zip(self._buckets, entry["signatures"]):
+            bucket.setdefault(signature, set()).add(key)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for bucket, signature in zip(self._buckets, entry["signatures"]):
+            keys = bucket.get(signature)
+            keys.discard(key)
+            if not keys:
+                del bucket[signature]
+
+    def add(self, topic: str, instructions: str, content: str, sources: list):
+        """Indexes a finished sub-topic, replacing any earlier finding for the same topic and instructions."""
+        key = ResearchSessionStore.item_key(topic, instructions)
+        sources = [source.to_dict() if isinstance(source, SearchResult) else source for source in sources]
+        entry = {
+            "topic": topic,
+            "instructions": (instructions or "").strip(),
+            "vector": self.embedder.embed(topic),
+            "content": content,
+            "sources": sources,
+            "created_at": time.time(),
+        }
+        with self._lock:
+            self._load()
+            self._insert(key, entry)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                oldest = min(self._entries, key=lambda k: self._entries[k]["created_at"])
+                self._remove(oldest)
+                evicted.append((oldest,))
+            db = self._db()
+            if db is not None:
+                db.execute(
+                    "INSERT OR REPLACE INTO findings (key, embedder, topic, instructions, vector, content, sources, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, self.embedder.name, topic, entry["instructions"], json.dumps(entry["vector"]),
+                     content, json.dumps(sources), entry["created_at"])
+                )
+                db.executemany("DELETE FROM findings WHERE key = ?", evicted)
+                db.commit()
+
+    def lookup(self, topic: str, instructions: str = None):
+        """
+        Returns the most similar fresh finding as {"topic", "content", "sources", "similarity"},
+        or None if nothing passes the threshold.
+        """
+        vector = self.embedder.embed(topic)
+        signatures = self._signatures(vector)
+        instructions = (instructions or "").strip()
+        oldest = time.time() - self.ttl
+        best, best_similarity = None, self.threshold
+        with self._lock:
+            self._load()
+            candidates = set()
+            for bucket, signature in zip(self._buckets, signatures):
+                candidates.update(bucket.get(signature, ()))
+            for key in candidates:
+                entry = self._entries[key]
+                if entry["created_at"] <= oldest or entry["instructions"] != instructions:
+                    continue
+                similarity = cosine(vector, entry["vector"])
+                if similarity >= best_similarity:
+                    best, best_similarity = entry, similarity
+
+        CACHE_LOOKUPS.inc(cache="findings", result="miss" if best is None else "hit")
+        if best is None:
+            return None
+        return {"topic": best["topic"], "content": best["content"], "sources": best["sources"], "similarity": round(best_similarity, 3)}
+
+    def __len__(self):
+        with self._lock:
+            self._load()
+            return len(self._entries)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+_findings_index = None
+
+def get_findings_index() -> FindingsIndex:
+    """
+    Returns the process-wide findings index.
+    Configured through SEMANTIC_INDEX_PATH, SEMANTIC_REUSE_THRESHOLD, SEMANTIC_REUSE_TTL and
+    SEMANTIC_EMBEDDING_MODEL (a sentence-transformers model; the hashing backend if unset).
+    """
+    global _findings_index
+    if _findings_index is None:
+        model = os.getenv("SEMANTIC_EMBEDDING_MODEL")
+        _findings_index = FindingsIndex(
+            embedder=SentenceTransformerEmbedder(model) if model else HashingEmbedder(),
+            path=os.getenv("SEMANTIC_INDEX_PATH", os.path.join(".cache", "findings.sqlite")),
+            threshold=float(os.getenv("SEMANTIC_REUSE_THRESHOLD", "0.85")),
+            ttl=float(os.getenv("SEMANTIC_REUSE_TTL", str(7 * 24 * 3600)))
+        )
+    return _findings_index
@@ -0,0 +1,38 @@
+import importlib
+import threading
+
+class LazyImport:
+    """
+    Stand-in for a module, or for an attribute of one, that is only imported on first use.
+
+    Heavy SDKs (Gemini, PDF/DOCX stacks, search clients) are bound at module level like a
+    normal import, so call sites and `unittest.mock.patch` targets stay unchanged, but
+    importing the module that declares them stays cheap:
+
+        ChatGoogleGenerativeAI = LazyImport("langchain_google_genai", "ChatGoogleGenerativeAI")
+    """
+
+    def __init__(self, module: str, attribute: str = None):
+        self._module = module
+        self._attribute = attribute
+        self._target = None
+        self._lock = threading.Lock()
+
+    def resolve(self):
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    module = importlib.import_module(self._module)
+                    self._target = getattr(module, self._attribute) if self._attribute else module
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self.resolve(), name)
+
+    def __repr__(self):
+        target = f"{self._module}.{self._attribute}" if self._attribute else self._module
+        state = "loaded" if self._target is not None else "not loaded"
+        return f"<LazyImport {target} ({state})>"
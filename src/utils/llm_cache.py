@@ -0,0 +1,221 @@
+import asyncio
+import hashlib
+import json
+import os
+from typing import Any, Callable
+from .cache import TTLCache
+from .context import count_tokens
+from .telemetry import CACHE_LOOKUPS, LLM_TOKENS, Span, span, start_span
+
+class LLMCache:
+    """
+    Content-addressed cache for deterministic (temperature=0) LLM chain outputs.
+
+    Keys combine the model name, a hash of the fully rendered prompt messages and the
+    raw chain inputs. Only the extracted, JSON-serializable result is stored.
+    """
+
+    def __init__(self, cache: TTLCache, ttl: float = 7 * 24 * 3600, enabled: bool = True):
+        self.cache = cache
+        self.ttl = ttl
+        self.enabled = enabled
+
+    @staticmethod
+    def _messages(prompt, inputs: dict) -> list:
+        return [(message.type, message.content) for message in prompt.format_messages(**inputs)]
+
+    def key(self, model: str, prompt, inputs: dict) -> str:
+        prompt_hash = hashlib.sha256(json.dumps(self._messages(prompt, inputs), default=str).encode("utf-8")).hexdigest()
+        raw = json.dumps([model, prompt_hash, inputs], sort_keys=True, default=str)
+        return "llm:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str, current: Span = None):
+        cached = self.cache.get(key)
+        CACHE_LOOKUPS.inc(cache="llm", result="miss" if cached is None else "hit")
+        if current is not None:
+            current.set(cached=cached is not None)
+        return cached
+
+    async def _aget(self, key: str, current: Span = None):
+        cached = await self.cache.aget(key)
+        CACHE_LOOKUPS.inc(cache="llm", result="miss" if cached is None else "hit")
+        if current is not None:
+            current.set(cached=cached is not None)
+        return cached
+
+    def _count_usage(self, model: str, prompt, inputs: dict, result) -> tuple:
+        prompt_tokens = sum(count_tokens(str(content)) for _, content in self._messages(prompt, inputs))
+        completion_tokens = count_tokens(result if isinstance(result, str) else json.dumps(result, default=str))
+        LLM_TOKENS.inc(prompt_tokens, model=model, kind="prompt")
+        LLM_TOKENS.inc(completion_tokens, model=model, kind="completion")
+        return prompt_tokens, completion_tokens
+
+    def record_usage(self, current: Span, model: str, prompt, inputs: dict, result):
+        """Attaches approximate prompt/completion token counts of one model call to its span and the metrics."""
+        prompt_tokens, completion_tokens = self._count_usage(model, prompt, inputs, result)
+        current.set(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+
+    def lookup(self, model: str, prompt, inputs: dict):
+        """Returns the cached result for these inputs, or None (also when caching is disabled)."""
+        return self._get(self.key(model, prompt, inputs)) if self.enabled else None
+
+    def store(self, model: str, prompt, inputs: dict, result):
+        if self.enabled:
+            self.cache.set(self.key(model, prompt, inputs), result, ttl=self.ttl)
+
+    def invoke(self, chain, prompt, model: str, inputs: dict, extract: Callable[[Any], Any] = None, use_cache: bool = True):
+        """Returns `extract(chain.invoke(inputs))`, served from the cache when possible."""
+        extract = extract or (lambda response: response)
+        with span("llm.call", model=model) as current:
+            key = self.key(model, prompt, inputs) if self.enabled and use_cache else None
+            if key:
+                cached = self._get(key, current)
+                if cached is not None:
+                    return cached
+
+            result = extract(chain.invoke(inputs))
+            self.record_usage(current, model, prompt, inputs, result)
+            if key:
+                self.cache.set(key, result, ttl=self.ttl)
+            return result
+
+    async def ainvoke(self, chain, prompt, model: str, inputs: dict, extract: Callable[[Any], Any] = None, use_cache: bool = True):
+        """Async variant of `invoke`."""
+        extract = extract or (lambda response: response)
+        with span("llm.call", model=model) as current:
+            key = self.key(model, prompt, inputs) if self.enabled and use_cache else None
+            if key:
+                cached = await self._aget(key, current)
+                if cached is not None:
+                    return cached
+
+            result = extract(await chain.ainvoke(inputs))
+            self.record_usage(current, model, prompt, inputs, result)
+            if key:
+                await self.cache.aset(key, result, ttl=self.ttl)
+            return result
+
+    @staticmethod
+    def _batch_prompts(prompt, inputs: list) -> list:
+        return list(prompt) if isinstance(prompt, (list, tuple)) else [prompt] * len(inputs)
+
+    @staticmethod
+    def _batch_requests(prompt, prompts: list, inputs: list, pending: list) -> list:
+        """What the chain is called with: the raw inputs for a shared prompt, else each input rendered with its own prompt."""
+        if isinstance(prompt, (list, tuple)):
+            return [prompts[i].format_prompt(**inputs[i]) for i in pending]
+        return [inputs[i] for i in pending]
+
+    def _split_batch(self, prompts: list, model: str, inputs: list, use_cache: bool):
+        """Returns (cache keys, results with cached entries filled in, indexes still to call)."""
+        keys = [self.key(model, prompt, item) if self.enabled and use_cache else None for prompt, item in zip(prompts, inputs)]
+        results = [None] * len(inputs)
+        pending = []
+        for i, key in enumerate(keys):
+            cached = self._get(key) if key else None
+            if cached is None:
+                pending.append(i)
+            else:
+                results[i] = cached
+        return keys, results, pending
+
+    def _merge_batch(self, current: Span, prompts: list, model: str, inputs: list, keys: list, results: list, pending: list, responses: list, extract):
+        prompt_tokens = completion_tokens = errors = 0
+        for i, response in zip(pending, responses):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                results[i] = extract(response)
+            except Exception as e:
+                results[i] = e
+                errors += 1
+                continue
+            usage = self._count_usage(model, prompts[i], inputs[i], results[i])
+            prompt_tokens += usage[0]
+            completion_tokens += usage[1]
+            if keys[i]:
+                self.cache.set(keys[i], results[i], ttl=self.ttl)
+        current.set(cached=len(inputs) - len(pending), errors=errors, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        return results
+
+    def batch(self, chain, prompt, model: str, inputs: list, extract: Callable[[Any], Any] = None, use_cache: bool = True, max_concurrency: int = None) -> list:
+        """
+        Batched `invoke`: cached inputs are answered from the cache and the rest go to the model
+        in one `chain.batch` call with at most `max_concurrency` in flight. Returns one result per
+        input, or the exception that input's call raised.
+
+        `prompt` is either shared by all inputs (`chain` is `prompt | llm`) or a list with one
+        prompt per input; then `chain` is the bare model and receives each rendered prompt, and
+        every input gets the same cache key as an `invoke` with its own prompt.
+        """
+        extract = extract or (lambda response: response)
+        prompts = self._batch_prompts(prompt, inputs)
+        with span("llm.batch", model=model, size=len(inputs)) as current:
+            keys, results, pending = self._split_batch(prompts, model, inputs, use_cache)
+            responses = []
+            if pending:
+                config = {"max_concurrency": max_concurrency} if max_concurrency else None
+                responses = chain.batch(self._batch_requests(prompt, prompts, inputs, pending), config=config, return_exceptions=True)
+            return self._merge_batch(current, prompts, model, inputs, keys, results, pending, responses, extract)
+
+    async def abatch(self, chain, prompt, model: str, inputs: list, extract: Callable[[Any], Any] = None, use_cache: bool = True, max_concurrency: int = None) -> list:
+        """Async variant of `batch`, built on `chain.abatch`. Cache reads and writes run in a worker thread."""
+        extract = extract or (lambda response: response)
+        prompts = self._batch_prompts(prompt, inputs)
+        with span("llm.batch", model=model, size=len(inputs)) as current:
+            keys, results, pending = await asyncio.to_thread(self._split_batch, prompts, model, inputs, use_cache)
+            responses = []
+            if pending:
+                config = {"max_concurrency": max_concurrency} if max_concurrency else None
+                responses = await chain.abatch(self._batch_requests(prompt, prompts, inputs, pending), config=config, return_exceptions=True)
+            return await asyncio.to_thread(self._merge_batch, current, prompts, model, inputs, keys, results, pending, responses, extract)
+
+    async def astream(self, chain, prompt, model: str, inputs: dict, extract: Callable[[Any], str] = None, use_cache: bool = True):
+        """
+        Streams `extract(chunk)` for each chunk of `chain.astream(inputs)`.
+        A cached response is yielded as a single chunk; a fully streamed one is cached.
+        """
+        extract = extract or (lambda chunk: chunk)
+        key = self.key(model, prompt, inputs) if self.enabled and use_cache else None
+        # The span outlives this generator's caller context, so it is finished by hand
+        current = start_span("llm.stream", model=model)
+        try:
+            if key:
+                cached = await self._aget(key, current)
+                if cached is not None:
+                    yield cached
+                    return
+
+            parts = []
+            async for chunk in chain.astream(inputs):
+                text = extract(chunk)
+                parts.append(text)
+                yield text
+
+            self.record_usage(current, model, prompt, inputs, "".join(parts))
+            if key:
+                await self.cache.aset(key, "".join(parts), ttl=self.ttl)
+        except Exception as e:
+            current.fail(e)
+            raise
+        finally:
+            current.finish()
+
+_llm_cache = None
+
+def get_llm_cache() -> LLMCache:
+    """
+    Returns the process-wide LLM response cache shared by all agents.
+    Configured through LLM_CACHE_PATH, LLM_CACHE_MAX_MB, LLM_CACHE_TTL and LLM_CACHE_DISABLED.
+    """
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = LLMCache(
+            TTLCache(
+                path=os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite")),
+                max_disk_bytes=int(os.getenv("LLM_CACHE_MAX_MB", "128")) * 1024 * 1024
+            ),
+            ttl=float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600))),
+            enabled=os.getenv("LLM_CACHE_DISABLED", "").lower() not in ("1", "true")
+        )
+    return _llm_cache
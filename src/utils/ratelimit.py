@@ -0,0 +1,296 @@
+import asyncio
+import os
+import re
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+# Errors that mean "slow down": HTTP 429/5xx and the wording providers use for quota exhaustion.
+# Status codes only count where a status is reported ("503 Server Error", "status code: 429"),
+# not any three-digit number in the message (ports, counts, IDs).
+THROTTLE_PATTERN = re.compile(
+    r"\b(?:429|5\d\d)\s+(?:server error|client error|too many requests|service unavailable|bad gateway|gateway time-?out|internal(?: server)? error|resource)"
+    r"|\b(?:status(?:[ _]code)?|http(?: status)?|error code)[\s:=]+(?:429|5\d\d)\b"
+    r"|too many requests|rate.?limit|resource.?exhausted|quota",
+    re.IGNORECASE
+)
+
+def _status_code(error):
+    # requests/httpx errors carry the response, Google API errors a numeric `code`
+    for value in (getattr(error, "status_code", None), getattr(error, "code", None),
+                  getattr(getattr(error, "response", None), "status_code", None)):
+        if isinstance(value, int):
+            return value
+    return None
+
+def is_throttle_error(error) -> bool:
+    if not error:
+        return False
+    status = _status_code(error)
+    if status is not None and (status == 429 or 500 <= status < 600):
+        return True
+    return bool(THROTTLE_PATTERN.search(str(error)))
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, bursting up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Takes a token if one is available. Returns 0 on success, else the seconds until one will be."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit. Each success grows the limit by 1/limit (about +1 per round of
+    requests) and a throttling error (429/5xx) halves it, within [min_limit, max_limit].
+
+    Latency is not a congestion signal here: one provider's limiter serves calls whose
+    normal duration differs by an order of magnitude (a 2s plan, a 30s report), so slow
+    calls are not evidence of overload. It is only tracked as a moving average for stats.
+    """
+
+    def __init__(self, initial: float = 4, min_limit: float = 1, max_limit: float = 32):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.in_flight = 0
+        self.latency = None  # exponentially weighted moving average, in seconds
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight < max(1, int(self.limit)):
+                self.in_flight += 1
+                return True
+            return False
+
+    def cancel(self):
+        """Gives back a slot that was acquired but never used, without touching the limit."""
+        with self._lock:
+            self.in_flight -= 1
+
+    def release(self, latency: float, throttled: bool = False):
+        with self._lock:
+            self.in_flight -= 1
+            self.latency = latency if self.latency is None else 0.9 * self.latency + 0.1 * latency
+            if throttled:
+                self.limit = max(self.min_limit, self.limit / 2)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+class ProviderLimiter:
+    """
+    Combines a token bucket (request rate) and an adaptive concurrency limit for one provider.
+    Shared by every thread and event loop in the process.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float = None, max_concurrency: int = 16, poll_interval: float = 0.05):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = AdaptiveLimiter(initial=min(4, max_concurrency), max_limit=max_concurrency)
+        self.poll_interval = poll_interval
+        self.throttled = 0
+
+    def _wait_time(self) -> float:
+        if not self.concurrency.try_acquire():
+            return self.poll_interval
+        wait = self.bucket.try_acquire()
+        if wait:
+            self.concurrency.cancel()
+        return wait
+
+    def try_acquire(self) -> bool:
+        """Takes a slot only if one is free right now."""
+        return not self._wait_time()
+
+    def acquire(self):
+        while True:
+            wait = self._wait_time()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def aacquire(self):
+        while True:
+            wait = self._wait_time()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self, latency: float, error=None):
+        throttled = is_throttle_error(error)
+        if throttled:
+            self.throttled += 1
+        self.concurrency.release(latency, throttled=throttled)
+
+    @contextmanager
+    def limit(self):
+        """Holds a slot for the duration of the block. Exceptions raised inside feed the AIMD controller."""
+        self.acquire()
+        start = time.monotonic()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            # Also runs on cancellation or when a wrapped stream is closed early
+            self.release(time.monotonic() - start, error=error)
+
+    @asynccontextmanager
+    async def alimit(self):
+        """Async variant of `limit`."""
+        await self.aacquire()
+        start = time.monotonic()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            # Also runs on cancellation or when a wrapped stream is closed early
+            self.release(time.monotonic() - start, error=error)
+
+    def stats(self) -> dict:
+        return {
+            "limit": round(self.concurrency.limit, 2),
+            "in_flight": self.concurrency.in_flight,
+            "throttled": self.throttled,
+            "latency_ms": round(self.concurrency.latency * 1000) if self.concurrency.latency is not None else None,
+        }
+
+# Requests per second, burst size and concurrency ceiling per provider.
+# Override with e.g. RATE_LIMIT_ARXIV=0.5 and CONCURRENCY_LIMIT_ARXIV=2.
+DEFAULT_LIMITS = {
+    "gemini": (5.0, 10, 16),
+    "tavily": (5.0, 10, 8),
+    "serper": (5.0, 10, 8),
+    "duckduckgo": (1.0, 3, 3),
+    "wikipedia": (10.0, 10, 8),
+    "arxiv": (1 / 3, 1, 1),
+}
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(provider: str) -> ProviderLimiter:
+    """Returns the process-wide limiter for `provider`, creating it on first use."""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            rate, burst, max_concurrency = DEFAULT_LIMITS.get(provider, (10.0, 10, 16))
+            suffix = provider.upper()
+            limiter = ProviderLimiter(
+                provider,
+                rate=float(os.getenv(f"RATE_LIMIT_{suffix}", rate)),
+                burst=burst,
+                max_concurrency=int(os.getenv(f"CONCURRENCY_LIMIT_{suffix}", max_concurrency))
+            )
+            _limiters[provider] = limiter
+        return limiter
+
+class LimitedChain:
+    """
+    Wraps a LangChain runnable so every invoke/ainvoke/stream/astream call holds a slot
+    on the given provider limiter.
+    """
+
+    def __init__(self, chain, limiter: ProviderLimiter):
+        self.chain = chain
+        self.limiter = limiter
+
+    def invoke(self, inputs, config=None):
+        with self.limiter.limit():
+            return self.chain.invoke(inputs, config=config)
+
+    async def ainvoke(self, inputs, config=None):
+        async with self.limiter.alimit():
+            return await self.chain.ainvoke(inputs, config=config)
+
+    def stream(self, inputs, config=None):
+        with self.limiter.limit():
+            for chunk in self.chain.stream(inputs, config=config):
+                yield chunk
+
+    async def astream(self, inputs, config=None):
+        async with self.limiter.alimit():
+            async for chunk in self.chain.astream(inputs, config=config):
+                yield chunk
+
+    def _wave(self, wanted: int) -> int:
+        # The caller waited for one slot; the rest are only taken while free, since waiting
+        # for all of them could deadlock against a limit below `wanted`
+        granted = 1
+        while granted < wanted and self.limiter.try_acquire():
+            granted += 1
+        return granted
+
+    def _release_wave(self, outputs: list, start: float):
+        latency = time.monotonic() - start
+        for output in outputs:
+            self.limiter.release(latency, error=output if isinstance(output, Exception) else None)
+
+    @staticmethod
+    def _checked(outputs: list, return_exceptions: bool) -> list:
+        if not return_exceptions:
+            for output in outputs:
+                if isinstance(output, Exception):
+                    raise output
+        return outputs
+
+    def batch(self, inputs: list, config=None, return_exceptions: bool = False) -> list:
+        """
+        Same contract as `Runnable.batch`, sent through `chain.batch` in waves: each wave is as
+        many items as the limiter has slots for right now (at most `config["max_concurrency"]`),
+        one slot per item, released when the wave returns.
+        """
+        results = []
+        max_concurrency = (config or {}).get("max_concurrency") or len(inputs)
+        while len(results) < len(inputs):
+            self.limiter.acquire()
+            wave = inputs[len(results):len(results) + self._wave(min(max_concurrency, len(inputs) - len(results)))]
+            start = time.monotonic()
+            # Also releases the slots if the call is interrupted
+            outputs = [None] * len(wave)
+            try:
+                outputs = self.chain.batch(wave, config={**(config or {}), "max_concurrency": len(wave)}, return_exceptions=True)
+            except Exception as e:
+                outputs = [e] * len(wave)
+            finally:
+                self._release_wave(outputs, start)
+            results.extend(self._checked(outputs, return_exceptions))
+        return results
+
+    async def abatch(self, inputs: list, config=None, return_exceptions: bool = False) -> list:
+        """Async variant of `batch`, sent through `chain.abatch`."""
+        results = []
+        max_concurrency = (config or {}).get("max_concurrency") or len(inputs)
+        while len(results) < len(inputs):
+            await self.limiter.aacquire()
+            wave = inputs[len(results):len(results) + self._wave(min(max_concurrency, len(inputs) - len(results)))]
+            start = time.monotonic()
+            # Also releases the slots if the task is cancelled mid-wave
+            outputs = [None] * len(wave)
+            try:
+                outputs = await self.chain.abatch(wave, config={**(config or {}), "max_concurrency": len(wave)}, return_exceptions=True)
+            except Exception as e:
+                outputs = [e] * len(wave)
+            finally:
+                self._release_wave(outputs, start)
+            results.extend(self._checked(outputs, return_exceptions))
+        return results
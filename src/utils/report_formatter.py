@@ -1,26 +1,57 @@
 import os
-import markdown
+import threading
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader
-from xhtml2pdf import pisa
 from io import BytesIO
+from .docx_converter import MarkdownDocxConverter
+from .lazy import LazyImport
+
+# Export backends are only loaded when a report is actually rendered
+markdown = LazyImport("markdown")
+pisa = LazyImport("xhtml2pdf.pisa")
+Environment = LazyImport("jinja2", "Environment")
+FileSystemLoader = LazyImport("jinja2", "FileSystemLoader")
+
+# Shared by the HTML/PDF and DOCX exports so both render the same Markdown features
+MARKDOWN_EXTENSIONS = ['tables', 'fenced_code']
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
 
 class ReportFormatter:
-    def __init__(self):
-        # Setup Jinja2 environment
-        template_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
-        self.env = Environment(loader=FileSystemLoader(template_dir))
+    # The Jinja environment and compiled template are shared by every formatter in the process
+    _env = None
+    _template = None
+    _lock = threading.Lock()
+
+    @property
+    def env(self):
+        return self.environment()
+
+    @classmethod
+    def environment(cls):
+        if cls._env is None:
+            with cls._lock:
+                if cls._env is None:
+                    cls._env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+        return cls._env
+
+    @classmethod
+    def template(cls):
+        if cls._template is None:
+            env = cls.environment()
+            with cls._lock:
+                if cls._template is None:
+                    cls._template = env.get_template('report.html')
+        return cls._template
 
     def generate_html(self, markdown_content: str, title: str = "Research Report") -> str:
         """
         Converts markdown content to a styled HTML report using Jinja2 template.
         """
         # Convert Markdown to HTML
-        html_content = markdown.markdown(markdown_content, extensions=['tables', 'fenced_code'])
+        html_content = markdown.markdown(markdown_content, extensions=MARKDOWN_EXTENSIONS)
         
         # Render template
-        template = self.env.get_template('report.html')
-        rendered_html = template.render(
+        rendered_html = self.template().render(
             title=title,
             content=html_content,
             date=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -41,3 +72,12 @@ class ReportFormatter:
             
         buffer.seek(0)
         return buffer
+
+    def generate_docx(self, markdown_content: str) -> BytesIO:
+        """
+        Generates a Word document buffer from markdown content.
+        """
+        buffer = BytesIO()
+        MarkdownDocxConverter(MARKDOWN_EXTENSIONS).write(markdown_content, buffer)
+        buffer.seek(0)
+        return buffer
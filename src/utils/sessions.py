@@ -0,0 +1,54 @@
+import hashlib
+import json
+import os
+import uuid
+from .cache import TTLCache
+from .sources import SearchResult
+
+class ResearchSessionStore:
+    """
+    Remembers, per research session, the inputs and outputs of every sub-topic and the last
+    generated report, so a resubmitted plan only recomputes what actually changed.
+
+    A session is stored as {"items": {item_key: {"topic", "instructions", "content", "sources"}},
+    "summary": {"key": ..., "report": ...}} and expires `ttl` seconds after its last update.
+    """
+
+    def __init__(self, cache: TTLCache, ttl: float = 24 * 3600):
+        self.cache = cache
+        self.ttl = ttl
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def item_key(topic: str, instructions: str = None) -> str:
+        raw = json.dumps([" ".join(topic.split()), (instructions or "").strip()])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def summary_key(topic: str, research_findings: dict, sources: list, custom_prompt: str = None) -> str:
+        raw = json.dumps([topic, research_findings, [SearchResult.coerce(source).url for source in sources], custom_prompt], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, session_id: str) -> dict:
+        return self.cache.get("session:" + session_id) or {"items": {}, "summary": None}
+
+    def save(self, session_id: str, session: dict):
+        self.cache.set("session:" + session_id, session, ttl=self.ttl)
+
+_session_store = None
+
+def get_session_store() -> ResearchSessionStore:
+    """
+    Returns the process-wide session store.
+    Configured through RESEARCH_SESSION_PATH and RESEARCH_SESSION_TTL.
+    """
+    global _session_store
+    if _session_store is None:
+        _session_store = ResearchSessionStore(
+            TTLCache(path=os.getenv("RESEARCH_SESSION_PATH", os.path.join(".cache", "sessions.sqlite"))),
+            ttl=float(os.getenv("RESEARCH_SESSION_TTL", str(24 * 3600)))
+        )
+    return _session_store
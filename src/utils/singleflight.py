@@ -0,0 +1,70 @@
+import asyncio
+import hashlib
+import json
+import threading
+from .telemetry import COALESCED
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Collapses concurrent calls that share a key into one execution. The first caller runs it;
+    callers arriving while it is in flight wait and get the same result (or exception).
+    Nothing is kept afterwards, so the next call with that key runs again.
+
+    Results are shared between callers as-is and must be treated as read-only.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls = {}   # key -> _Call, for threads
+        self._tasks = {}   # (loop, key) -> asyncio.Task, for coroutines
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(*parts) -> str:
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def do(self, key: str, fn, *args, **kwargs):
+        """Runs `fn(*args, **kwargs)` unless an identical call is already running in another thread."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            COALESCED.inc(operation=self.name)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def ado(self, key: str, fn, *args, **kwargs):
+        """Awaits `fn(*args, **kwargs)`, sharing one task with identical calls on the same event loop."""
+        task_key = (asyncio.get_running_loop(), key)
+        task = self._tasks.get(task_key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._tasks[task_key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(task_key, None))
+        else:
+            COALESCED.inc(operation=self.name)
+        # Shielded so one caller disconnecting doesn't cancel the work others are waiting on
+        return await asyncio.shield(task)
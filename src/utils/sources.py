@@ -0,0 +1,183 @@
+import asyncio
+import hashlib
+import re
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = re.compile(r"^(utm_.*|fbclid|gclid|mc_cid|mc_eid|ref|ref_src|spm)$", re.IGNORECASE)
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalizes a URL so trivially different links to the same document compare equal:
+    scheme and host case, `www.`, default ports, fragments, tracking parameters,
+    query parameter order and trailing slashes are ignored.
+    """
+    if not url or url == "#":
+        return ""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not TRACKING_PARAMS.match(k)))
+    path = parts.path.rstrip("/") or "/"
+    # arxiv.org/abs/2101.00001v2 and .../abs/2101.00001 are the same paper
+    if host == "arxiv.org":
+        path = re.sub(r"^/(abs|pdf)/([^/]+?)(v\d+)?(\.pdf)?$", r"/abs/\2", path)
+    return urlunsplit(("https", host, path, query, ""))
+
+def content_hash(text: str) -> str:
+    normalized = " ".join(re.findall(r"\w+", (text or "").lower()))
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+class SearchResult:
+    """
+    One search hit as passed between skills, agents and the server.
+
+    Slotted, since a run holds one per hit, and kept structured until the evidence is packed:
+    `render` builds the prompt text for a hit only once it is known to be needed.
+    `to_dict`/`from_dict` convert to and from the JSON form the client and caches use.
+    """
+    __slots__ = ("title", "url", "snippet", "provider", "score", "id")
+
+    def __init__(self, title: str, url: str, snippet: str = "", provider: str = "", score: float = None, id: str = None):
+        self.title = title
+        self.url = url
+        self.snippet = snippet
+        self.provider = provider
+        self.score = score
+        self.id = id
+
+    def render(self) -> str:
+        return f"[{self.provider}] Source: {self.title}\nURL: {self.url}\nContent: {self.snippet}"
+
+    def reference(self, id: str = None) -> "SearchResult":
+        """Copy without the snippet, for source lists that outlive the prompt."""
+        return SearchResult(self.title, self.url, provider=self.provider, score=self.score, id=id)
+
+    def to_dict(self) -> dict:
+        data = {"title": self.title, "href": self.url, "source_type": self.provider}
+        if self.id is not None:
+            data["id"] = self.id
+        if self.score is not None:
+            data["score"] = self.score
+        if self.snippet:
+            data["snippet"] = self.snippet
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SearchResult":
+        return cls(data.get("title", ""), data.get("href", "#"), data.get("snippet", ""), data.get("source_type", ""), data.get("score"), data.get("id"))
+
+    @classmethod
+    def coerce(cls, value) -> "SearchResult":
+        """Accepts a SearchResult or its dict form (API input, stored sessions, third-party skills)."""
+        return value if isinstance(value, cls) else cls.from_dict(value)
+
+    def __repr__(self):
+        return f"SearchResult(title={self.title!r}, url={self.url!r}, provider={self.provider!r}, id={self.id!r})"
+
+class SourceIndex:
+    """
+    Per-run registry of evidence shared by all concurrent researcher calls.
+
+    Each document is registered once, keyed on its canonical URL and on a hash of its text,
+    and gets a short ID derived from those keys (stable across runs, which keeps prompts
+    cacheable). Later sightings from other sub-topics get the existing entry back, so they
+    can cite it instead of carrying another copy.
+
+    A document belongs to the claimant earliest in plan order (see `expect`), never to the
+    search that happened to finish first: researchers mark their sub-topic `searched` and
+    `wait_for_earlier` sub-topics before rendering evidence, so every run of the same plan
+    gives the same prompts. Claimants outside the plan (e.g. reused findings) come first.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._by_url = {}
+        self._by_hash = {}
+        self._entries = []
+        self._claims = {}
+        self._order = {}
+        self._searched = set()
+
+    def expect(self, owner: str):
+        """Appends a sub-topic to the plan order. Call in plan order, before researching it."""
+        with self._lock:
+            self._order.setdefault(owner, len(self._order))
+
+    def register(self, source: SearchResult, content: str = None, owner: str = None, rank: int = 0):
+        """
+        Returns (entry, is_new). `entry` is the shared SearchResult (with an `id`, without the
+        snippet); `is_new` is False when another sub-topic currently owns the same document.
+        `rank` is the hit's position in the owner's results.
+        """
+        source = SearchResult.coerce(source)
+        url = canonicalize_url(source.url)
+        digest = content_hash(content) if content else None
+        with self._lock:
+            entry = self._by_url.get(url) if url else None
+            if entry is None and digest:
+                entry = self._by_hash.get(digest)
+            if entry is None:
+                entry = source.reference("S" + hashlib.sha1((url or digest or str(len(self._entries))).encode("utf-8")).hexdigest()[:6])
+                self._entries.append(entry)
+                self._claims[entry.id] = {}
+                if url:
+                    self._by_url[url] = entry
+                if digest:
+                    self._by_hash[digest] = entry
+            claims = self._claims[entry.id]
+            if owner not in claims or rank < claims[owner][0]:
+                claims[owner] = (rank, claims[owner][1] if owner in claims else len(claims))
+            return entry, self._owner(entry.id) == owner
+
+    def owner(self, entry: SearchResult) -> str:
+        """The sub-topic whose evidence carries `entry` in full."""
+        with self._lock:
+            return self._owner(entry.id)
+
+    def _owner(self, entry_id: str) -> str:
+        claims = self._claims[entry_id]
+        return min(claims, key=lambda owner: (self._order.get(owner, -1), claims[owner][1]))
+
+    def searched(self, owner: str):
+        """Marks `owner`'s claims as complete."""
+        with self._changed:
+            self._searched.add(owner)
+            self._changed.notify_all()
+
+    def _earlier_searched(self, owner: str) -> bool:
+        position = self._order.get(owner, -1)
+        return all(other in self._searched for other, i in self._order.items() if i < position)
+
+    def wait_for_earlier(self, owner: str, timeout: float = None) -> bool:
+        """Blocks until every sub-topic before `owner` in plan order is searched (False on timeout)."""
+        with self._changed:
+            return self._changed.wait_for(lambda: self._earlier_searched(owner), timeout)
+
+    async def await_earlier(self, owner: str, timeout: float = None, poll_interval: float = 0.05) -> bool:
+        """Async variant of `wait_for_earlier` (polls, so no thread is parked on the lock)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if self._earlier_searched(owner):
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(poll_interval)
+
+    def sources(self) -> list:
+        """Every distinct source seen in this run, in plan order of its owner, then rank."""
+        with self._lock:
+            def key(entry):
+                claims = self._claims[entry.id]
+                owner = self._owner(entry.id)
+                return self._order.get(owner, -1), claims[owner][0]
+            return sorted(self._entries, key=key)
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,239 @@
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Span attributes that become metric labels; everything else (sub-topics, queries, ...)
+# stays on the span only so label cardinality remains bounded.
+METRIC_LABELS = ("provider", "skill", "model")
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label key -> [bucket counts..., count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.setdefault(key, [0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(_label_key(labels))
+            return series[-2] if series else 0
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, (('le', str(bound)),))} {count}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {series[-2]}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series[-2]}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series[-1]}")
+        return lines
+
+class MetricsRegistry:
+    """Process-wide metrics, rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, **kwargs)
+            return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._get(Counter, name, help)
+
+    def histogram(self, name: str, help: str, buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+SPAN_SECONDS = metrics.histogram("research_span_duration_seconds", "Duration of traced operations by span name.")
+ERRORS = metrics.counter("research_errors_total", "Traced operations that ended in an error.")
+CACHE_LOOKUPS = metrics.counter("research_cache_lookups_total", "Cache lookups by cache and result (hit/miss).")
+LLM_TOKENS = metrics.counter("research_llm_tokens_total", "Approximate LLM tokens by model and direction (prompt/completion).")
+RETRIES = metrics.counter("research_retries_total", "Extra provider requests by reason (failover/hedge).")
+COALESCED = metrics.counter("research_coalesced_total", "Calls that joined an identical computation already in flight, by operation.")
+
+class Span:
+    """One timed operation. Spans opened while another is current become its children."""
+
+    def __init__(self, name: str, parent: "Span" = None, **attributes):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.status = "ok"
+        self.start_time = time.time()
+        self.duration = None
+        self._start = time.perf_counter()
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def fail(self, error):
+        self.status = "error"
+        self.attributes["error"] = str(error)
+
+    def finish(self):
+        """Records the span's duration in the metrics and the trace log. Idempotent."""
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._start
+        labels = {name: self.attributes[name] for name in METRIC_LABELS if self.attributes.get(name) is not None}
+        SPAN_SECONDS.observe(self.duration, span=self.name, status=self.status, **labels)
+        if self.status == "error":
+            ERRORS.inc(span=self.name, **labels)
+        tracer.record(self)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start_time,
+            "duration_ms": round(self.duration * 1000, 2) if self.duration is not None else None,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+class Tracer:
+    """
+    Keeps the most recent finished spans in memory and, if `path` is set,
+    appends every span to it as a JSON line.
+    """
+
+    def __init__(self, path: str = None, max_spans: int = 2000):
+        self.path = path
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def record(self, span: Span):
+        data = span.to_dict()
+        with self._lock:
+            self._spans.append(data)
+            if self.path:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(data, default=str) + "\n")
+
+    def recent(self, limit: int = 100, trace_id: str = None) -> list:
+        with self._lock:
+            spans = [span for span in self._spans if trace_id is None or span["trace_id"] == trace_id]
+        return spans[-limit:]
+
+tracer = Tracer(path=os.getenv("TRACE_LOG_PATH") or None, max_spans=int(os.getenv("TRACE_BUFFER_SIZE", "2000")))
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+def current_span() -> Span:
+    return _current_span.get()
+
+def start_span(name: str, **attributes) -> Span:
+    """
+    Starts a span under the current one without making it current.
+    For generators and streams, where the span outlives the caller's context; call `finish()`.
+    """
+    return Span(name, parent=_current_span.get(), **attributes)
+
+@contextlib.contextmanager
+def span(name: str, **attributes):
+    """
+    Times the enclosed block as a child of the current span. An exception marks it failed.
+    Worker threads only see the parent if submitted via `contextvars.copy_context().run`.
+    """
+    current = start_span(name, **attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as e:
+        current.fail(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.finish()
+
+def traced(name: str):
+    """Decorator form of `span` for plain and async functions."""
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
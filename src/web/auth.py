@@ -0,0 +1,25 @@
+import hmac
+
+LOOPBACK_HOSTS = ("127.0.0.1", "::1", "localhost")
+# Set by reverse proxies, whose own connections to the server come from loopback
+FORWARDING_HEADERS = ("forwarded", "x-forwarded-for", "x-real-ip")
+
+def admin_denial(headers, client_host: str, token: str = None, require_token: bool = False):
+    """
+    Returns None if a request may use the admin and metrics endpoints, else (status, message).
+
+    With `token` (ADMIN_TOKEN) set, callers need "Authorization: Bearer <token>". Without it,
+    only direct loopback clients are let in: requests relayed by a proxy carry forwarding
+    headers and are refused, and `require_token` endpoints are refused outright.
+    `headers` is looked up with lowercase names.
+    """
+    if token:
+        scheme, _, given = headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(given.strip().encode(), token.encode()):
+            return None
+        return 401, "Admin token required."
+    if require_token:
+        return 403, "Set ADMIN_TOKEN to use this endpoint."
+    if client_host in LOOPBACK_HOSTS and not any(headers.get(name) for name in FORWARDING_HEADERS):
+        return None
+    return 403, "Admin endpoints are only available from localhost unless ADMIN_TOKEN is set."
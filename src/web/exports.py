@@ -0,0 +1,128 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+from src.utils.report_formatter import ReportFormatter
+
+PDF = "pdf"
+DOCX = "docx"
+
+def render_pdf(content: str, title: str) -> bytes:
+    return ReportFormatter().generate_pdf(content, title).getvalue()
+
+def render_docx(content: str, title: str) -> bytes:
+    return ReportFormatter().generate_docx(content).getvalue()
+
+RENDERERS = {PDF: render_pdf, DOCX: render_docx}
+
+def _warm_worker():
+    # Compile the template once per worker, not per request. Best effort: a failing initializer
+    # breaks the whole pool, and DOCX exports don't need the PDF stack at all.
+    try:
+        ReportFormatter.template()
+    except ImportError:
+        pass
+
+class ExportCache:
+    """In-memory LRU of rendered documents, bounded by total size in bytes."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def set(self, key: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+class ExportService:
+    """
+    Renders PDF/DOCX exports in a bounded process pool so CPU-heavy conversions never
+    block the event loop or hold the server's GIL. Finished documents are cached by a hash
+    of their content, and identical exports already in flight share one render. A cached PDF
+    keeps the generation time stamped into it by its first render.
+    """
+
+    def __init__(self, max_workers: int = 2, cache: ExportCache = None, executor: concurrent.futures.Executor = None):
+        self.max_workers = max_workers
+        self.cache = cache or ExportCache()
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def _pool(self) -> concurrent.futures.Executor:
+        # Created on the first export so server start-up stays fast. Workers are spawned rather
+        # than forked from the multi-threaded server process.
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker
+                )
+            return self._executor
+
+    def _reset_pool(self, broken: concurrent.futures.Executor):
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False)
+
+    @staticmethod
+    def key(kind: str, content: str, title: str) -> str:
+        return hashlib.sha256(f"{kind}\0{title}\0{content}".encode("utf-8")).hexdigest()
+
+    async def export(self, kind: str, content: str, title: str = "Research Report") -> bytes:
+        key = self.key(kind, content, title)
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._render(kind, content, title, key))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one client disconnecting doesn't cancel the render others are waiting on
+        return await asyncio.shield(future)
+
+    async def _render(self, kind: str, content: str, title: str, key: str) -> bytes:
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            pool = self._pool()
+            try:
+                data = await loop.run_in_executor(pool, RENDERERS[kind], content, title)
+                break
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory); rebuild the pool and retry once
+                self._reset_pool(pool)
+                if attempt:
+                    raise
+        self.cache.set(key, data)
+        return data
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
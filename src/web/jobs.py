@@ -0,0 +1,209 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from src.agents.summarizer import ERROR_PREFIX
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at its admission limit."""
+
+class JobStore:
+    """
+    SQLite-backed record of every research job, so finished reports survive restarts.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, key TEXT NOT NULL, topic TEXT NOT NULL, custom_prompt TEXT, "
+            "status TEXT NOT NULL, report TEXT, error TEXT, "
+            "created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+        )
+        # Jobs that were queued or running when the previous process died will never finish
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE status IN (?, ?)",
+            (FAILED, "Interrupted by server restart", time.time(), *ACTIVE_STATUSES)
+        )
+        self._conn.commit()
+
+    def insert(self, job: dict):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, key, topic, custom_prompt, status, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job["id"], job["key"], job["topic"], job["custom_prompt"], job["status"], job["created_at"])
+            )
+            self._conn.commit()
+
+    def update(self, job_id: str, **fields):
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+            self._conn.commit()
+
+    def get(self, job_id: str):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class JobManager:
+    """
+    Runs research jobs in the background on a bounded pool.
+
+    At most `max_concurrency` jobs run at once and at most `max_queued` wait for a slot;
+    further submissions are rejected with QueueFullError. Submitting a job identical to
+    one that is still queued or running returns the existing job instead of a duplicate.
+
+    Store reads and writes run on one dedicated thread, in submission order, so SQLite never
+    blocks the event loop and a job's updates land in the order they were made.
+    """
+
+    def __init__(self, orchestrator_factory, store: JobStore, max_concurrency: int = 2, max_queued: int = 20, orchestrator_lease=None):
+        self.orchestrator_factory = orchestrator_factory
+        # Context manager factory that holds the orchestrator for a job's whole run (see OrchestratorRegistry.lease)
+        self.orchestrator_lease = orchestrator_lease or (lambda: contextlib.nullcontext(self.orchestrator_factory()))
+        self.store = store
+        self.max_concurrency = max_concurrency
+        self.max_queued = max_queued
+        self._semaphore = None
+        self._jobs = {}        # job_id -> job dict, for jobs still queued or running
+        self._tasks = {}       # job_id -> asyncio.Task
+        self._in_flight = {}   # dedupe key -> job_id
+        self._store_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-store")
+
+    def _store_call(self, fn, *args, **kwargs):
+        return asyncio.get_running_loop().run_in_executor(self._store_executor, lambda: fn(*args, **kwargs))
+
+    @staticmethod
+    def job_key(topic: str, custom_prompt: str = None) -> str:
+        raw = json.dumps([" ".join(topic.lower().split()), (custom_prompt or "").strip()])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def submit(self, topic: str, custom_prompt: str = None):
+        """
+        Enqueues a research run. Must be called from the event loop.
+        Returns (job, created) where created is False for a deduplicated submission.
+        """
+        key = self.job_key(topic, custom_prompt)
+        existing = self._in_flight.get(key)
+        if existing is not None:
+            return self._public(self._jobs[existing]), False
+
+        queued = sum(1 for job in self._jobs.values() if job["status"] == QUEUED)
+        if queued >= self.max_queued:
+            raise QueueFullError(f"Job queue is full ({queued} waiting). Retry later.")
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "key": key,
+            "topic": topic,
+            "custom_prompt": custom_prompt,
+            "status": QUEUED,
+            "report": None,
+            "error": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        self._store_call(self.store.insert, dict(job))
+        self._jobs[job["id"]] = job
+        self._in_flight[key] = job["id"]
+        task = asyncio.create_task(self._run(job))
+        task.add_done_callback(lambda task, job=job: self._finish(job, task))
+        self._tasks[job["id"]] = task
+        return self._public(job), True
+
+    async def _run(self, job: dict):
+        try:
+            async with self._semaphore:
+                await self._set(job, status=RUNNING, started_at=time.time())
+                with self.orchestrator_lease() as orchestrator:
+                    report = await orchestrator.arun(job["topic"], job["custom_prompt"])
+            if report is None:
+                await self._set(job, status=FAILED, error="Failed to generate a plan.", finished_at=time.time())
+            elif report.startswith(ERROR_PREFIX):
+                # The summarizer reports its failures as text rather than raising
+                await self._set(job, status=FAILED, error=report[len(ERROR_PREFIX):], finished_at=time.time())
+            else:
+                await self._set(job, status=COMPLETED, report=report, finished_at=time.time())
+        except Exception as e:
+            await self._set(job, status=FAILED, error=str(e), finished_at=time.time())
+
+    def _finish(self, job: dict, task: asyncio.Task):
+        # A done callback rather than a `finally`, so jobs cancelled before they ever started are covered too
+        if task.cancelled():
+            self._set(job, status=CANCELLED, finished_at=time.time())
+        self._jobs.pop(job["id"], None)
+        self._tasks.pop(job["id"], None)
+        if self._in_flight.get(job["key"]) == job["id"]:
+            del self._in_flight[job["key"]]
+
+    def _set(self, job: dict, **fields):
+        """Updates the job now and its stored row on the store thread; await the result to wait for the write."""
+        job.update(fields)
+        return self._store_call(self.store.update, job["id"], **fields)
+
+    @staticmethod
+    def _public(job: dict) -> dict:
+        return {name: job[name] for name in ("id", "topic", "status", "error", "created_at", "started_at", "finished_at")}
+
+    def get(self, job_id: str, include_report: bool = False):
+        """Blocking lookup, for use outside the event loop (see `aget`)."""
+        return self._view(self._jobs.get(job_id) or self.store.get(job_id), include_report)
+
+    async def aget(self, job_id: str, include_report: bool = False):
+        """Async variant of `get`: finished jobs are read on the store thread, after any pending writes."""
+        job = self._jobs.get(job_id) or await self._store_call(self.store.get, job_id)
+        return self._view(job, include_report)
+
+    def _view(self, job: dict, include_report: bool):
+        if job is None:
+            return None
+        public = self._public(job)
+        if include_report:
+            public["report"] = job["report"]
+        return public
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancels a queued or running job. Returns False if it is unknown or already finished."""
+        task = self._tasks.get(job_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    async def shutdown(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Let the done callbacks record the cancellations, then wait for every pending write
+        await asyncio.sleep(0)
+        await asyncio.to_thread(self._store_executor.shutdown)
+        self.store.close()
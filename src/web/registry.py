@@ -0,0 +1,133 @@
+import contextlib
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+# Environment variables that change how the orchestrator, its agents or its skills are built
+CONFIG_KEYS = (
+    "GOOGLE_API_KEY",
+    "TAVILY_API_KEY",
+    "SERPER_API_KEY",
+    "SEARCH_CACHE_DISABLED",
+    "SEARCH_HTTP_POOL_SIZE",
+    "SEARCH_HTTP_TIMEOUT",
+    "RESEARCH_CONCURRENCY",
+    "HEDGED_SEARCH_WORKERS",
+    "SEMANTIC_REUSE",
+    "RESEARCH_BATCH_ANALYSIS",
+    "RESEARCH_ANALYSIS_CONCURRENCY",
+    "PAGE_FETCH_COUNT",
+    "PAGE_FETCH_MAX_KB",
+    "PAGE_FETCH_TIMEOUT",
+    "PAGE_FETCH_MAX_CHARS",
+)
+
+class OrchestratorRegistry:
+    """
+    Application-scoped holder for a single orchestrator shared by all requests.
+
+    The orchestrator (and with it the LLM clients, skills and their connection pools)
+    is built once and reused. It is rebuilt transparently when the relevant
+    configuration changes, either in the process environment or in the .env file
+    (checked at most every `env_check_interval` seconds, and on `reload`).
+    Requests hold the orchestrator through `lease`; a replaced orchestrator is closed
+    as soon as its last lease ends.
+
+    The search and LLM caches are process-wide and not rebuilt; changing their
+    settings needs a restart.
+    """
+
+    def __init__(self, factory, env_file: str = None, env_check_interval: float = 5.0):
+        self.factory = factory
+        self.env_file = env_file
+        self.env_check_interval = env_check_interval
+        self._lock = threading.Lock()
+        self._instance = None
+        self._fingerprint = None
+        self._leases = {}       # instance -> open leases
+        self._retired = set()   # replaced instances that are still leased
+        self._env_mtime = self._env_file_mtime()
+        self._env_checked_at = time.monotonic()
+
+    def _env_file_mtime(self):
+        try:
+            return os.stat(self.env_file).st_mtime if self.env_file else None
+        except OSError:
+            return None
+
+    def _current_fingerprint(self, force: bool = False):
+        now = time.monotonic()
+        if force or now - self._env_checked_at >= self.env_check_interval:
+            self._env_checked_at = now
+            mtime = self._env_file_mtime()
+            if force or mtime != self._env_mtime:
+                # .env was edited: pick up the new values before comparing
+                self._env_mtime = mtime
+                if mtime is not None:
+                    load_dotenv(self.env_file, override=True)
+        return tuple(os.getenv(key) for key in CONFIG_KEYS)
+
+    def _replace(self, fingerprint):
+        # Caller holds the lock
+        print("🔧 Building orchestrator...")
+        previous = self._instance
+        self._instance = self.factory()
+        self._fingerprint = fingerprint
+        if previous is not None:
+            if self._leases.get(previous):
+                self._retired.add(previous)
+            else:
+                previous.close()
+
+    def get(self):
+        """
+        Returns the shared orchestrator, rebuilding it first if the configuration changed.
+        Prefer `lease` for anything that outlives the call, so a rebuild can't close it midway.
+        """
+        fingerprint = self._current_fingerprint()
+        instance = self._instance
+        if instance is not None and fingerprint == self._fingerprint:
+            return instance
+
+        with self._lock:
+            if self._instance is None or fingerprint != self._fingerprint:
+                self._replace(fingerprint)
+            return self._instance
+
+    @contextlib.contextmanager
+    def lease(self):
+        """Yields the current orchestrator and keeps it open until the block exits."""
+        while True:
+            instance = self.get()
+            with self._lock:
+                # Rebuilt between `get` and here: the old one may already be closed
+                if instance is self._instance:
+                    self._leases[instance] = self._leases.get(instance, 0) + 1
+                    break
+        try:
+            yield instance
+        finally:
+            with self._lock:
+                self._leases[instance] -= 1
+                if not self._leases[instance]:
+                    del self._leases[instance]
+                    if instance in self._retired:
+                        self._retired.discard(instance)
+                        instance.close()
+
+    def close(self):
+        """Releases every orchestrator's connection pools (called on server shutdown)."""
+        with self._lock:
+            for instance in self._retired:
+                instance.close()
+            self._retired.clear()
+            if self._instance is not None:
+                self._instance.close()
+                self._instance = None
+
+    def reload(self):
+        """Re-reads .env and forces a rebuild (e.g. after rotating API keys)."""
+        with self._lock:
+            self._replace(self._current_fingerprint(force=True))
+            return self._instance
@@ -1,25 +1,52 @@
-from fastapi import FastAPI, UploadFile, BackgroundTasks
+from fastapi import FastAPI, UploadFile, BackgroundTasks, Request
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 import os
 import sys
-import markdown
-from xhtml2pdf import pisa
-from docx import Document
-from io import BytesIO
-from fastapi.responses import FileResponse, StreamingResponse
+import json
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
+from contextlib import asynccontextmanager
 
 # Add project root to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PROJECT_ROOT)
 
-from src.orchestrator import Orchestrator
+from src.orchestrator import AsyncOrchestrator
 from dotenv import load_dotenv
-from src.utils.report_formatter import ReportFormatter
+from src.web.auth import admin_denial
+from src.web.exports import DOCX, PDF, ExportCache, ExportService
+from src.web.jobs import JobManager, JobStore, QueueFullError
+from src.web.registry import OrchestratorRegistry
+from src.utils.sources import SearchResult
+from src.utils.telemetry import metrics, tracer
 
 # Load env variables
 load_dotenv()
 
-app = FastAPI(title="Multi-Agent Researcher API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One orchestrator (LLM clients, skills, connection pools) shared by every request
+    app.state.registry = OrchestratorRegistry(AsyncOrchestrator, env_file=os.path.join(PROJECT_ROOT, ".env"))
+    if os.getenv("GOOGLE_API_KEY"):
+        app.state.registry.get()
+    app.state.jobs = JobManager(
+        app.state.registry.get,
+        JobStore(os.getenv("JOB_STORE_PATH", os.path.join(".cache", "jobs.sqlite"))),
+        max_concurrency=int(os.getenv("JOB_CONCURRENCY", "2")),
+        max_queued=int(os.getenv("JOB_QUEUE_LIMIT", "20")),
+        orchestrator_lease=app.state.registry.lease
+    )
+    # PDF/DOCX rendering runs in worker processes, started on the first export
+    app.state.exports = ExportService(
+        max_workers=int(os.getenv("EXPORT_WORKERS", "2")),
+        cache=ExportCache(max_bytes=int(os.getenv("EXPORT_CACHE_MB", "64")) * 1024 * 1024)
+    )
+    yield
+    await app.state.jobs.shutdown()
+    app.state.exports.close()
+    app.state.registry.close()
+
+app = FastAPI(title="Multi-Agent Researcher API", lifespan=lifespan)
 
 # Mount static files
 # Mount static files
@@ -43,17 +70,88 @@ async def conduct_research(request: ResearchRequest):
 
     topic = request.topic
     custom_prompt = request.custom_prompt
-    orchestrator = Orchestrator()
     
-    # Run research (synchronously for now, but could be async or background task)
-    # Since orchestrator.run is blocking and time-consuming, ideally we'd use background tasks
-    # or a proper job queue. For simplicity here, we'll wait.
+    # The whole run is awaited on the event loop, so other requests keep being served.
+    # Clients that can't hold a connection open this long should use /api/jobs instead.
     try:
-        report = orchestrator.run(topic, custom_prompt)
+        with app.state.registry.lease() as orchestrator:
+            report = await orchestrator.arun(topic, custom_prompt)
         return {"report": report}
     except Exception as e:
         return {"error": str(e)}
 
+# --- Background Job Endpoints ---
+
+@app.post("/api/jobs", status_code=202)
+async def submit_job(request: ResearchRequest):
+    """
+    Queues a full research run and returns its job ID immediately.
+    Resubmitting a topic that is still queued or running returns the existing job.
+    """
+    if not os.getenv("GOOGLE_API_KEY"):
+        return JSONResponse({"error": "GOOGLE_API_KEY not found. Please set it in .env file."}, status_code=500)
+
+    try:
+        job, created = app.state.jobs.submit(request.topic, request.custom_prompt)
+    except QueueFullError as e:
+        return JSONResponse({"error": str(e)}, status_code=429, headers={"Retry-After": "30"})
+    return {"job": job, "deduplicated": not created}
+
+@app.get("/api/jobs/{job_id}")
+async def job_status(job_id: str):
+    job = await app.state.jobs.aget(job_id)
+    if job is None:
+        return JSONResponse({"error": "Job not found."}, status_code=404)
+    return {"job": job}
+
+@app.get("/api/jobs/{job_id}/result")
+async def job_result(job_id: str):
+    job = await app.state.jobs.aget(job_id, include_report=True)
+    if job is None:
+        return JSONResponse({"error": "Job not found."}, status_code=404)
+    if job["status"] != "completed":
+        return JSONResponse({"job": job}, status_code=202 if job["status"] in ("queued", "running") else 409)
+    return {"report": job["report"], "job": job}
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    if not app.state.jobs.cancel(job_id):
+        return JSONResponse({"error": "Job not found or already finished."}, status_code=404)
+    return {"cancelled": job_id}
+
+def _admin_denied(request: Request, require_token: bool = False):
+    """None if `request` may use the admin and metrics endpoints, else the error response (see `admin_denial`)."""
+    denial = admin_denial(request.headers, request.client.host if request.client else "", os.getenv("ADMIN_TOKEN"), require_token)
+    if denial is None:
+        return None
+    status, message = denial
+    return JSONResponse({"error": message}, status_code=status, headers={"WWW-Authenticate": "Bearer"} if status == 401 else None)
+
+@app.post("/api/admin/reload")
+async def reload_orchestrator(request: Request):
+    """Rebuilds the shared orchestrator, e.g. after rotating API keys. Always needs ADMIN_TOKEN."""
+    if (denied := _admin_denied(request, require_token=True)) is not None:
+        return denied
+    try:
+        app.state.registry.reload()
+        return {"reloaded": True}
+    except Exception as e:
+        return {"error": str(e)}
+
+@app.get("/metrics")
+async def prometheus_metrics(request: Request):
+    """Span latencies, cache hits, token usage, errors and retries in Prometheus text format."""
+    if (denied := _admin_denied(request)) is not None:
+        return denied
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/admin/traces")
+async def recent_traces(request: Request, limit: int = 100, trace_id: str = None):
+    """Most recent finished spans, optionally for a single trace."""
+    if (denied := _admin_denied(request)) is not None:
+        return denied
+    return {"spans": tracer.recent(limit, trace_id)}
+
 # --- Multi-Stage Workflow Endpoints ---
 
 class PlanRequest(BaseModel):
@@ -66,12 +164,15 @@ class SubTopicInstruction(BaseModel):
 
 class ResearchPhaseRequest(BaseModel):
     sub_topics: list[SubTopicInstruction] = []
+    # Returned by a previous /api/research_phase call; unchanged sub-topics are then reused
+    session_id: str = None
 
 class SummarizeRequest(BaseModel):
     topic: str
     research_findings: dict
     sources: list = []
     custom_prompt: str = None
+    session_id: str = None
 
 @app.post("/api/plan")
 async def plan_research(request: PlanRequest):
@@ -79,9 +180,9 @@ async def plan_research(request: PlanRequest):
     if not os.getenv("GOOGLE_API_KEY"):
          return {"error": "GOOGLE_API_KEY not found."}
     
-    orchestrator = Orchestrator()
     try:
-        sub_topics = orchestrator.plan_research(request.topic, request.custom_prompt)
+        with app.state.registry.lease() as orchestrator:
+            sub_topics = await orchestrator.aplan_research(request.topic, request.custom_prompt)
         return {"sub_topics": sub_topics}
     except Exception as e:
         return {"error": str(e)}
@@ -89,13 +190,15 @@ async def plan_research(request: PlanRequest):
 @app.post("/api/research_phase")
 async def execute_research(request: ResearchPhaseRequest):
     """Stage 2: Execute research on confirmed sub-topics"""
-    orchestrator = Orchestrator()
     try:
-        findings, sources = orchestrator.execute_research(request.sub_topics)
+        with app.state.registry.lease() as orchestrator:
+            session_id = request.session_id or orchestrator.sessions.new_id()
+            findings, sources = await orchestrator.aexecute_research(request.sub_topics, session_id=session_id)
         # Return structured findings for frontend editing
         return {
             "findings": findings, 
-            "sources": sources
+            "sources": [source.to_dict() for source in sources],
+            "session_id": session_id
         }
     except Exception as e:
         return {"error": str(e)}
@@ -103,24 +206,76 @@ async def execute_research(request: ResearchPhaseRequest):
 @app.post("/api/summarize")
 async def generate_summary(request: SummarizeRequest):
     """Stage 3: Generate final report from confirmed findings"""
-    orchestrator = Orchestrator()
     try:
-        report = orchestrator.generate_summary(request.topic, request.research_findings, request.sources, custom_prompt=request.custom_prompt)
+        with app.state.registry.lease() as orchestrator:
+            report = await orchestrator.agenerate_summary(request.topic, request.research_findings, request.sources, custom_prompt=request.custom_prompt, session_id=request.session_id)
         return {"report": report}
     except Exception as e:
         return {"error": str(e)}
 
+# --- Streaming Endpoints (Server-Sent Events) ---
+
+def _encode(value):
+    if isinstance(value, SearchResult):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+async def _sse(events, request: Request):
+    """
+    Encodes orchestrator events as SSE frames. Stops (and thereby cancels the
+    underlying run) as soon as the client disconnects.
+    """
+    try:
+        async for event in events:
+            if await request.is_disconnected():
+                break
+            # Findings and research_done events carry SearchResult objects
+            yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False, default=_encode)}\n\n"
+    except Exception as e:
+        yield f"event: error\ndata: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+    finally:
+        await events.aclose()
+
+async def _leased_sse(stream, request: Request):
+    """`_sse` over `stream(orchestrator)`, holding the shared orchestrator until the stream ends."""
+    with app.state.registry.lease() as orchestrator:
+        async for frame in _sse(stream(orchestrator), request):
+            yield frame
+
+@app.post("/api/research/stream")
+async def stream_research(body: ResearchRequest, request: Request):
+    """
+    Streams a full research run: plan_ready, per-skill progress, per-sub-topic findings,
+    summarizer tokens and a final `done` event with the report.
+    """
+    if not os.getenv("GOOGLE_API_KEY"):
+        return {"error": "GOOGLE_API_KEY not found. Please set it in .env file."}
+
+    return StreamingResponse(
+        _leased_sse(lambda orchestrator: orchestrator.astream_run(body.topic, body.custom_prompt), request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/research_phase/stream")
+async def stream_research_phase(body: ResearchPhaseRequest, request: Request):
+    """Streams Stage 2 progress, ending with a `research_done` event that carries the `session_id`."""
+    return StreamingResponse(
+        _leased_sse(lambda orchestrator: orchestrator.astream_research(body.sub_topics, session_id=body.session_id or orchestrator.sessions.new_id()), request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 class ExportRequest(BaseModel):
     content: str
 
+# Rendered documents are already in memory (and cached), so they go out as one body with a Content-Length
 @app.post("/api/export/pdf")
 async def export_pdf(request: ExportRequest):
     try:
-        formatter = ReportFormatter()
-        pdf_buffer = formatter.generate_pdf(request.content)
-        
-        return StreamingResponse(
-            pdf_buffer, 
+        data = await app.state.exports.export(PDF, request.content)
+        return Response(
+            content=data,
             media_type="application/pdf",
             headers={"Content-Disposition": "attachment; filename=report.pdf"}
         )
@@ -129,40 +284,15 @@ async def export_pdf(request: ExportRequest):
 
 @app.post("/api/export/docx")
 async def export_docx(request: ExportRequest):
-    document = Document()
-    
-    # Simple conversion: Split by lines and add paragraphs
-    # For a robust solution, we'd parse the markdown properly. 
-    # Here we'll do a basic pass:
-    # - Lines starting with # become Heading 1
-    # - Lines starting with ## become Heading 2
-    # - Others are paragraphs
-    
-    for line in request.content.split('\n'):
-        line = line.strip()
-        if not line:
-            continue
-            
-        if line.startswith('# '):
-            document.add_heading(line[2:], level=1)
-        elif line.startswith('## '):
-            document.add_heading(line[3:], level=2)
-        elif line.startswith('### '):
-            document.add_heading(line[4:], level=3)
-        elif line.startswith('- ') or line.startswith('* '):
-             document.add_paragraph(line[2:], style='List Bullet')
-        else:
-            document.add_paragraph(line)
-            
-    buffer = BytesIO()
-    document.save(buffer)
-    buffer.seek(0)
-    
-    return StreamingResponse(
-        buffer,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        headers={"Content-Disposition": "attachment; filename=report.docx"}
-    )
+    try:
+        data = await app.state.exports.export(DOCX, request.content)
+        return Response(
+            content=data,
+            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            headers={"Content-Disposition": "attachment; filename=report.docx"}
+        )
+    except Exception as e:
+        return {"error": str(e)}
 
 if __name__ == "__main__":
     import uvicorn
@@ -14,7 +14,8 @@ const state = {
     customPrompt: '',
     subTopics: [],
     researchFindings: {},
-    sources: []
+    sources: [],
+    sessionId: null
 };
 
 // DOM Elements
@@ -69,6 +70,7 @@ async function startPlanning() {
     if (!topic) return;
 
     state.currentTopic = topic;
+    state.sessionId = null;
     state.customPrompt = customPrompt;
 
     switchView('status');
@@ -166,7 +168,7 @@ async function startResearchPhase() {
         const response = await fetch('/api/research_phase', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ sub_topics: items })
+            body: JSON.stringify({ sub_topics: items, session_id: state.sessionId })
         });
 
         const data = await response.json();
@@ -174,6 +176,7 @@ async function startResearchPhase() {
 
         state.researchFindings = data.findings;
         state.sources = data.sources;
+        state.sessionId = data.session_id;
 
         // Hide agents when done
         views.agentGrid.classList.add('hidden');
@@ -219,7 +222,8 @@ async function startSummarization() {
                 topic: state.currentTopic,
                 research_findings: state.researchFindings,
                 sources: state.sources,
-                custom_prompt: state.customPrompt
+                custom_prompt: state.customPrompt,
+                session_id: state.sessionId
             })
         });
 
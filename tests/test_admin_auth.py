@@ -0,0 +1,60 @@
+import unittest
+import importlib.util
+import sys
+import os
+from unittest.mock import MagicMock, patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.web.auth import admin_denial
+
+class TestAdminDenial(unittest.TestCase):
+    def test_loopback_without_token(self):
+        self.assertIsNone(admin_denial({}, "127.0.0.1"))
+        self.assertEqual(admin_denial({}, "203.0.113.7")[0], 403)
+
+    def test_proxied_requests_do_not_count_as_localhost(self):
+        for header in ("x-forwarded-for", "forwarded", "x-real-ip"):
+            self.assertEqual(admin_denial({header: "203.0.113.7"}, "127.0.0.1")[0], 403)
+
+    def test_reload_needs_a_token(self):
+        self.assertEqual(admin_denial({}, "127.0.0.1", require_token=True)[0], 403)
+        self.assertIsNone(admin_denial({"authorization": "Bearer s3cret"}, "203.0.113.7", "s3cret", require_token=True))
+
+    def test_token_is_checked(self):
+        self.assertEqual(admin_denial({"authorization": "Bearer wrong"}, "127.0.0.1", "s3cret")[0], 401)
+        self.assertEqual(admin_denial({}, "127.0.0.1", "s3cret")[0], 401)
+        self.assertIsNone(admin_denial({"authorization": "bearer s3cret"}, "203.0.113.7", "s3cret"))
+
+@unittest.skipUnless(
+    importlib.util.find_spec("fastapi") and importlib.util.find_spec("httpx"),
+    "fastapi and httpx not installed"
+)
+class TestAdminEndpoints(unittest.TestCase):
+    def setUp(self):
+        from fastapi.testclient import TestClient
+
+        # The app mounts the built frontend, which may not exist; only API routes are exercised here
+        with patch("fastapi.staticfiles.StaticFiles", lambda **kwargs: MagicMock()):
+            from src.web import server
+        self.server = server
+        self.server.app.state.registry = MagicMock()
+        self.client = TestClient(server.app, client=("127.0.0.1", 50000))
+
+    def test_metrics_from_localhost_and_behind_a_proxy(self):
+        with patch.dict(os.environ, {"ADMIN_TOKEN": ""}):
+            self.assertEqual(self.client.get("/metrics").status_code, 200)
+            self.assertEqual(self.client.get("/metrics", headers={"X-Forwarded-For": "203.0.113.7"}).status_code, 403)
+            self.assertEqual(self.client.post("/api/admin/reload").status_code, 403)
+        self.server.app.state.registry.reload.assert_not_called()
+
+    def test_reload_with_token(self):
+        with patch.dict(os.environ, {"ADMIN_TOKEN": "s3cret"}):
+            self.assertEqual(self.client.post("/api/admin/reload").status_code, 401)
+            response = self.client.post("/api/admin/reload", headers={"Authorization": "Bearer s3cret"})
+        self.assertEqual(response.json(), {"reloaded": True})
+        self.server.app.state.registry.reload.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
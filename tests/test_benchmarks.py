@@ -0,0 +1,54 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Mock external dependencies to allow implementation-agnostic testing
+sys.modules['ddgs'] = MagicMock()
+
+from benchmarks.replay import LatencyModel, ReplaySkill, load_fixture, replay_skills
+from benchmarks.run import _flatten, _stats
+from src.skills.hedged import HedgedSearchSkill
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.fixture = load_fixture("default")
+
+    def test_latency_model_is_reproducible(self):
+        first = [LatencyModel(1000, sigma=0.5, seed=7).sample() for _ in range(3)]
+        second = [LatencyModel(1000, sigma=0.5, seed=7).sample() for _ in range(3)]
+        self.assertEqual(first, second)
+        self.assertEqual(LatencyModel(1000, scale=0.1).sample(), 0.1)
+
+    def test_replay_skill_matches_search_skill_shape(self):
+        spec = dict(self.fixture["providers"]["wikipedia"], error_rate=0.0)
+        skill = ReplaySkill("wikipedia", spec, "body", scale=0)
+        result = skill.execute("Solid-state batteries")
+
+        self.assertEqual(len(result["results"]), spec["results"])
+        self.assertEqual(result["results"][0].provider, "Wikipedia")
+        self.assertTrue(result["results"][0].render().startswith("[Wikipedia] Source: Solid-state batteries (1)\nURL: "))
+
+    def test_replay_skill_simulates_failures(self):
+        spec = dict(self.fixture["providers"]["arxiv"], error_rate=1.0)
+        self.assertIn("error", ReplaySkill("arxiv", spec, "body", scale=0).execute("q"))
+
+    def test_replay_skills_mirror_orchestrator_stack(self):
+        skills = replay_skills(self.fixture, scale=0, max_concurrency=3)
+        self.assertIsInstance(skills[0], HedgedSearchSkill)
+        # Sized like the orchestrator's: every researched sub-topic may have all web providers in flight
+        self.assertEqual(skills[0]._executor._max_workers, 3 * len(skills[0].skills))
+        self.assertEqual([skill.provider for skill in skills[1:]], ["wikipedia", "arxiv"])
+
+class TestResults(unittest.TestCase):
+    def test_stats_and_flatten(self):
+        stats = _stats([0.1, 0.2, 0.3])
+        self.assertEqual(stats["n"], 3)
+        self.assertEqual(stats["p50_ms"], 200.0)
+        self.assertEqual(_flatten({"phases": {"plan": stats}, "meta": "x"})["phases.plan.max_ms"], 300.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Mock external dependencies pulled in by the skills package
+sys.modules['ddgs'] = MagicMock()
+
+from src.utils.cache import TTLCache
+from src.skills.base import BaseSkill
+from src.skills.cache import CachedSkill
+from src.utils.llm_cache import LLMCache
+from src.utils.sources import SearchResult
+
+class CountingSkill(BaseSkill):
+    name = "Counting Search"
+
+    def __init__(self):
+        self.calls = 0
+
+    def execute(self, query, **kwargs):
+        self.calls += 1
+        if query == "broken":
+            return {"error": "provider down"}
+        return {"content": f"result for {query}", "sources": []}
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_hit_miss_and_expiry(self):
+        cache = TTLCache(path=self.path)
+        self.assertIsNone(cache.get("k"))
+        cache.set("k", {"v": 1}, ttl=0.05)
+        self.assertEqual(cache.get("k"), {"v": 1})
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("k"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 2)
+        cache.close()
+
+    def test_disk_tier_survives_new_instance(self):
+        cache = TTLCache(path=self.path)
+        cache.set("k", ["persisted"], ttl=60)
+        cache.close()
+
+        reopened = TTLCache(path=self.path)
+        self.assertEqual(reopened.get("k"), ["persisted"])
+        self.assertEqual(reopened.stats()["disk_hits"], 1)
+        reopened.close()
+
+    def test_memory_lru_eviction(self):
+        cache = TTLCache(max_memory_entries=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+        cache.set("c", 3, ttl=60)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_disk_size_eviction_drops_oldest(self):
+        # Each payload serializes to 12 bytes, so only two fit under the cap
+        cache = TTLCache(path=self.path, max_memory_entries=0, max_disk_bytes=30)
+        cache.set("a", "x" * 10, ttl=60)
+        cache.set("b", "y" * 10, ttl=60)
+        cache.set("c", "z" * 10, ttl=60)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), "y" * 10)
+        self.assertEqual(cache.get("c"), "z" * 10)
+        cache.close()
+
+    def test_disk_maintenance_is_amortized(self):
+        cache = TTLCache(path=self.path, max_memory_entries=0, evict_every=3, touch_batch=2)
+        cache.set("old", 1, ttl=0.01)
+        time.sleep(0.02)
+        cache.set("a", 2, ttl=60)
+        peek = lambda sql: sqlite3.connect(self.path).execute(sql).fetchall()
+        # The expired row waits for the sweep on the third write
+        self.assertEqual(len(peek("SELECT key FROM cache")), 2)
+        cache.set("b", 3, ttl=60)
+        self.assertEqual(sorted(row[0] for row in peek("SELECT key FROM cache")), ["a", "b"])
+
+        before = dict(peek("SELECT key, accessed_at FROM cache"))
+        self.assertEqual(cache.get("a"), 2)
+        self.assertEqual(dict(peek("SELECT key, accessed_at FROM cache")), before)
+        self.assertEqual(asyncio.run(cache.aget("b")), 3)
+        self.assertGreater(dict(peek("SELECT key, accessed_at FROM cache"))["a"], before["a"])
+        cache.close()
+
+class TestCachedSkill(unittest.TestCase):
+    def test_normalized_queries_share_an_entry_and_errors_are_not_cached(self):
+        skill = CountingSkill()
+        cached = CachedSkill(skill, cache=TTLCache())
+
+        cached.execute("AI in  Radiology")
+        cached.execute("ai in radiology")
+        self.assertEqual(skill.calls, 1)
+
+        cached.execute("broken")
+        cached.execute("broken")
+        self.assertEqual(skill.calls, 3)
+
+    def test_search_results_round_trip_through_the_disk_tier(self):
+        class ResultSkill(BaseSkill):
+            name = "Result Search"
+
+            def execute(self, query, **kwargs):
+                return {"results": [SearchResult("A", "https://example.com/a", f"about {query}", "Tavily", 0.5)]}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cache.sqlite")
+            cache = TTLCache(path=path)
+            CachedSkill(ResultSkill(), cache=cache).execute("AI")
+            cache.close()
+
+            reopened = TTLCache(path=path)
+            hit = CachedSkill(ResultSkill(), cache=reopened).execute("AI")["results"][0]
+            self.assertIsInstance(hit, SearchResult)
+            self.assertEqual((hit.title, hit.snippet, hit.provider, hit.score), ("A", "about AI", "Tavily", 0.5))
+            self.assertEqual(reopened.stats()["disk_hits"], 1)
+            reopened.close()
+
+class TestLLMCache(unittest.TestCase):
+    def setUp(self):
+        self.prompt = MagicMock()
+        self.prompt.format_messages.side_effect = lambda **inputs: [MagicMock(type="human", content=f"Topic: {inputs['topic']}")]
+        self.chain = MagicMock()
+        self.chain.invoke.side_effect = lambda inputs: MagicMock(content=f"answer about {inputs['topic']}")
+
+    def test_identical_inputs_hit_the_cache(self):
+        cache = LLMCache(TTLCache())
+        extract = lambda response: response.content
+
+        first = cache.invoke(self.chain, self.prompt, "model-a", {"topic": "AI"}, extract=extract)
+        second = cache.invoke(self.chain, self.prompt, "model-a", {"topic": "AI"}, extract=extract)
+        cache.invoke(self.chain, self.prompt, "model-b", {"topic": "AI"}, extract=extract)
+
+        self.assertEqual(first, "answer about AI")
+        self.assertEqual(second, first)
+        self.assertEqual(self.chain.invoke.call_count, 2)
+
+    def test_bypass_skips_the_cache(self):
+        cache = LLMCache(TTLCache())
+        cache.invoke(self.chain, self.prompt, "model-a", {"topic": "AI"}, extract=lambda r: r.content)
+        cache.invoke(self.chain, self.prompt, "model-a", {"topic": "AI"}, extract=lambda r: r.content, use_cache=False)
+        self.assertEqual(self.chain.invoke.call_count, 2)
+
+    def test_async_calls_keep_disk_access_off_the_event_loop(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            disk = TTLCache(path=os.path.join(tmpdir, "llm.sqlite"), max_memory_entries=0)
+            cache = LLMCache(disk)
+            threads = []
+            get, set_ = disk.get, disk.set
+            disk.get = lambda *args, **kwargs: threads.append(threading.current_thread()) or get(*args, **kwargs)
+            disk.set = lambda *args, **kwargs: threads.append(threading.current_thread()) or set_(*args, **kwargs)
+
+            async def ainvoke(inputs):
+                return MagicMock(content=f"answer about {inputs['topic']}")
+            self.chain.ainvoke.side_effect = ainvoke
+
+            async def main():
+                first = await cache.ainvoke(self.chain, self.prompt, "model-a", {"topic": "AI"}, extract=lambda r: r.content)
+                second = await cache.ainvoke(self.chain, self.prompt, "model-a", {"topic": "AI"}, extract=lambda r: r.content)
+                return first, second, threading.current_thread()
+
+            first, second, loop_thread = asyncio.run(main())
+            self.assertEqual(first, second)
+            self.assertEqual(self.chain.ainvoke.call_count, 1)
+            self.assertEqual(len(threads), 3)
+            self.assertNotIn(loop_thread, threads)
+            disk.close()
+
+    def test_batch_only_calls_uncached_inputs(self):
+        cache = LLMCache(TTLCache())
+        extract = lambda response: response.content
+        cache.invoke(self.chain, self.prompt, "model-a", {"topic": "AI"}, extract=extract)
+
+        def batch(inputs, config=None, return_exceptions=False):
+            return [RuntimeError("quota") if item["topic"] == "Bad" else self.chain.invoke(item) for item in inputs]
+        self.chain.batch.side_effect = batch
+
+        inputs = [{"topic": "AI"}, {"topic": "ML"}, {"topic": "Bad"}]
+        results = cache.batch(self.chain, self.prompt, "model-a", inputs, extract=extract, max_concurrency=2)
+
+        self.assertEqual(results[:2], ["answer about AI", "answer about ML"])
+        self.assertIsInstance(results[2], RuntimeError)
+        self.assertEqual(self.chain.batch.call_args.args[0], inputs[1:])
+        self.assertEqual(self.chain.batch.call_args.kwargs["config"], {"max_concurrency": 2})
+        # The successful item is cached, the failed one is not
+        self.assertEqual(cache.invoke(self.chain, self.prompt, "model-a", {"topic": "ML"}, extract=extract), "answer about ML")
+        self.assertEqual(self.chain.invoke.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
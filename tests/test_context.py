@@ -0,0 +1,46 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.context import ContextPacker, count_tokens
+
+class TestContextPacker(unittest.TestCase):
+    def test_near_duplicates_are_removed(self):
+        body = "Content: Deep learning models now match radiologists at detecting lung nodules on CT scans, a 2024 study reports."
+        chunk = "[Tavily] Source: AI in radiology\nURL: http://example.com/ai\n" + body
+        packer = ContextPacker(max_tokens=1000)
+        selected = packer.select([chunk, chunk.replace("[Tavily]", "[DuckDuckGo]"), "Unrelated text about gardening tools."], "radiology")
+        self.assertEqual(len(selected), 2)
+        self.assertEqual(selected[0], chunk)
+
+    def test_budget_keeps_most_relevant_chunks_in_original_order(self):
+        chunks = [
+            "Gardening tips for spring tomatoes and peppers in small raised beds.",
+            "AI radiology tools flag fractures on X-ray images within seconds.",
+            "Cooking pasta requires salted boiling water and a large pot.",
+            "Radiology departments adopt AI triage to prioritise urgent scans.",
+        ]
+        packer = ContextPacker(max_tokens=25, min_fragment_tokens=100)
+        selected = packer.select(chunks, "AI radiology")
+        self.assertEqual(selected, [chunks[1], chunks[3]])
+        self.assertLessEqual(sum(count_tokens(chunk) for chunk in selected), 25)
+
+    def test_sections_share_budget_without_dropping_any(self):
+        sections = {
+            "Short": "A brief finding.",
+            "Long A": "\n\n".join(f"Paragraph {i} about diagnostic imaging accuracy and workflow." for i in range(50)),
+            "Long B": "\n\n".join(f"Item {i} about regulation of medical AI devices in Europe." for i in range(50)),
+        }
+        packer = ContextPacker(max_tokens=200)
+        packed = packer.pack_sections(sections, "medical AI")
+
+        self.assertEqual(list(packed), ["Short", "Long A", "Long B"])
+        self.assertEqual(packed["Short"], "A brief finding.")
+        self.assertTrue(packed["Long A"] and packed["Long B"])
+        self.assertLessEqual(sum(count_tokens(text) for text in packed.values()), 200 + 10)
+
+if __name__ == '__main__':
+    unittest.main()
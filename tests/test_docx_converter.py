@@ -0,0 +1,82 @@
+import unittest
+import importlib.util
+import sys
+import os
+from io import BytesIO
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.docx_converter import MarkdownDocxConverter
+from src.utils.report_formatter import MARKDOWN_EXTENSIONS
+
+REPORT = """# Report
+
+Intro with **bold**, *italic*, `code` and a [link](https://example.org/a?b=1&c=2).
+
+## Findings
+
+1. First item
+    - nested bullet
+        - deeper
+2. Second item
+
+> A quote
+
+| Name | Score |
+|:-----|------:|
+| **A** | 1 |
+
+```python
+if a < b:
+    print("x")
+```
+
+---
+"""
+
+@unittest.skipUnless(
+    importlib.util.find_spec("docx") and importlib.util.find_spec("markdown"),
+    "python-docx and markdown not installed"
+)
+class TestMarkdownDocxConverter(unittest.TestCase):
+    def setUp(self):
+        from docx import Document
+
+        buffer = BytesIO()
+        MarkdownDocxConverter(MARKDOWN_EXTENSIONS).write(REPORT, buffer)
+        buffer.seek(0)
+        self.document = Document(buffer)
+        self.paragraphs = [(p.style.name, p.text) for p in self.document.paragraphs]
+
+    def test_block_structure(self):
+        self.assertEqual(self.paragraphs[0], ("Heading 1", "Report"))
+        self.assertIn(("Heading 2", "Findings"), self.paragraphs)
+        self.assertIn(("List Number", "First item"), self.paragraphs)
+        self.assertIn(("List Bullet 2", "nested bullet"), self.paragraphs)
+        self.assertIn(("List Bullet 3", "deeper"), self.paragraphs)
+        self.assertIn(("Quote", "A quote"), self.paragraphs)
+
+    def test_inline_formatting_and_links(self):
+        intro = self.document.paragraphs[1]
+        runs = {run.text: run for run in intro.runs}
+        self.assertTrue(runs["bold"].bold)
+        self.assertTrue(runs["italic"].italic)
+        self.assertEqual(runs["code"].font.name, "Courier New")
+
+        links = [rel.target_ref for rel in self.document.part.rels.values() if rel.is_external]
+        self.assertEqual(links, ["https://example.org/a?b=1&c=2"])
+        self.assertIn("link", intro.text)
+
+    def test_tables_and_code(self):
+        table = self.document.tables[0]
+        self.assertEqual([[cell.text for cell in row.cells] for row in table.rows], [["Name", "Score"], ["A", "1"]])
+        self.assertTrue(table.rows[0].cells[0].paragraphs[0].runs[0].bold)
+        self.assertIn(("Normal", 'if a < b:\n    print("x")'), self.paragraphs)
+
+    def test_section_properties_stay_last(self):
+        body = self.document.element.body
+        self.assertTrue(body[-1].tag.endswith("sectPr"))
+
+if __name__ == '__main__':
+    unittest.main()
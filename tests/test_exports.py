@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import concurrent.futures
+import sys
+import os
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concurrent.futures.process import BrokenProcessPool
+from src.web.exports import DOCX, PDF, ExportCache, ExportService, _warm_worker
+
+class TestExportCache(unittest.TestCase):
+    def test_evicts_least_recently_used_by_size(self):
+        cache = ExportCache(max_bytes=10)
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+        cache.get("a")
+        cache.set("c", b"1234")
+
+        self.assertEqual(cache.get("a"), b"1234")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), b"1234")
+
+    def test_skips_documents_larger_than_cache(self):
+        cache = ExportCache(max_bytes=2)
+        cache.set("a", b"1234")
+        self.assertIsNone(cache.get("a"))
+
+class TestExportService(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+        def render(content, title):
+            with self.lock:
+                self.calls.append(content)
+            time.sleep(0.05)
+            return content.encode("utf-8")
+
+        self.renderers = patch.dict("src.web.exports.RENDERERS", {PDF: render, DOCX: render})
+        self.renderers.start()
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self.service = ExportService(executor=self.executor)
+
+    def tearDown(self):
+        self.renderers.stop()
+        self.service.close()
+
+    def test_repeat_export_served_from_cache(self):
+        async def scenario():
+            first = await self.service.export(PDF, "# Report")
+            second = await self.service.export(PDF, "# Report")
+            return first, second
+
+        self.assertEqual(asyncio.run(scenario()), (b"# Report", b"# Report"))
+        self.assertEqual(self.calls, ["# Report"])
+
+    def test_identical_concurrent_exports_render_once(self):
+        async def scenario():
+            return await asyncio.gather(*(self.service.export(DOCX, "# Report") for _ in range(5)))
+
+        self.assertEqual(asyncio.run(scenario()), [b"# Report"] * 5)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_formats_cached_separately(self):
+        async def scenario():
+            await self.service.export(PDF, "# Report")
+            await self.service.export(DOCX, "# Report")
+
+        asyncio.run(scenario())
+        self.assertEqual(len(self.calls), 2)
+
+    def test_broken_pool_is_rebuilt_and_the_export_retried(self):
+        class BrokenExecutor(concurrent.futures.Executor):
+            def submit(self, fn, *args, **kwargs):
+                future = concurrent.futures.Future()
+                future.set_exception(BrokenProcessPool("worker died"))
+                return future
+
+        service = ExportService(executor=BrokenExecutor())
+        with patch("src.web.exports.concurrent.futures.ProcessPoolExecutor", lambda **kwargs: concurrent.futures.ThreadPoolExecutor(max_workers=1)):
+            self.assertEqual(asyncio.run(service.export(DOCX, "# Report")), b"# Report")
+        service.close()
+
+    def test_worker_warm_up_tolerates_missing_pdf_stack(self):
+        with patch("src.web.exports.ReportFormatter.template", side_effect=ImportError("No module named 'jinja2'")):
+            _warm_worker()
+
+if __name__ == '__main__':
+    unittest.main()
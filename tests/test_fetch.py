@@ -0,0 +1,246 @@
+import concurrent.futures
+import unittest
+from unittest.mock import MagicMock, patch
+import ipaddress
+import socket
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Mock external dependencies pulled in by the skills package and the researcher
+sys.modules['ddgs'] = MagicMock()
+sys.modules['langchain_google_genai'] = MagicMock()
+sys.modules['langchain_core'] = MagicMock()
+sys.modules['langchain_core.prompts'] = MagicMock()
+
+from src.agents.researcher import ResearcherAgent
+from src.skills.base import BaseSkill
+from src.skills.fetch import PageFetchSkill, TextExtractor
+from src.utils.cache import TTLCache
+from src.utils.sources import SearchResult, SourceIndex
+
+PARAGRAPH = "Solid-state batteries replace the liquid electrolyte with a solid one, improving safety."
+
+PAGE = f"""<html><head><title>Batteries &amp; more</title><script>var tracking = 1;</script></head>
+<body>
+<nav><ul><li>Home<li>About</ul></nav>
+<header>Site header</header>
+<main>
+<h1>Solid-state batteries</h1>
+<p>{PARAGRAPH}</p>
+<p>Short.</p>
+<div>Manufacturing at scale remains the main obstacle to lower costs.<br>Dendrites are another open problem for lithium metal anodes.</div>
+</main>
+<footer>Copyright</footer>
+</body></html>"""
+
+def fake_getaddrinfo(host, port, *args, **kwargs):
+    # IP literals resolve to themselves, every name to a public address
+    try:
+        address = str(ipaddress.ip_address(host))
+    except ValueError:
+        address = "127.0.0.1" if host == "localhost" else "93.184.216.34"
+    return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port))]
+
+class FakeResponse:
+    def __init__(self, body: bytes, content_type: str = "text/html; charset=utf-8", delay: float = 0.0, chunk_size: int = 64, location: str = None):
+        self.body = body
+        self.headers = {"Content-Type": content_type}
+        if location:
+            self.headers["Location"] = location
+        self.is_redirect = location is not None
+        self.encoding = "utf-8"
+        self.delay = delay
+        self.chunk_size = chunk_size
+        self.chunks_read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+    def iter_content(self, chunk_size=None):
+        for i in range(0, len(self.body), self.chunk_size):
+            time.sleep(self.delay)
+            self.chunks_read += 1
+            yield self.body[i:i + self.chunk_size]
+
+class FakeSession:
+    def __init__(self, responses: dict):
+        self.responses = responses
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        return self.responses[url]
+
+    def close(self):
+        pass
+
+def make_fetcher(responses: dict, **kwargs) -> PageFetchSkill:
+    fetcher = PageFetchSkill(cache=TTLCache(), **kwargs)
+    fetcher._session = FakeSession(responses)
+    return fetcher
+
+class TestTextExtractor(unittest.TestCase):
+    def test_extracts_main_text_incrementally(self):
+        extractor = TextExtractor()
+        for i in range(0, len(PAGE), 17):
+            extractor.feed(PAGE[i:i + 17])
+
+        self.assertEqual(extractor.title, "Batteries & more")
+        self.assertEqual(extractor.text().split("\n"), [
+            "Solid-state batteries",
+            PARAGRAPH,
+            "Manufacturing at scale remains the main obstacle to lower costs.",
+            "Dendrites are another open problem for lithium metal anodes.",
+        ])
+
+    def test_unclosed_tags_inside_skipped_elements(self):
+        extractor = TextExtractor()
+        extractor.feed(f"<nav><ul><li>Home<li><p>About</ul></nav><p>{PARAGRAPH}</p>")
+        self.assertEqual(extractor.text(), PARAGRAPH)
+
+@patch("src.skills.fetch.socket.getaddrinfo", fake_getaddrinfo)
+class TestPageFetchSkill(unittest.TestCase):
+    def test_fetches_top_pages_and_caches_by_url(self):
+        fetcher = make_fetcher({
+            "https://example.com/a": FakeResponse(PAGE.encode("utf-8")),
+            "https://example.com/paper.pdf": FakeResponse(b"%PDF-1.4", content_type="application/pdf"),
+        }, max_pages=2)
+        sources = [
+            {"title": "A", "href": "https://example.com/a"},
+            {"title": "A again", "href": "https://www.example.com/a/?utm_source=x"},
+            {"title": "Paper", "href": "https://example.com/paper.pdf"},
+            {"title": "Not fetched", "href": "https://example.com/c"},
+        ]
+
+        result = fetcher.execute("batteries", sources=sources)
+        self.assertEqual(len(result["results"]), 1)
+        page = result["results"][0]
+        self.assertEqual((page.title, page.url, page.provider), ("A", "https://example.com/a", "Page"))
+        self.assertIn(PARAGRAPH, page.snippet)
+
+        fetcher.execute("batteries", sources=sources[:1])
+        self.assertEqual(fetcher.session.requested, ["https://example.com/a", "https://example.com/paper.pdf"])
+
+    def test_stops_reading_at_byte_cap(self):
+        response = FakeResponse((f"<p>{PARAGRAPH}</p>" * 200).encode("utf-8"))
+        fetcher = make_fetcher({"https://example.com/big": response}, max_bytes=256, max_chars=100000)
+
+        result = fetcher.execute("batteries", sources=[{"title": "Big", "href": "https://example.com/big"}])
+        self.assertIn(PARAGRAPH, result["results"][0].snippet)
+        self.assertEqual(response.chunks_read, 4)
+
+    def test_slow_page_is_dropped_at_deadline(self):
+        fetcher = make_fetcher({
+            "https://example.com/fast": FakeResponse(PAGE.encode("utf-8")),
+            "https://example.com/slow": FakeResponse(PAGE.encode("utf-8"), delay=0.5),
+        }, page_timeout=0.2)
+
+        start = time.monotonic()
+        result = fetcher.execute("batteries", sources=[
+            {"title": "Slow", "href": "https://example.com/slow"},
+            {"title": "Fast", "href": "https://example.com/fast"},
+        ])
+        self.assertLess(time.monotonic() - start, 0.45)
+        self.assertEqual([page.title for page in result["results"]], ["Fast"])
+
+    def test_refuses_local_and_metadata_addresses(self):
+        fetcher = make_fetcher({})
+        for url in ("http://localhost:8000/api/admin/reload", "http://169.254.169.254/latest/meta-data/", "http://10.0.0.5/"):
+            with self.assertRaises(ValueError):
+                fetcher.extract(url)
+
+        result = fetcher.execute("batteries", sources=[{"title": "Metadata", "href": "http://169.254.169.254/latest/meta-data/"}])
+        self.assertEqual(result["results"], [])
+        self.assertEqual(fetcher.session.requested, [])
+
+    def test_redirects_are_checked_hop_by_hop(self):
+        fetcher = make_fetcher({
+            "https://example.com/moved": FakeResponse(b"", location="/a"),
+            "https://example.com/a": FakeResponse(PAGE.encode("utf-8")),
+            "https://example.com/evil": FakeResponse(b"", location="http://127.0.0.1:8000/metrics"),
+        })
+        self.assertIn(PARAGRAPH, fetcher.extract("https://example.com/moved")["text"])
+        with self.assertRaises(ValueError):
+            fetcher.extract("https://example.com/evil")
+        self.assertEqual(fetcher.session.requested, ["https://example.com/moved", "https://example.com/a", "https://example.com/evil"])
+
+class SnippetSkill(BaseSkill):
+    name = "Snippets"
+
+    def execute(self, query, **kwargs):
+        return {
+            "content": "[Web] Source: A\nURL: https://example.com/a\nContent: snippet\n\n",
+            "sources": [{"title": "A", "href": "https://example.com/a"}]
+        }
+
+@patch("src.skills.fetch.socket.getaddrinfo", fake_getaddrinfo)
+class TestResearcherFetchStage(unittest.TestCase):
+    def test_page_text_is_added_under_the_hit_source_id(self):
+        fetcher = make_fetcher({"https://example.com/a": FakeResponse(PAGE.encode("utf-8"))})
+        researcher = ResearcherAgent(skills=[SnippetSkill()], fetcher=fetcher)
+
+        skill_results = researcher._fetch_pages("batteries", researcher._run_skills("batteries"))
+        chunks, sources = researcher._collect(skill_results, "batteries", SourceIndex())
+
+        self.assertEqual(len(sources), 1)
+        self.assertEqual(len(chunks), 2)
+        self.assertTrue(chunks[1].startswith(f"[{sources[0].id}] [Page]"))
+        self.assertIn(PARAGRAPH, chunks[1])
+
+    def test_search_results_share_one_entry_per_document(self):
+        class ResultSkill(BaseSkill):
+            name = "Results"
+
+            def execute(self, query, **kwargs):
+                return {"results": [
+                    SearchResult("A", "https://example.com/a", PARAGRAPH, "Tavily"),
+                    SearchResult("A mirror", "https://mirror.org/a", PARAGRAPH, "Serper"),
+                ]}
+
+        researcher = ResearcherAgent(skills=[ResultSkill()])
+        source_index = SourceIndex()
+        chunks, sources = researcher._collect(researcher._run_skills("batteries"), "batteries", source_index)
+        # Same text behind another URL is the same evidence, cited under the same ID
+        self.assertEqual(len(sources), 1)
+        self.assertEqual(chunks[0], f"[{sources[0].id}] [Tavily] Source: A\nURL: https://example.com/a\nContent: {PARAGRAPH}")
+        self.assertTrue(chunks[1].startswith(f"[{sources[0].id}] [Serper] Source: A mirror"))
+
+        # Another sub-topic gets a reference to the document and a short excerpt
+        chunks, _ = researcher._collect(researcher._run_skills("other"), "other", source_index)
+        self.assertEqual(chunks[0], f"[{sources[0].id}] A (covered under another sub-topic): {PARAGRAPH}")
+
+    def test_shared_documents_go_to_the_earlier_sub_topic_whatever_finishes_first(self):
+        class SlowFirstSkill(BaseSkill):
+            name = "Results"
+
+            def execute(self, query, **kwargs):
+                # The first planned sub-topic's search is the slow one
+                time.sleep(0.2 if query == "first" else 0)
+                return {"results": [SearchResult("A", "https://example.com/a", PARAGRAPH, "Tavily")]}
+
+        researcher = ResearcherAgent(skills=[SlowFirstSkill()])
+        source_index = SourceIndex()
+        source_index.expect("first")
+        source_index.expect("second")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {sub: executor.submit(researcher.prepare, sub, None, source_index) for sub in ("first", "second")}
+            prepared = {sub: future.result() for sub, future in futures.items()}
+
+        self.assertIn("Content:", prepared["first"]["inputs"]["search_results"])
+        self.assertIn("(covered under another sub-topic)", prepared["second"]["inputs"]["search_results"])
+
+if __name__ == '__main__':
+    unittest.main()
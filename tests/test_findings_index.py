@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.findings_index import FindingsIndex, HashingEmbedder, cosine
+
+class TestHashingEmbedder(unittest.TestCase):
+    def test_rephrasings_score_above_unrelated_topics(self):
+        embedder = HashingEmbedder()
+        topic = embedder.embed("History of quantum error correction")
+
+        self.assertAlmostEqual(cosine(topic, embedder.embed("Quantum error correction: a history")), 1.0, places=6)
+        self.assertGreater(cosine(topic, embedder.embed("Quantum error correcting codes")), 0.5)
+        self.assertLess(cosine(topic, embedder.embed("Urban heat islands")), 0.2)
+
+class TestFindingsIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "findings.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_similar_topic_reuses_finding(self):
+        index = FindingsIndex(threshold=0.8)
+        index.add("History of quantum error correction", None, "QEC finding", [{"title": "QEC", "href": "http://qec.org"}])
+        index.add("Urban heat islands", None, "Heat finding", [])
+
+        match = index.lookup("Quantum error correction history")
+        self.assertEqual(match["topic"], "History of quantum error correction")
+        self.assertEqual(match["content"], "QEC finding")
+        self.assertEqual(match["sources"], [{"title": "QEC", "href": "http://qec.org"}])
+        self.assertIsNone(index.lookup("Carbon capture and storage"))
+
+    def test_instructions_must_match(self):
+        index = FindingsIndex()
+        index.add("Solid-state batteries", "focus on cost", "Cost finding", [])
+
+        self.assertIsNone(index.lookup("Solid-state batteries"))
+        self.assertEqual(index.lookup("Solid-state batteries", " focus on cost ")["content"], "Cost finding")
+
+    def test_stale_findings_are_ignored(self):
+        index = FindingsIndex(ttl=0.05)
+        index.add("Solid-state batteries", None, "Old finding", [])
+        time.sleep(0.1)
+        self.assertIsNone(index.lookup("Solid-state batteries"))
+
+    def test_persists_and_evicts_oldest(self):
+        index = FindingsIndex(path=self.path, max_entries=2)
+        for topic in ("Solid-state batteries", "Urban heat islands", "CRISPR gene therapy"):
+            index.add(topic, None, f"About {topic}", [])
+        index.close()
+
+        reopened = FindingsIndex(path=self.path, max_entries=2)
+        self.assertEqual(len(reopened), 2)
+        self.assertIsNone(reopened.lookup("Solid-state batteries"))
+        self.assertEqual(reopened.lookup("CRISPR gene therapy")["content"], "About CRISPR gene therapy")
+        reopened.close()
+
+if __name__ == '__main__':
+    unittest.main()
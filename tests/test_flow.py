@@ -1,5 +1,6 @@
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
 import sys
 import os
 
@@ -16,7 +17,10 @@ sys.modules['langchain_core.output_parsers'] = MagicMock()
 sys.modules['langchain_core.runnables'] = MagicMock()
 sys.modules['ddgs'] = MagicMock()
 
-from src.orchestrator import Orchestrator
+from src.orchestrator import AsyncOrchestrator, Orchestrator
+from src.utils.cache import TTLCache
+from src.utils.findings_index import FindingsIndex
+from src.utils.sessions import ResearchSessionStore
 
 class TestOrchestrator(unittest.TestCase):
     @patch('src.agents.planner.ChatGoogleGenerativeAI')
@@ -54,11 +58,210 @@ class TestOrchestrator(unittest.TestCase):
         report = orchestrator.run("Test Topic")
 
         # Verify
-        planner.plan.assert_called_once_with("Test Topic")
+        planner.plan.assert_called_once_with("Test Topic", None)
         self.assertEqual(researcher.research.call_count, 2)
         summarizer.summarize.assert_called_once()
         self.assertEqual(report, "Final Report based on Result 1 and Result 2\n\n## References\n- [Source 1](http://source1.com)\n- [Source 2](http://source2.com)")
         print("\n✅ Orchestrator Flow Verification Passed!")
 
+    @patch('src.orchestrator.PlannerAgent')
+    @patch('src.orchestrator.ResearcherAgent')
+    @patch('src.orchestrator.SummarizerAgent')
+    def test_async_orchestrator_logic(self, MockSummarizer, MockResearcher, MockPlanner):
+        planner = MockPlanner.return_value
+        researcher = MockResearcher.return_value
+        summarizer = MockSummarizer.return_value
+
+        planner.aplan = AsyncMock(return_value=["Subtopic 1", "Subtopic 2"])
+        researcher.aresearch = AsyncMock(side_effect=[
+            {"content": "Result 1", "sources": [{"title": "Source 1", "href": "http://source1.com"}]},
+            RuntimeError("provider down")
+        ])
+        summarizer.asummarize = AsyncMock(return_value="Final Report")
+
+        orchestrator = AsyncOrchestrator()
+        report = asyncio.run(orchestrator.arun("Test Topic"))
+
+        planner.aplan.assert_awaited_once_with("Test Topic", None)
+        self.assertEqual(researcher.aresearch.await_count, 2)
+        findings = summarizer.asummarize.await_args.args[1]
+        self.assertEqual(findings["Subtopic 1"], "Result 1")
+        self.assertTrue(findings["Subtopic 2"].startswith("Error:"))
+        self.assertEqual(report, "Final Report")
+
+    @patch('src.orchestrator.PlannerAgent')
+    @patch('src.orchestrator.ResearcherAgent')
+    @patch('src.orchestrator.SummarizerAgent')
+    def test_async_orchestrator_stream(self, MockSummarizer, MockResearcher, MockPlanner):
+        planner = MockPlanner.return_value
+        researcher = MockResearcher.return_value
+        summarizer = MockSummarizer.return_value
+
+        async def fake_research(sub_topic, instructions=None, on_event=None, **kwargs):
+            on_event({"type": "skill_started", "sub_topic": sub_topic, "skill": "Fake Search"})
+            return {"content": f"About {sub_topic}", "sources": []}
+
+        async def fake_stream(topic, findings, sources, custom_prompt=None):
+            for token in ["Final ", "Report"]:
+                yield token
+
+        planner.aplan = AsyncMock(return_value=["Subtopic 1", "Subtopic 2"])
+        researcher.aresearch = fake_research
+        summarizer.astream_summarize = fake_stream
+
+        async def collect():
+            return [event async for event in AsyncOrchestrator().astream_run("Test Topic")]
+
+        events = asyncio.run(collect())
+        types = [event["type"] for event in events]
+
+        self.assertEqual(types[0], "plan_ready")
+        self.assertEqual(types.count("skill_started"), 2)
+        self.assertEqual(types.count("finding"), 2)
+        self.assertLess(types.index("research_done"), types.index("summary_token"))
+        self.assertEqual(events[-1], {"type": "done", "report": "Final Report", "elapsed_ms": events[-1]["elapsed_ms"]})
+
+    @patch('src.orchestrator.PlannerAgent')
+    @patch('src.orchestrator.ResearcherAgent')
+    @patch('src.orchestrator.SummarizerAgent')
+    def test_session_only_reruns_changed_sub_topics(self, MockSummarizer, MockResearcher, MockPlanner):
+        researcher = MockResearcher.return_value
+        summarizer = MockSummarizer.return_value
+        researcher.research.side_effect = lambda topic, instructions=None, **kwargs: {"content": f"{topic}: {instructions}", "sources": []}
+        summarizer.summarize.return_value = "Report"
+
+        orchestrator = Orchestrator()
+        orchestrator.sessions = ResearchSessionStore(TTLCache())
+        session_id = orchestrator.sessions.new_id()
+
+        first = [MagicMock(topic="A", instructions=None), MagicMock(topic="B", instructions=None)]
+        orchestrator.execute_research(first, session_id=session_id)
+        self.assertEqual(researcher.research.call_count, 2)
+
+        edited = [MagicMock(topic="A", instructions=None), MagicMock(topic="B", instructions="focus on cost")]
+        findings, _ = orchestrator.execute_research(edited, session_id=session_id)
+        self.assertEqual(researcher.research.call_count, 3)
+        self.assertEqual(findings, {"A": "A: None", "B": "B: focus on cost"})
+
+        orchestrator.generate_summary("Topic", findings, [], session_id=session_id)
+        orchestrator.generate_summary("Topic", findings, [], session_id=session_id)
+        summarizer.summarize.assert_called_once()
+
+    @patch('src.orchestrator.PlannerAgent')
+    @patch('src.orchestrator.ResearcherAgent')
+    @patch('src.orchestrator.SummarizerAgent')
+    def test_similar_sub_topics_reuse_earlier_findings(self, MockSummarizer, MockResearcher, MockPlanner):
+        researcher = MockResearcher.return_value
+        researcher.research.side_effect = lambda topic, instructions=None, **kwargs: {
+            "content": f"About {topic}", "sources": [{"title": topic, "href": f"http://example.com/{len(topic)}"}]
+        }
+
+        orchestrator = Orchestrator()
+        orchestrator.findings_index = FindingsIndex()
+        orchestrator.execute_research(["History of quantum error correction", "Urban heat islands"])
+        self.assertEqual(researcher.research.call_count, 2)
+
+        findings, sources = orchestrator.execute_research(["Quantum error correction history", "Solid-state batteries"])
+        self.assertEqual(researcher.research.call_count, 3)
+        self.assertEqual(findings["Quantum error correction history"], "About History of quantum error correction")
+        self.assertEqual(len(sources), 2)
+
+        # The reused finding's sources seed the fresh sub-topic's evidence index
+        source_index = researcher.research.call_args.kwargs["source_index"]
+        entry, _ = source_index.register({"title": "Q", "href": f"http://example.com/{len('History of quantum error correction')}"}, owner="Solid-state batteries")
+        self.assertEqual(source_index.owner(entry), "Quantum error correction history")
+
+    @patch('src.orchestrator.PlannerAgent')
+    @patch('src.orchestrator.ResearcherAgent')
+    @patch('src.orchestrator.SummarizerAgent')
+    def test_identical_concurrent_requests_are_coalesced(self, MockSummarizer, MockResearcher, MockPlanner):
+        planner = MockPlanner.return_value
+        researcher = MockResearcher.return_value
+
+        async def slow_plan(topic, custom_prompt=None):
+            await asyncio.sleep(0.05)
+            return ["A", "B"]
+
+        async def slow_research(topic, instructions=None, **kwargs):
+            await asyncio.sleep(0.05)
+            return {"content": f"About {topic}", "sources": [{"title": topic, "href": f"http://{topic}.com"}]}
+
+        planner.aplan = AsyncMock(side_effect=slow_plan)
+        researcher.aresearch = AsyncMock(side_effect=slow_research)
+
+        orchestrator = AsyncOrchestrator()
+        orchestrator.sessions = ResearchSessionStore(TTLCache())
+
+        async def main():
+            plans = await asyncio.gather(
+                orchestrator.aplan_research("Solid-state batteries"),
+                orchestrator.aplan_research("  solid-state   Batteries ")
+            )
+            # Like /api/research_phase without a session: every request gets a fresh session id
+            research = await asyncio.gather(*(
+                orchestrator.aexecute_research(["A", "B"], session_id=orchestrator.sessions.new_id())
+                for _ in range(3)
+            ))
+            return plans, research
+
+        plans, research = asyncio.run(main())
+
+        self.assertEqual(plans, [["A", "B"], ["A", "B"]])
+        planner.aplan.assert_awaited_once()
+        self.assertEqual(researcher.aresearch.await_count, 2)
+        for findings, sources in research:
+            self.assertEqual(findings, {"A": "About A", "B": "About B"})
+            self.assertEqual([source.url for source in sources], ["http://A.com", "http://B.com"])
+
+    @patch('src.orchestrator.PlannerAgent')
+    @patch('src.orchestrator.ResearcherAgent')
+    @patch('src.orchestrator.SummarizerAgent')
+    def test_batch_analysis_searches_first_then_analyzes_together(self, MockSummarizer, MockResearcher, MockPlanner):
+        researcher = MockResearcher.return_value
+
+        def prepare(topic, instructions=None, **kwargs):
+            if topic == "B":
+                raise RuntimeError("search down")
+            return {"sub_topic": topic, "instructions": instructions, "inputs": {"sub_topic": topic}, "sources": []}
+
+        researcher.prepare.side_effect = prepare
+        researcher.analyze_batch.side_effect = lambda prepared, **kwargs: [
+            {"content": f"About {item['sub_topic']}", "sources": []} for item in prepared
+        ]
+
+        with patch.dict(os.environ, {"RESEARCH_BATCH_ANALYSIS": "1", "RESEARCH_ANALYSIS_CONCURRENCY": "2"}):
+            orchestrator = Orchestrator()
+        findings, _ = orchestrator.execute_research(["A", "B", "C"])
+
+        researcher.research.assert_not_called()
+        researcher.analyze_batch.assert_called_once()
+        self.assertEqual([item["sub_topic"] for item in researcher.analyze_batch.call_args.args[0]], ["A", "C"])
+        self.assertEqual(researcher.analyze_batch.call_args.kwargs["max_concurrency"], 2)
+        self.assertEqual(findings["A"], "About A")
+        self.assertEqual(findings["C"], "About C")
+        self.assertTrue(findings["B"].startswith("Error:"))
+
+    @patch('src.orchestrator.PlannerAgent')
+    @patch('src.orchestrator.ResearcherAgent')
+    @patch('src.orchestrator.SummarizerAgent')
+    def test_pipelined_run(self, MockSummarizer, MockResearcher, MockPlanner):
+        planner = MockPlanner.return_value
+        researcher = MockResearcher.return_value
+        summarizer = MockSummarizer.return_value
+
+        planner.stream_plan.return_value = iter(["Subtopic 1", "Subtopic 2"])
+        researcher.research.side_effect = lambda topic, instructions=None, **kwargs: {"content": f"Result {topic}", "sources": []}
+        summarizer.condense_section.side_effect = lambda topic, sub, finding, custom_prompt=None: f"Condensed {finding}"
+        summarizer.summarize.return_value = "Final Report"
+
+        report = Orchestrator().run_pipelined("Test Topic")
+
+        self.assertEqual(report, "Final Report")
+        self.assertEqual(researcher.research.call_count, 2)
+        findings = summarizer.summarize.call_args.args[1]
+        self.assertEqual(list(findings), ["Subtopic 1", "Subtopic 2"])
+        self.assertEqual(findings["Subtopic 2"], "Condensed Result Subtopic 2")
+        self.assertFalse(summarizer.summarize.call_args.kwargs["map_reduce"])
+
 if __name__ == '__main__':
     unittest.main()
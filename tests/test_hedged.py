@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import MagicMock
+import asyncio
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Mock external dependencies pulled in by the skills package
+sys.modules['ddgs'] = MagicMock()
+
+from src.skills.base import BaseSkill
+from src.skills.hedged import HedgedSearchSkill
+from src.skills.ratelimit import RateLimitedSkill
+from src.utils.ratelimit import ProviderLimiter
+
+class FakeProvider(BaseSkill):
+    def __init__(self, name, delay=0.0, error=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def execute(self, query, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            return {"error": self.error}
+        return {"content": f"[{self.name}] {query}", "sources": []}
+
+class TestHedgedSearchSkill(unittest.TestCase):
+    def test_latency_excludes_the_wait_for_a_limiter_slot(self):
+        # One token every 0.25s: the second and third calls wait for their slot first
+        limiter = ProviderLimiter("test", rate=4, burst=1)
+        skill = HedgedSearchSkill([RateLimitedSkill(FakeProvider("p", delay=0.02), limiter=limiter)], max_workers=2)
+        for _ in range(3):
+            skill.execute("query")
+
+        self.assertEqual(len(skill.stats["p"].latencies), 3)
+        self.assertLess(max(skill.stats["p"].latencies), 0.15)
+        self.assertEqual(skill._executor._max_workers, 2)
+        skill.close()
+
+    def test_slow_primary_is_hedged(self):
+        slow, fast = FakeProvider("slow", delay=1.0), FakeProvider("fast", delay=0.05)
+        skill = HedgedSearchSkill([slow, fast], default_hedge_delay=0.1)
+
+        start = time.monotonic()
+        result = skill.execute("query")
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(result["content"], "[fast] query")
+        skill.close()
+
+    def test_errors_fail_over_without_waiting(self):
+        broken, backup = FakeProvider("broken", error="503 Service Unavailable"), FakeProvider("backup")
+        skill = HedgedSearchSkill([broken, backup], default_hedge_delay=5)
+
+        start = time.monotonic()
+        self.assertEqual(skill.execute("query")["content"], "[backup] query")
+        self.assertLess(time.monotonic() - start, 1)
+
+        # The failing provider now ranks last
+        self.assertEqual([p.name for p in skill._ordered()], ["backup", "broken"])
+        skill.close()
+
+    def test_all_providers_failing_returns_error(self):
+        skill = HedgedSearchSkill([FakeProvider("a", error="down"), FakeProvider("b", error="down")])
+        self.assertIn("All web search providers failed", skill.execute("query")["error"])
+        skill.close()
+
+    def test_async_hedge(self):
+        slow, fast = FakeProvider("slow", delay=1.0), FakeProvider("fast", delay=0.05)
+        skill = HedgedSearchSkill([slow, fast], default_hedge_delay=0.1)
+        self.assertEqual(asyncio.run(skill.aexecute("query"))["content"], "[fast] query")
+        skill.close()
+
+    def test_cancelled_hedge_loser_is_not_counted_as_an_error(self):
+        slow, fast = FakeProvider("slow", delay=0.5), FakeProvider("fast", delay=0.02)
+        skill = HedgedSearchSkill([slow, fast], default_hedge_delay=0.05)
+        for _ in range(3):
+            self.assertEqual(asyncio.run(skill.aexecute("query"))["content"], "[fast] query")
+
+        stats = skill.provider_stats()
+        self.assertEqual(stats["slow"]["error_rate"], 0.0)
+        self.assertEqual(stats["fast"]["samples"], 3)
+        skill.close()
+
+if __name__ == '__main__':
+    unittest.main()
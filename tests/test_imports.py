@@ -0,0 +1,72 @@
+import unittest
+import importlib.util
+import json
+import subprocess
+import sys
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies that must only load on first use, never as a side effect of importing our modules
+HEAVY_MODULES = ["langchain_google_genai", "langchain_core", "ddgs", "arxiv", "requests", "xhtml2pdf", "docx", "markdown", "jinja2"]
+
+# Generous enough for slow CI machines; an eager SDK import alone takes several times this
+IMPORT_BUDGET_SECONDS = 1.0
+
+PROBE = """
+import json, sys, time
+
+heavy = set(sys.argv[2].split(","))
+
+class Blocker:
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] in heavy:
+            raise ImportError(f"{name} imported eagerly")
+        return None
+
+sys.meta_path.insert(0, Blocker())
+start = time.perf_counter()
+__import__(sys.argv[1])
+print(json.dumps({"elapsed": time.perf_counter() - start}))
+"""
+
+def probe(module: str) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE, module, ",".join(HEAVY_MODULES)],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise AssertionError(f"importing {module} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+class TestImportTime(unittest.TestCase):
+    def test_orchestrator_import_is_lazy(self):
+        result = probe("src.orchestrator")
+        self.assertLess(result["elapsed"], IMPORT_BUDGET_SECONDS)
+
+    def test_export_modules_import_is_lazy(self):
+        probe("src.utils.report_formatter")
+        probe("src.utils.docx_converter")
+        probe("src.web.exports")
+
+    @unittest.skipUnless(
+        all(importlib.util.find_spec(name) for name in ("fastapi", "pydantic", "dotenv")),
+        "web dependencies not installed"
+    )
+    def test_server_import_is_lazy(self):
+        result = probe("src.web.server")
+        self.assertLess(result["elapsed"], IMPORT_BUDGET_SECONDS * 2)
+
+class TestLazyImport(unittest.TestCase):
+    def test_resolves_on_first_use(self):
+        sys.path.append(PROJECT_ROOT)
+        from src.utils.lazy import LazyImport
+
+        dumps = LazyImport("json", "dumps")
+        self.assertIn("not loaded", repr(dumps))
+        self.assertEqual(dumps([1]), "[1]")
+        self.assertIs(LazyImport("json").loads, json.loads)
+        self.assertIn("(loaded)", repr(dumps))
+
+if __name__ == '__main__':
+    unittest.main()
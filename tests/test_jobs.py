@@ -0,0 +1,120 @@
+import unittest
+import asyncio
+import sys
+import os
+import tempfile
+import threading
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.web.jobs import JobManager, JobStore, QueueFullError
+
+class FakeOrchestrator:
+    runs = 0
+
+    def __init__(self, delay=0.05, report="Report on {topic}"):
+        self.delay = delay
+        self.report = report
+
+    async def arun(self, topic, custom_prompt=None):
+        FakeOrchestrator.runs += 1
+        await asyncio.sleep(self.delay)
+        return self.report.format(topic=topic)
+
+class TestJobManager(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "jobs.sqlite")
+        FakeOrchestrator.runs = 0
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_identical_in_flight_jobs_are_deduplicated(self):
+        async def scenario():
+            manager = JobManager(FakeOrchestrator, JobStore(self.path))
+            first, created = manager.submit("AI in Healthcare")
+            second, second_created = manager.submit("  ai in healthcare ")
+            self.assertTrue(created)
+            self.assertFalse(second_created)
+            self.assertEqual(first["id"], second["id"])
+
+            await asyncio.sleep(0.2)
+            result = await manager.aget(first["id"], include_report=True)
+            await manager.shutdown()
+            return result
+
+        result = asyncio.run(scenario())
+        self.assertEqual(result["status"], "completed")
+        self.assertEqual(result["report"], "Report on AI in Healthcare")
+        self.assertEqual(FakeOrchestrator.runs, 1)
+
+    def test_admission_control_and_cancellation(self):
+        async def scenario():
+            manager = JobManager(lambda: FakeOrchestrator(delay=1), JobStore(self.path), max_concurrency=1, max_queued=1)
+            running, _ = manager.submit("topic 1")
+            await asyncio.sleep(0)
+            queued, _ = manager.submit("topic 2")
+            with self.assertRaises(QueueFullError):
+                manager.submit("topic 3")
+
+            self.assertTrue(manager.cancel(queued["id"]))
+            await asyncio.sleep(0.01)
+            status = (await manager.aget(queued["id"]))["status"]
+            await manager.shutdown()
+            return status
+
+        self.assertEqual(asyncio.run(scenario()), "cancelled")
+
+    def test_summarization_error_report_marks_the_job_failed(self):
+        async def scenario():
+            manager = JobManager(lambda: FakeOrchestrator(report="Error in summarization: 429 quota exceeded"), JobStore(self.path))
+            job, _ = manager.submit("Quantum computing")
+            await asyncio.sleep(0.2)
+            result = await manager.aget(job["id"], include_report=True)
+            await manager.shutdown()
+            return result
+
+        result = asyncio.run(scenario())
+        self.assertEqual(result["status"], "failed")
+        self.assertEqual(result["error"], "429 quota exceeded")
+        self.assertIsNone(result["report"])
+
+    def test_store_is_only_touched_off_the_event_loop(self):
+        threads = []
+
+        class RecordingStore(JobStore):
+            def insert(self, job):
+                threads.append(threading.current_thread().name)
+                super().insert(job)
+
+            def update(self, job_id, **fields):
+                threads.append(threading.current_thread().name)
+                super().update(job_id, **fields)
+
+        async def scenario():
+            manager = JobManager(FakeOrchestrator, RecordingStore(self.path))
+            job, _ = manager.submit("Quantum computing")
+            await asyncio.sleep(0.2)
+            await manager.shutdown()
+
+        asyncio.run(scenario())
+        self.assertEqual(len(threads), 3)
+        self.assertTrue(all(name.startswith("job-store") for name in threads))
+
+    def test_finished_reports_survive_restart(self):
+        async def scenario():
+            manager = JobManager(FakeOrchestrator, JobStore(self.path))
+            job, _ = manager.submit("Quantum computing")
+            await asyncio.sleep(0.2)
+            await manager.shutdown()
+            return job["id"]
+
+        job_id = asyncio.run(scenario())
+        restarted = JobManager(FakeOrchestrator, JobStore(self.path))
+        self.assertEqual(restarted.get(job_id, include_report=True)["report"], "Report on Quantum computing")
+        restarted.store.close()
+
+if __name__ == '__main__':
+    unittest.main()
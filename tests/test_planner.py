@@ -0,0 +1,35 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Mock external dependencies to allow implementation-agnostic testing
+sys.modules['langchain_google_genai'] = MagicMock()
+sys.modules['langchain_core'] = MagicMock()
+sys.modules['langchain_core.prompts'] = MagicMock()
+sys.modules['langchain_core.output_parsers'] = MagicMock()
+
+from src.agents.planner import iter_sub_topics
+
+class TestStreamedPlan(unittest.TestCase):
+    def test_yields_sub_topics_across_chunk_boundaries(self):
+        text = '```json\n{"sub_topics": ["History of \\"AI\\"", "Current trends", "Future risks"]}\n```'
+        chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+        self.assertEqual(list(iter_sub_topics(chunks)), ['History of "AI"', "Current trends", "Future risks"])
+
+    def test_yields_each_topic_before_stream_ends(self):
+        def chunks():
+            yield '{"sub_topics": ["First", '
+            yield '"Sec'
+            raise AssertionError("read past the first complete sub-topic")
+
+        self.assertEqual(next(iter_sub_topics(chunks())), "First")
+
+    def test_no_array_yields_nothing(self):
+        self.assertEqual(list(iter_sub_topics(["I cannot help with that."])), [])
+
+if __name__ == '__main__':
+    unittest.main()
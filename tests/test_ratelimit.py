@@ -0,0 +1,117 @@
+import unittest
+import concurrent.futures
+import sys
+import os
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.ratelimit import AdaptiveLimiter, LimitedChain, ProviderLimiter, TokenBucket, is_throttle_error
+
+class TestRateLimiting(unittest.TestCase):
+    def test_token_bucket_enforces_rate_after_burst(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.assertEqual(bucket.try_acquire(), 0)
+        self.assertGreater(bucket.try_acquire(), 0)
+        time.sleep(0.11)
+        self.assertEqual(bucket.try_acquire(), 0)
+
+    def test_aimd_halves_on_throttle_and_grows_on_success(self):
+        limiter = AdaptiveLimiter(initial=8, max_limit=16)
+        self.assertTrue(limiter.try_acquire())
+        limiter.release(0.1, throttled=True)
+        self.assertEqual(limiter.limit, 4)
+
+        for _ in range(4):
+            self.assertTrue(limiter.try_acquire())
+            limiter.release(0.1)
+        self.assertGreater(limiter.limit, 4.9)
+
+    def test_mixed_short_and_long_calls_do_not_collapse_the_limit(self):
+        # One Gemini limiter serves ~2s planner calls and ~30s researcher/summarizer calls
+        limiter = AdaptiveLimiter(initial=4, max_limit=16)
+        for _ in range(20):
+            for latency in (2.0, 30.0, 28.0, 2.5, 35.0):
+                self.assertTrue(limiter.try_acquire())
+                limiter.release(latency)
+        self.assertGreaterEqual(limiter.limit, 4)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_concurrency_limit_blocks_extra_slots(self):
+        limiter = AdaptiveLimiter(initial=1)
+        self.assertTrue(limiter.try_acquire())
+        self.assertFalse(limiter.try_acquire())
+        limiter.release(0.1)
+        self.assertTrue(limiter.try_acquire())
+
+    def test_provider_limiter_feeds_errors_back(self):
+        limiter = ProviderLimiter("test", rate=100, max_concurrency=4)
+        with self.assertRaises(RuntimeError):
+            with limiter.limit():
+                raise RuntimeError("429 Client Error: Too Many Requests")
+        self.assertEqual(limiter.stats()["throttled"], 1)
+        self.assertEqual(limiter.stats()["in_flight"], 0)
+
+    def test_throttle_classification(self):
+        self.assertTrue(is_throttle_error("429 Resource has been exhausted (e.g. check quota)."))
+        self.assertTrue(is_throttle_error("503 Server Error: Service Unavailable"))
+        self.assertFalse(is_throttle_error("Tavily API key not found."))
+        self.assertFalse(is_throttle_error(None))
+        self.assertTrue(is_throttle_error("Error during Tavily search: 503 Server Error: Service Unavailable for url: https://api.tavily.com/search"))
+        self.assertTrue(is_throttle_error("Request failed with status code: 429"))
+        # Three-digit numbers that are not a reported status
+        self.assertFalse(is_throttle_error("Connection refused: localhost:5432"))
+        self.assertFalse(is_throttle_error("Expected at most 500 results, got 512"))
+
+        class HTTPError(Exception):
+            def __init__(self, status_code):
+                super().__init__("upstream failure")
+                self.response = type("Response", (), {"status_code": status_code})()
+
+        self.assertTrue(is_throttle_error(HTTPError(502)))
+        self.assertFalse(is_throttle_error(HTTPError(404)))
+
+    def test_limited_chain_batch_bounds_concurrency_and_returns_errors(self):
+        class SlowChain:
+            def __init__(self):
+                self.lock = threading.Lock()
+                self.in_flight = self.peak = 0
+
+            def invoke(self, item, config=None):
+                with self.lock:
+                    self.in_flight += 1
+                    self.peak = max(self.peak, self.in_flight)
+                time.sleep(0.02)
+                with self.lock:
+                    self.in_flight -= 1
+                if item == "bad":
+                    raise ValueError("bad input")
+                return item.upper()
+
+            def batch(self, items, config=None, return_exceptions=False):
+                self.waves.append(len(items))
+                def run(item):
+                    try:
+                        return self.invoke(item)
+                    except Exception as e:
+                        return e
+                with concurrent.futures.ThreadPoolExecutor(max_workers=config["max_concurrency"]) as executor:
+                    return list(executor.map(run, items))
+
+        chain = SlowChain()
+        chain.waves = []
+        limited = LimitedChain(chain, ProviderLimiter("test", rate=1000, max_concurrency=8))
+        results = limited.batch(["a", "b", "bad", "c", "d"], config={"max_concurrency": 2}, return_exceptions=True)
+
+        self.assertEqual(results[:2] + results[3:], ["A", "B", "C", "D"])
+        self.assertIsInstance(results[2], ValueError)
+        self.assertEqual(chain.peak, 2)
+        # Sent through chain.batch, one wave per set of granted slots
+        self.assertEqual(chain.waves, [2, 2, 1])
+        self.assertEqual(limited.limiter.stats()["in_flight"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
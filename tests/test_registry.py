@@ -0,0 +1,51 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Mock external dependencies to allow implementation-agnostic testing
+sys.modules['dotenv'] = MagicMock()
+
+from src.web.registry import OrchestratorRegistry
+
+class TestOrchestratorRegistry(unittest.TestCase):
+    def test_instance_is_reused_until_config_changes(self):
+        factory = MagicMock(side_effect=lambda: MagicMock())
+        registry = OrchestratorRegistry(factory, env_check_interval=0)
+
+        with patch.dict(os.environ, {"TAVILY_API_KEY": "key-1"}):
+            first = registry.get()
+            self.assertIs(registry.get(), first)
+
+        with patch.dict(os.environ, {"TAVILY_API_KEY": "key-2"}):
+            second = registry.get()
+
+        self.assertIsNot(second, first)
+        self.assertEqual(factory.call_count, 2)
+        self.assertIsNot(registry.reload(), second)
+        first.close.assert_called_once()
+
+    def test_replaced_instance_is_closed_after_its_last_lease(self):
+        registry = OrchestratorRegistry(MagicMock(side_effect=lambda: MagicMock()))
+
+        with registry.lease() as first:
+            with registry.lease() as again:
+                self.assertIs(again, first)
+            replacement = registry.reload()
+            self.assertIsNot(replacement, first)
+            first.close.assert_not_called()
+        first.close.assert_called_once()
+        replacement.close.assert_not_called()
+
+    def test_env_file_is_checked_at_most_once_per_interval(self):
+        registry = OrchestratorRegistry(MagicMock(side_effect=lambda: MagicMock()), env_file="/nonexistent/.env", env_check_interval=60)
+        with patch("src.web.registry.os.stat", side_effect=OSError) as stat:
+            for _ in range(5):
+                registry.get()
+        stat.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
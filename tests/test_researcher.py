@@ -0,0 +1,122 @@
+import unittest
+from unittest.mock import MagicMock
+import concurrent.futures
+import sys
+import threading
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Mock external dependencies to allow implementation-agnostic testing
+sys.modules['langchain_google_genai'] = MagicMock()
+sys.modules['langchain_core'] = MagicMock()
+sys.modules['langchain_core.prompts'] = MagicMock()
+sys.modules['langchain_core.output_parsers'] = MagicMock()
+sys.modules['ddgs'] = MagicMock()
+
+from src.agents.researcher import ResearcherAgent
+from src.skills.base import BaseSkill
+from src.utils.cache import TTLCache
+from src.utils.llm_cache import LLMCache
+from src.utils.ratelimit import LimitedChain, ProviderLimiter
+
+class SleepySkill(BaseSkill):
+    def __init__(self, name, delay, timeout=None):
+        self.name = name
+        self.delay = delay
+        self.timeout = timeout
+
+    def execute(self, query, **kwargs):
+        time.sleep(self.delay)
+        return {"content": f"[{self.name}] {query}\n", "sources": [{"title": self.name, "href": f"http://{self.name}"}]}
+
+class TestResearcherFanOut(unittest.TestCase):
+    def test_skills_run_concurrently_in_fixed_order(self):
+        skills = [SleepySkill("a", 0.3), SleepySkill("b", 0.1), SleepySkill("c", 0.2)]
+        researcher = ResearcherAgent(skills=skills)
+
+        start = time.monotonic()
+        results = researcher._run_skills("topic")
+        elapsed = time.monotonic() - start
+
+        self.assertEqual([skill.name for skill, _ in results], ["a", "b", "c"])
+        self.assertTrue(all("error" not in result for _, result in results))
+        self.assertLess(elapsed, 0.55)
+
+    def test_slow_skill_is_dropped_at_deadline(self):
+        skills = [SleepySkill("fast", 0.05), SleepySkill("slow", 2.0, timeout=0.2)]
+        researcher = ResearcherAgent(skills=skills, total_timeout=1.0)
+
+        start = time.monotonic()
+        results = researcher._run_skills("topic")
+        elapsed = time.monotonic() - start
+
+        self.assertNotIn("error", results[0][1])
+        self.assertIn("timed out", results[1][1]["error"])
+        self.assertLess(elapsed, 1.0)
+
+class FakePrompt:
+    """Stands in for the per-sub-topic `_build_prompt`: renders to "<instructions>: <sub-topic>"."""
+
+    def __init__(self, instructions):
+        self.instructions = instructions
+
+    def format_messages(self, **inputs):
+        return [MagicMock(type="system", content=self.instructions), MagicMock(type="user", content=inputs["sub_topic"])]
+
+    def format_prompt(self, **inputs):
+        return f"{self.instructions}: {inputs['sub_topic']}"
+
+class CountingChain:
+    """Fake bare model: a batch runs its rendered prompts in `max_concurrency` threads and tracks the peak in flight."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = self.peak = 0
+
+    def invoke(self, rendered, config=None):
+        with self.lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+        return MagicMock(content=rendered)
+
+    def batch(self, items, config=None, return_exceptions=False):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=config["max_concurrency"]) as executor:
+            return list(executor.map(self.invoke, items))
+
+class TestResearcherBatchAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.chain = CountingChain()
+        self.researcher = ResearcherAgent()
+        self.researcher._build_prompt = FakePrompt
+        self.researcher._batch_chain = lambda: LimitedChain(self.chain, ProviderLimiter("test", rate=1000, max_concurrency=8))
+        self.prepared = [
+            {"sub_topic": f"topic {i}", "instructions": f"focus {i}", "inputs": {"sub_topic": f"topic {i}", "search_results": ""}, "sources": []}
+            for i in range(5)
+        ]
+
+    def test_concurrency_is_bounded_across_distinct_instructions(self):
+        self.researcher.cache = LLMCache(TTLCache(), enabled=False)
+
+        findings = self.researcher.analyze_batch(self.prepared, max_concurrency=1)
+
+        self.assertEqual(self.chain.peak, 1)
+        self.assertEqual([finding["content"] for finding in findings], [f"focus {i}: topic {i}" for i in range(5)])
+
+    def test_batch_items_share_cache_entries_with_single_analysis(self):
+        self.researcher.cache = LLMCache(TTLCache())
+
+        self.researcher.analyze_batch(self.prepared, max_concurrency=2)
+
+        # The key `research` looks up for the same sub-topic: its own prompt and inputs
+        item = self.prepared[3]
+        cached = self.researcher.cache.lookup(self.researcher.model, self.researcher._build_prompt(item["instructions"]), item["inputs"])
+        self.assertEqual(cached, "focus 3: topic 3")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import asyncio
+import concurrent.futures
+import sys
+import os
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.singleflight import SingleFlight
+from src.utils.telemetry import COALESCED
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def slow(self, value):
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.1)
+        return value
+
+    def test_concurrent_identical_calls_run_once(self):
+        flights = SingleFlight("test-threads")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(flights.do, "key", self.slow, "result") for _ in range(4)]
+            results = [future.result() for future in futures]
+
+        self.assertEqual(results, ["result"] * 4)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(COALESCED.value(operation="test-threads"), 3)
+
+    def test_errors_are_shared_and_not_remembered(self):
+        flights = SingleFlight("test-errors")
+
+        def fail():
+            time.sleep(0.1)
+            raise RuntimeError("boom")
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(flights.do, "key", fail) for _ in range(2)]
+            for future in futures:
+                with self.assertRaises(RuntimeError):
+                    future.result()
+
+        # A later call runs again instead of replaying the failure
+        self.assertEqual(flights.do("key", self.slow, "ok"), "ok")
+
+    def test_different_keys_run_separately(self):
+        flights = SingleFlight("test-keys")
+        self.assertEqual(flights.do(SingleFlight.key("a"), self.slow, 1), 1)
+        self.assertEqual(flights.do(SingleFlight.key("b"), self.slow, 2), 2)
+        self.assertEqual(self.calls, 2)
+
+    def test_async_calls_share_one_task(self):
+        flights = SingleFlight("test-async")
+
+        async def work(value):
+            self.calls += 1
+            await asyncio.sleep(0.05)
+            return value
+
+        async def main():
+            return await asyncio.gather(*(flights.ado("key", work, "result") for _ in range(3)))
+
+        self.assertEqual(asyncio.run(main()), ["result"] * 3)
+        self.assertEqual(self.calls, 1)
+
+    def test_cancelled_caller_does_not_cancel_shared_work(self):
+        flights = SingleFlight("test-cancel")
+
+        async def main():
+            first = asyncio.ensure_future(flights.ado("key", asyncio.sleep, 0.05, "done"))
+            second = asyncio.ensure_future(flights.ado("key", asyncio.sleep, 0.05, "done"))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(main()), "done")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.sources import SearchResult, SourceIndex, canonicalize_url
+
+class TestSourceIndex(unittest.TestCase):
+    def test_canonical_urls(self):
+        self.assertEqual(
+            canonicalize_url("http://www.Example.com/path/?b=2&utm_source=x&a=1#section"),
+            "https://example.com/path?a=1&b=2"
+        )
+        self.assertEqual(canonicalize_url("http://arxiv.org/abs/2101.00001v2"), canonicalize_url("https://arxiv.org/pdf/2101.00001.pdf"))
+        self.assertEqual(canonicalize_url("#"), "")
+
+    def test_documents_are_shared_across_sub_topics(self):
+        index = SourceIndex()
+        first, is_new = index.register({"title": "A", "href": "https://example.com/a"}, "Body A", owner="Topic 1")
+        self.assertTrue(is_new)
+
+        again, is_new = index.register({"title": "A", "href": "http://www.example.com/a/"}, "Body A", owner="Topic 2")
+        self.assertIs(again, first)
+        self.assertFalse(is_new)
+
+        # Same text behind a different URL is the same evidence
+        mirror, is_new = index.register({"title": "A mirror", "href": "https://mirror.org/a"}, "body a", owner="Topic 2")
+        self.assertIs(mirror, first)
+
+        # The owning sub-topic keeps seeing the document as its own
+        self.assertTrue(index.register({"href": "https://example.com/a"}, owner="Topic 1")[1])
+        self.assertEqual(len(index.sources()), 1)
+
+    def test_owner_follows_plan_order_not_registration_order(self):
+        index = SourceIndex()
+        index.expect("Topic 1")
+        index.expect("Topic 2")
+        # Topic 2's search finished first, but Topic 1 comes first in the plan
+        entry, _ = index.register({"title": "A", "href": "https://example.com/a"}, owner="Topic 2", rank=0)
+        index.register({"title": "B", "href": "https://example.com/b"}, owner="Topic 1", rank=0)
+        index.register({"title": "A", "href": "https://example.com/a"}, owner="Topic 1", rank=1)
+        self.assertEqual(index.owner(entry), "Topic 1")
+        self.assertEqual([source.title for source in index.sources()], ["B", "A"])
+
+        self.assertFalse(index.wait_for_earlier("Topic 2", timeout=0.01))
+        index.searched("Topic 1")
+        self.assertTrue(index.wait_for_earlier("Topic 2", timeout=0.01))
+
+    def test_entries_are_snippet_free_search_results(self):
+        hit = SearchResult("A", "https://example.com/a", "Body A", "Tavily", score=0.9)
+        self.assertEqual(hit.render(), "[Tavily] Source: A\nURL: https://example.com/a\nContent: Body A")
+
+        entry, _ = SourceIndex().register(hit, hit.snippet, owner="Topic 1")
+        self.assertIsNot(entry, hit)
+        self.assertEqual(entry.snippet, "")
+        self.assertEqual(entry.to_dict(), {"title": "A", "href": "https://example.com/a", "source_type": "Tavily", "id": entry.id, "score": 0.9})
+        self.assertFalse(hasattr(entry, "__dict__"))
+
+        restored = SearchResult.from_dict(hit.to_dict())
+        self.assertEqual((restored.title, restored.url, restored.snippet, restored.provider, restored.score), ("A", "https://example.com/a", "Body A", "Tavily", 0.9))
+
+if __name__ == '__main__':
+    unittest.main()
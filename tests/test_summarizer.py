@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Mock external dependencies to allow implementation-agnostic testing
+sys.modules['langchain_google_genai'] = MagicMock()
+sys.modules['langchain_core'] = MagicMock()
+sys.modules['langchain_core.prompts'] = MagicMock()
+
+from src.agents.summarizer import SummarizerAgent
+from src.utils.cache import TTLCache
+from src.utils.llm_cache import LLMCache
+
+def fake_invoke(inputs, config=None):
+    if "sub_topic" in inputs:
+        return MagicMock(content=f"condensed {inputs['sub_topic']}")
+    return MagicMock(content=f"report from:\n{inputs['findings_text']}")
+
+class TestSummarizerMapReduce(unittest.TestCase):
+    def make_agent(self):
+        agent = SummarizerAgent()
+        agent.cache = LLMCache(TTLCache(), enabled=False)
+        return agent
+
+    @patch('src.agents.summarizer.ChatPromptTemplate')
+    def test_large_findings_are_condensed_per_section(self, MockTemplate):
+        chain = MockTemplate.from_messages.return_value.__or__.return_value
+        chain.invoke.side_effect = fake_invoke
+
+        agent = self.make_agent()
+        agent.map_reduce_threshold = 10
+        findings = {"A": "word " * 20, "B": "word " * 20}
+        report = agent.summarize("Topic", findings, [{"title": "Doc", "href": "http://doc"}])
+
+        self.assertEqual(chain.invoke.call_count, 3)
+        self.assertIn("### A\ncondensed A", report)
+        self.assertIn("### B\ncondensed B", report)
+        self.assertTrue(report.endswith("## References\n- [Doc](http://doc)\n"))
+
+    @patch('src.agents.summarizer.ChatPromptTemplate')
+    def test_small_findings_use_a_single_call(self, MockTemplate):
+        chain = MockTemplate.from_messages.return_value.__or__.return_value
+        chain.invoke.side_effect = fake_invoke
+
+        agent = self.make_agent()
+        report = agent.summarize("Topic", {"A": "short", "B": "short"})
+
+        self.assertEqual(chain.invoke.call_count, 1)
+        self.assertIn("### A\nshort", report)
+
+if __name__ == '__main__':
+    unittest.main()
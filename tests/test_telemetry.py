@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import MagicMock
+import asyncio
+import concurrent.futures
+import contextvars
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.cache import TTLCache
+from src.utils.llm_cache import LLMCache
+from src.utils.telemetry import CACHE_LOOKUPS, ERRORS, LLM_TOKENS, MetricsRegistry, span, traced, tracer
+
+class FakePrompt:
+    def format_messages(self, **inputs):
+        return [MagicMock(type="human", content=f"Tell me about {inputs['topic']}")]
+
+class TestMetrics(unittest.TestCase):
+    def test_render_prometheus_text(self):
+        registry = MetricsRegistry()
+        registry.counter("demo_total", "Demo counter.").inc(2, provider="tavily")
+        histogram = registry.histogram("demo_seconds", "Demo histogram.", buckets=(0.1, 1.0))
+        histogram.observe(0.5, span="x")
+
+        text = registry.render()
+        self.assertIn("# TYPE demo_total counter", text)
+        self.assertIn('demo_total{provider="tavily"} 2', text)
+        self.assertIn('demo_seconds_bucket{span="x",le="0.1"} 0', text)
+        self.assertIn('demo_seconds_bucket{span="x",le="1.0"} 1', text)
+        self.assertIn('demo_seconds_bucket{span="x",le="+Inf"} 1', text)
+        self.assertIn('demo_seconds_count{span="x"} 1', text)
+
+class TestSpans(unittest.TestCase):
+    def test_nested_spans_share_trace(self):
+        with span("test.parent") as parent:
+            with span("test.child", provider="demo") as child:
+                pass
+        self.assertEqual(child.trace_id, parent.trace_id)
+        self.assertEqual(child.parent_id, parent.span_id)
+        self.assertIsNotNone(child.duration)
+        self.assertEqual(tracer.recent(1)[0]["name"], "test.parent")
+
+    def test_exception_marks_span_failed(self):
+        before = ERRORS.value(span="test.failing", provider="demo")
+        with self.assertRaises(ValueError):
+            with span("test.failing", provider="demo") as current:
+                raise ValueError("boom")
+        self.assertEqual(current.status, "error")
+        self.assertEqual(ERRORS.value(span="test.failing", provider="demo"), before + 1)
+
+    def test_copied_context_propagates_to_worker_threads(self):
+        def child():
+            with span("test.worker") as current:
+                return current
+
+        with span("test.pool") as parent:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                worker = executor.submit(contextvars.copy_context().run, child).result()
+        self.assertEqual(worker.parent_id, parent.span_id)
+
+    def test_traced_async(self):
+        @traced("test.async")
+        async def work():
+            await asyncio.sleep(0)
+            return "done"
+
+        self.assertEqual(asyncio.run(work()), "done")
+        self.assertEqual(tracer.recent(1)[0]["name"], "test.async")
+
+class TestLLMInstrumentation(unittest.TestCase):
+    def test_invoke_counts_cache_hits_and_tokens(self):
+        cache = LLMCache(TTLCache())
+        chain = MagicMock()
+        chain.invoke.return_value = "one two three"
+        hits = CACHE_LOOKUPS.value(cache="llm", result="hit")
+        completion = LLM_TOKENS.value(model="test-model", kind="completion")
+
+        cache.invoke(chain, FakePrompt(), "test-model", {"topic": "batteries"})
+        cache.invoke(chain, FakePrompt(), "test-model", {"topic": "batteries"})
+
+        self.assertEqual(chain.invoke.call_count, 1)
+        self.assertEqual(CACHE_LOOKUPS.value(cache="llm", result="hit"), hits + 1)
+        self.assertEqual(LLM_TOKENS.value(model="test-model", kind="completion"), completion + 3)
+        self.assertEqual(tracer.recent(1)[0]["attributes"]["cached"], True)
+
+if __name__ == '__main__':
+    unittest.main()